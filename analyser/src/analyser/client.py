@@ -13,6 +13,7 @@ from tibava_interface import analyser_pb2
 from tibava_interface import analyser_pb2_grpc
 
 from tibava_data import DataManager
+from tibava_data.manager import TRANSFER_CHUNK_SIZE
 
 import time
 import msgpack
@@ -45,6 +46,32 @@ def parse_args():
     return args
 
 
+def add_parameters(request_parameters, parameters):
+    for i in parameters:
+        x = request_parameters.add()
+        x.name = i.get("name")
+        x.value = str(i.get("value"))
+        if isinstance(i.get("value"), float):
+            x.type = analyser_pb2.FLOAT_TYPE
+        if isinstance(i.get("value"), int):
+            x.type = analyser_pb2.INT_TYPE
+        if isinstance(i.get("value"), str):
+            x.type = analyser_pb2.STRING_TYPE
+        if isinstance(i.get("value"), bool):
+            x.type = analyser_pb2.BOOL_TYPE
+
+
+def hash_file(path: str) -> str:
+    hash_stream = hashlib.sha1()
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            data = f.read(TRANSFER_CHUNK_SIZE)
+            if not data:
+                break
+            hash_stream.update(data)
+    return hash_stream.hexdigest()
+
+
 class AnalyserClient:
     def __init__(self, host, port, manager=None):
         self.host = host
@@ -53,7 +80,13 @@ class AnalyserClient:
             self.manager = DataManager()
         else:
             self.manager = manager
-        self.channel = grpc.insecure_channel(f"{self.host}:{self.port}")
+        self.channel = grpc.insecure_channel(
+            f"{self.host}:{self.port}",
+            options=[
+                ("grpc.max_send_message_length", 50 * 1024 * 1024),
+                ("grpc.max_receive_message_length", 50 * 1024 * 1024),
+            ],
+        )
 
     def list_plugins(self):
         stub = analyser_pb2_grpc.AnalyserStub(self.channel)
@@ -63,13 +96,16 @@ class AnalyserClient:
         return response
 
     def upload_data(self, data):
+        # the analyser already has this container
+        if self.check_data(data.id):
+            return data.id
+
         stub = analyser_pb2_grpc.AnalyserStub(self.channel)
 
-        def generate_requests(data, chunk_size=128 * 1024):
+        def generate_requests(data):
             # data_manager.save(data)
             # data = data_manager.load(data.id)
-            """Lazy function (generator) to read a file piece by piece.
-            Default chunk size: 1k"""
+            """Lazy function (generator) to read a file piece by piece."""
             for x in self.manager.dump_to_stream(data.id):
                 yield analyser_pb2.UploadDataRequest(
                     id=data.id, data_encoded=x["data_encoded"]
@@ -83,7 +119,7 @@ class AnalyserClient:
         logging.error("Error while copying data ...")
         return None
 
-    def upload_file(self, path, id=None):
+    def upload_file(self, path, id=None, upload_id=None, max_retries=10):
         ext = os.path.splitext(path)[-1][1:]
         filename = os.path.basename(path)
 
@@ -95,45 +131,66 @@ class AnalyserClient:
         if re.match(r"image/*", mimetype[0]):
             data_type = analyser_pb2.IMAGES_DATA
 
+        # skip the transfer if the analyser already has a file with this content
+        file_hash = hash_file(path)
+        data_id = self.find_data(file_hash)
+        if data_id is not None:
+            logging.info(f"File {path} is already stored as {data_id}")
+            return data_id
+
+        # the server keeps a partial file only for resumable uploads and copies
+        # it into the container at the end, so plain uploads are written once.
+        # An upload is resumable with an explicit upload id or if the server
+        # already holds a partial upload of this content.
+        resumable = upload_id is not None
+        if upload_id is None:
+            upload_id = file_hash
+        size = os.path.getsize(path)
+
         stub = analyser_pb2_grpc.AnalyserStub(self.channel)
 
-        class RequestGenerator:
-            def __init__(self, path, chunk_size=128 * 1024):
-                self.chunk_size = chunk_size
-                self.path = path
-                self.hash_stream = None
-
-            def __call__(self):
-                self.hash_stream = hashlib.sha1()
-                with open(self.path, "rb") as f:
-                    while True:
-                        data = f.read(self.chunk_size)
-                        if not data:
-                            break
-                        self.hash_stream.update(data)
-                        yield analyser_pb2.UploadFileRequest(
-                            type=data_type,
-                            data_encoded=data,
-                            id=None,
-                            ext=ext,
-                            filename=filename,
-                        )
-
-            def hash(self):
-                return self.hash_stream.hexdigest()
-
-        try_count = 3
-        while try_count > 0:
-            generator = RequestGenerator(path)
-
-            response = stub.upload_file(generator())
-
-            if response.hash == generator.hash() and response.success:
-                print(response.id)
-                return response.id
-
-            logging.warning("Retry to upload the data again ...")
-            try_count -= 1
+        def generate_requests(offset, resumable):
+            with open(path, "rb", buffering=0) as f:
+                f.seek(offset)
+                while True:
+                    data = f.read(TRANSFER_CHUNK_SIZE)
+                    yield analyser_pb2.UploadFileRequest(
+                        type=data_type,
+                        data_encoded=data,
+                        id=None,
+                        ext=ext,
+                        filename=filename,
+                        upload_id=upload_id if resumable else None,
+                        offset=offset,
+                        size=size,
+                        chunk_hash=hashlib.sha1(data).hexdigest(),
+                    )
+                    offset += len(data)
+                    # an empty chunk is sent once to finish an upload that is
+                    # already complete on the server
+                    if not data or offset >= size:
+                        break
+
+        for attempt in range(max_retries):
+            try:
+                offset = stub.get_upload_status(
+                    analyser_pb2.UploadStatusRequest(upload_id=upload_id)
+                ).offset
+                if offset > 0:
+                    logging.info(f"Resume upload of {path} at {offset}/{size}")
+                    resumable = True
+
+                response = stub.upload_file(generate_requests(offset, resumable))
+                if response.success and response.hash == file_hash:
+                    return response.id
+
+                logging.warning(
+                    f"Upload of {path} stopped at {response.offset}/{size} ..."
+                )
+            except grpc.RpcError as e:
+                logging.warning(f"Upload of {path} failed: {e.code()}")
+
+            time.sleep(min(2**attempt, 30))
 
         logging.error("Error while copying data ...")
         return None
@@ -146,6 +203,17 @@ class AnalyserClient:
         response = stub.check_data(run_request)
         return response.exists
 
+    def find_data(self, content_hash):
+        """Returns the id of the data created from content with this sha1 hash"""
+        run_request = analyser_pb2.CheckDataRequest(hash=content_hash)
+
+        stub = analyser_pb2_grpc.AnalyserStub(self.channel)
+
+        response = stub.check_data(run_request)
+        if response.exists and response.id:
+            return response.id
+        return None
+
     def run_plugin(self, plugin, inputs, parameters):
         run_request = analyser_pb2.RunPluginRequest()
         run_request.plugin = plugin
@@ -154,18 +222,7 @@ class AnalyserClient:
             x.name = i.get("name")
             x.id = i.get("id")
 
-        for i in parameters:
-            x = run_request.parameters.add()
-            x.name = i.get("name")
-            x.value = str(i.get("value"))
-            if isinstance(i.get("value"), float):
-                x.type = analyser_pb2.FLOAT_TYPE
-            if isinstance(i.get("value"), int):
-                x.type = analyser_pb2.INT_TYPE
-            if isinstance(i.get("value"), str):
-                x.type = analyser_pb2.STRING_TYPE
-            if isinstance(i.get("value"), bool):
-                x.type = analyser_pb2.BOOL_TYPE
+        add_parameters(run_request.parameters, parameters)
 
         stub = analyser_pb2_grpc.AnalyserStub(self.channel)
 
@@ -186,28 +243,103 @@ class AnalyserClient:
 
         return response
 
+    def watch_plugin_status(self, job_id, timeout=None):
+        """Stream of status updates, a new message is only sent after a change"""
+        get_plugin_request = analyser_pb2.GetPluginStatusRequest(id=job_id)
+
+        stub = analyser_pb2_grpc.AnalyserStub(self.channel)
+
+        return stub.watch_plugin_status(get_plugin_request, timeout=timeout)
+
     def get_plugin_results(self, job_id, timeout=None):
-        result = None
-        start_time = time.time()
-        while True:
-            if timeout:
-                if time.time() - start_time > timeout:
-                    return None
-            result = self.get_plugin_status(job_id)
-
-            if result.status == analyser_pb2.GetPluginStatusResponse.WAITING:
-                time.sleep(0.5)
-                continue
-            if result.status == analyser_pb2.GetPluginStatusResponse.RUNNING:
-                time.sleep(0.5)
-                continue
-            elif result.status == analyser_pb2.GetPluginStatusResponse.ERROR:
-                logging.error("Job is crashing")
-                return
-            elif result.status == analyser_pb2.GetPluginStatusResponse.DONE:
-                break
+        try:
+            for result in self.watch_plugin_status(job_id, timeout=timeout):
+                if result.status == analyser_pb2.GetPluginStatusResponse.ERROR:
+                    logging.error("Job is crashing")
+                    return
+                elif result.status == analyser_pb2.GetPluginStatusResponse.DONE:
+                    return result
+                elif result.status == analyser_pb2.GetPluginStatusResponse.UNKNOWN:
+                    logging.error("Job is unknown by the analyser")
+                    return
+        except grpc.RpcError as rpc_error:
+            if rpc_error.code() != grpc.StatusCode.DEADLINE_EXCEEDED:
+                raise
+            return None
+
+        logging.error("Status stream closed before the job was finished")
+        return None
 
-        return result
+    def run_pipeline(self, inputs, plugins):
+        """Start a graph of plugins on the analyser.
+
+        inputs: list of {"symbol", "id"} that are already known to the analyser
+        plugins: list of {"plugin", "inputs", "outputs", "parameters"} where inputs
+            and outputs map the plugin names to pipeline symbols ({name: symbol})
+        """
+        run_request = analyser_pb2.RunPipelineRequest()
+        for i in inputs:
+            x = run_request.inputs.add()
+            x.symbol = i.get("symbol")
+            x.id = i.get("id")
+
+        for p in plugins:
+            x = run_request.plugins.add()
+            x.plugin = p.get("plugin")
+            for name, symbol in p.get("inputs", {}).items():
+                y = x.inputs.add()
+                y.name = name
+                y.symbol = symbol
+            for name, symbol in p.get("outputs", {}).items():
+                y = x.outputs.add()
+                y.name = name
+                y.symbol = symbol
+            add_parameters(x.parameters, p.get("parameters", []))
+
+        stub = analyser_pb2_grpc.AnalyserStub(self.channel)
+
+        response = stub.run_pipeline(run_request)
+
+        if response.success:
+            return response.id
+
+        logging.error("Error while run pipeline ...")
+        return None
+
+    def get_pipeline_status(self, pipeline_id):
+        get_pipeline_request = analyser_pb2.GetPieplineStatusRequest(id=pipeline_id)
+
+        stub = analyser_pb2_grpc.AnalyserStub(self.channel)
+
+        response = stub.get_pipeline_status(get_pipeline_request)
+
+        return response
+
+    def watch_pipeline_status(self, pipeline_id, timeout=None):
+        get_pipeline_request = analyser_pb2.GetPieplineStatusRequest(id=pipeline_id)
+
+        stub = analyser_pb2_grpc.AnalyserStub(self.channel)
+
+        return stub.watch_pipeline_status(get_pipeline_request, timeout=timeout)
+
+    def get_pipeline_results(self, pipeline_id, timeout=None):
+        try:
+            for result in self.watch_pipeline_status(pipeline_id, timeout=timeout):
+                if result.status == analyser_pb2.GetPieplineStatusResponse.ERROR:
+                    logging.error("Pipeline is crashing")
+                    return
+                elif result.status == analyser_pb2.GetPieplineStatusResponse.DONE:
+                    return result
+                elif result.status == analyser_pb2.GetPieplineStatusResponse.UNKNOWN:
+                    logging.error("Pipeline is unknown by the analyser")
+                    return
+        except grpc.RpcError as rpc_error:
+            if rpc_error.code() != grpc.StatusCode.DEADLINE_EXCEEDED:
+                raise
+            return None
+
+        logging.error("Status stream closed before the pipeline was finished")
+        return None
 
     def download_data(self, data_id, output_path: str = None):
         download_data_request = analyser_pb2.DownloadDataRequest(id=data_id)
@@ -0,0 +1,105 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List
+
+
+def future_state(job: Dict) -> str:
+    future = job.get("future")
+    if future is None or not (future.running() or future.done()):
+        return "queued"
+    return "running"
+
+
+class JobRegistry:
+    """Keeps track of the jobs of the analyser.
+
+    Active jobs are stored until they are finished. Finished jobs are kept in
+    LRU order and are evicted once they are older than their ttl or once there
+    are more than max_done of them. After the results of a job were delivered
+    to the client (collect) the shorter collected_ttl applies. New jobs are
+    only accepted while there are less than max_active unfinished jobs.
+    """
+
+    def __init__(
+        self,
+        max_active: int = 1024,
+        max_done: int = 4096,
+        ttl: float = 24 * 60 * 60,
+        collected_ttl: float = 10 * 60,
+        state_fn: Callable[[Any], str] = future_state,
+    ):
+        self.max_active = max_active
+        self.max_done = max_done
+        self.ttl = ttl
+        self.collected_ttl = collected_ttl
+        self.state_fn = state_fn
+
+        self.lock = threading.Condition()
+        self.active = {}
+        # job_id -> {"job", "expires"}; ordered from least to most recently used
+        self.done = OrderedDict()
+
+    def add(self, job_id: str, job: Any, timeout: float = None) -> bool:
+        """Register a new job, waits up to timeout seconds for a free slot"""
+        with self.lock:
+            if not self.lock.wait_for(
+                lambda: len(self.active) < self.max_active, timeout=timeout
+            ):
+                logging.warning(f"[JobRegistry] queue is full ({self.max_active})")
+                return False
+            self.active[job_id] = job
+        return True
+
+    def get(self, job_id: str) -> Any:
+        with self.lock:
+            job = self.active.get(job_id)
+            if job is not None:
+                return job
+
+            entry = self.done.get(job_id)
+            if entry is None:
+                return None
+            self.done.move_to_end(job_id)
+            return entry["job"]
+
+    def values(self) -> List[Any]:
+        """All jobs, active and finished"""
+        with self.lock:
+            return list(self.active.values()) + [x["job"] for x in self.done.values()]
+
+    def finish(self, job_id: str):
+        with self.lock:
+            job = self.active.pop(job_id, None)
+            if job is None:
+                return
+            self.done[job_id] = {"job": job, "expires": time.time() + self.ttl}
+            while len(self.done) > self.max_done:
+                self.done.popitem(last=False)
+            self.lock.notify_all()
+
+    def collect(self, job_id: str):
+        """Mark the results of a finished job as delivered"""
+        with self.lock:
+            entry = self.done.get(job_id)
+            if entry is None:
+                return
+            entry["expires"] = min(entry["expires"], time.time() + self.collected_ttl)
+
+    def evict(self) -> int:
+        now = time.time()
+        with self.lock:
+            expired = [k for k, v in self.done.items() if v["expires"] < now]
+            for job_id in expired:
+                del self.done[job_id]
+        return len(expired)
+
+    def counts(self) -> Dict[str, int]:
+        with self.lock:
+            states = [self.state_fn(x) for x in self.active.values()]
+            return {
+                "queued": states.count("queued"),
+                "running": states.count("running"),
+                "done": len(self.done),
+            }
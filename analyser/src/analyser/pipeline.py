@@ -0,0 +1,220 @@
+import logging
+import threading
+import traceback
+from typing import Callable, Dict, List
+
+from tibava_interface import analyser_pb2
+
+
+class PipelineStep:
+    def __init__(self, params: Dict):
+        self.plugin = params.get("plugin")
+        self.inputs = {x.get("name"): x.get("symbol") for x in params.get("inputs", [])}
+        self.outputs = {
+            x.get("name"): x.get("symbol") for x in params.get("outputs", [])
+        }
+        self.parameters = params.get("parameters", [])
+
+        self.shared = None
+        self.future = None
+        self.done = False
+
+    def plugin_params(self, symbols: Dict[str, str]) -> Dict:
+        return {
+            "plugin": self.plugin,
+            "inputs": [
+                {"name": name, "id": symbols[symbol]}
+                for name, symbol in self.inputs.items()
+            ],
+            "parameters": self.parameters,
+        }
+
+    def progress(self) -> float:
+        if self.done:
+            return 1.0
+        if self.shared is None:
+            return 0.0
+        return self.shared.get("progress", 0.0)
+
+
+class Pipeline:
+    """Runs a graph of plugin calls on the analyser worker pool.
+
+    Steps are connected through symbols. A step is submitted as soon as every
+    symbol it consumes is available, so independent branches run at the same
+    time and data ids are passed from one step to the next without a round trip
+    to the client.
+    """
+
+    def __init__(
+        self,
+        params: Dict,
+        submit_fn: Callable,
+        shared_fn: Callable = dict,
+        done_fn: Callable = None,
+    ):
+        self.submit_fn = submit_fn
+        self.shared_fn = shared_fn
+        self.done_fn = done_fn
+
+        self.symbols = {x.get("symbol"): x.get("id") for x in params.get("inputs", [])}
+        self.input_symbols = set(self.symbols.keys())
+        self.steps = [PipelineStep(x) for x in params.get("plugins", [])]
+
+        self.lock = threading.Condition()
+        self.status = analyser_pb2.GetPieplineStatusResponse.WAITING
+        self.num_running = 0
+
+    def validate(self) -> bool:
+        producers = {}
+        for step in self.steps:
+            for symbol in step.outputs.values():
+                if symbol in producers or symbol in self.input_symbols:
+                    logging.error(f"[Pipeline] symbol {symbol} is produced twice")
+                    return False
+                producers[symbol] = step
+
+        # topological sort to reject missing symbols and cycles before anything runs
+        available = set(self.input_symbols)
+        pending = list(self.steps)
+        while pending:
+            ready = [
+                x for x in pending if all(s in available for s in x.inputs.values())
+            ]
+            if not ready:
+                for step in pending:
+                    missing = [s for s in step.inputs.values() if s not in available]
+                    logging.error(
+                        f"[Pipeline] {step.plugin} waits for unresolvable symbols {missing}"
+                    )
+                return False
+            for step in ready:
+                available.update(step.outputs.values())
+                pending.remove(step)
+        return True
+
+    def start(self) -> bool:
+        if not self.validate():
+            self.status = analyser_pb2.GetPieplineStatusResponse.ERROR
+            return False
+
+        with self.lock:
+            self.status = analyser_pb2.GetPieplineStatusResponse.RUNNING
+            ready = self._ready_steps()
+            if not ready:
+                self.status = analyser_pb2.GetPieplineStatusResponse.DONE
+        self._submit(ready)
+
+        if not ready and self.done_fn is not None:
+            self.done_fn()
+        return True
+
+    def _ready_steps(self) -> List[PipelineStep]:
+        ready = []
+        for step in self.steps:
+            if step.shared is not None:
+                continue
+            if all(s in self.symbols for s in step.inputs.values()):
+                # reserve the step so that concurrent callbacks do not submit it twice
+                step.shared = self.shared_fn()
+                step.shared["progress"] = 0.0
+                step.shared["status"] = analyser_pb2.GetPluginStatusResponse.WAITING
+                ready.append(step)
+        self.num_running += len(ready)
+        return ready
+
+    def _submit(self, steps: List[PipelineStep]):
+        for i, step in enumerate(steps):
+            with self.lock:
+                params = step.plugin_params(self.symbols)
+            logging.info(f"[Pipeline] submit {step.plugin}")
+            try:
+                step.future = self.submit_fn({"params": params, "shared": step.shared})
+            except Exception as e:
+                logging.error(f"[Pipeline] submit {step.plugin} {repr(e)}")
+                logging.error(traceback.format_exc())
+                self._submit_failed(steps[i:])
+                return
+            step.future.add_done_callback(
+                lambda future, step=step: self._step_done(step, future)
+            )
+
+    def _submit_failed(self, steps: List[PipelineStep]):
+        # the steps were reserved by _ready_steps but will never run
+        with self.lock:
+            self.num_running -= len(steps)
+            for step in steps:
+                step.done = True
+            self.status = analyser_pb2.GetPieplineStatusResponse.ERROR
+            self.lock.notify_all()
+            finished = self.done()
+
+        if finished and self.done_fn is not None:
+            self.done_fn()
+
+    def _step_done(self, step: PipelineStep, future):
+        try:
+            results = future.result()
+        except Exception as e:
+            logging.error(f"[Pipeline] {step.plugin} {repr(e)}")
+            logging.error(traceback.format_exc())
+            results = None
+
+        with self.lock:
+            self.num_running -= 1
+            step.done = True
+            self.lock.notify_all()
+
+            ready = []
+            if self._store_results(step, results):
+                ready = self._ready_steps()
+                if not ready and self.num_running == 0:
+                    self.status = analyser_pb2.GetPieplineStatusResponse.DONE
+            finished = self.done()
+        self._submit(ready)
+
+        if finished and self.done_fn is not None:
+            self.done_fn()
+
+    def _store_results(self, step: PipelineStep, results) -> bool:
+        if results is None:
+            logging.error(f"[Pipeline] {step.plugin} failed")
+            self.status = analyser_pb2.GetPieplineStatusResponse.ERROR
+            return False
+
+        results = {x["name"]: x["id"] for x in results}
+        for name, symbol in step.outputs.items():
+            if name not in results:
+                logging.error(f"[Pipeline] {step.plugin} did not return {name}")
+                self.status = analyser_pb2.GetPieplineStatusResponse.ERROR
+                return False
+            self.symbols[symbol] = results[name]
+
+        return self.status != analyser_pb2.GetPieplineStatusResponse.ERROR
+
+    def wait(self, timeout: float = None):
+        # returns as soon as one of the steps has finished
+        with self.lock:
+            self.lock.wait(timeout)
+
+    def done(self) -> bool:
+        if self.status == analyser_pb2.GetPieplineStatusResponse.DONE:
+            return True
+        # an aborted pipeline is finished once no step is in flight anymore
+        return (
+            self.status == analyser_pb2.GetPieplineStatusResponse.ERROR
+            and self.num_running == 0
+        )
+
+    def progress(self) -> float:
+        if len(self.steps) == 0:
+            return 1.0
+        return sum(x.progress() for x in self.steps) / len(self.steps)
+
+    def outputs(self) -> Dict[str, str]:
+        with self.lock:
+            return {
+                symbol: data_id
+                for symbol, data_id in self.symbols.items()
+                if symbol not in self.input_symbols
+            }
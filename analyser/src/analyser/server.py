@@ -1,6 +1,9 @@
 import logging
 import sys
 import argparse
+import itertools
+import threading
+from typing import Set
 import time
 import uuid
 
@@ -20,8 +23,11 @@ from tibava_interface import analyser_pb2, analyser_pb2_grpc
 from inference_ray.plugin import AnalyserProgressCallback
 from inference_ray.plugin import AnalyserPluginManager
 from tibava_data import DataManager, Data
-from tibava_utils.cache import get_hash_for_plugin
-from tibava_utils.cache import CacheManager
+from tibava_data.gc import DEFAULT_GRACE_PERIOD, cache_references, collect_garbage
+from tibava_utils.cache import get_plugin_cache_keys
+from tibava_utils.cache import CacheManager, LRUCache
+from analyser.pipeline import Pipeline
+from analyser.jobs import JobRegistry
 
 
 class AnalyserCacheWrapper:
@@ -35,91 +41,179 @@ class AnalyserCacheWrapper:
     def plugins(self):
         return self.plugin._plugins
 
-    def __call__(self, plugin, inputs, parameters, data_manager, callbacks):
-        cached = False
-        if self.cache:
-            plugins = {x["plugin"]: x for x in self.plugin.plugin_status()}
-
-            run_id = uuid.uuid4().hex[:4]
-            if plugin not in plugins:
-                logging.error(
-                    f"[AnalyserCacheWrapper] {run_id} plugin: {plugin} not found"
-                )
-                return None
+    @property
+    def is_async(self):
+        return self.plugin.dispatcher is not None
+
+    def result_keys(self, plugin, plugin_to_run, inputs, parameters):
+        return get_plugin_cache_keys(
+            plugin=plugin,
+            outputs=list(plugin_to_run["provides"]),
+            inputs={name: x.id for name, x in inputs.items()},
+            parameters=parameters,
+            version=plugin_to_run["version"],
+            config=plugin_to_run.get("config"),
+        )
 
-            plugin_to_run = plugins[plugin]
-            results = {}
-            logging.info(f"[AnalyserPluginManager] {run_id} Cache {plugin_to_run}")
-            logging.info(
-                f"[AnalyserPluginManager] {run_id} Cache {plugin_to_run['provides']}"
-            )
-            logging.info(
-                f"[AnalyserPluginManager] {run_id} Cache {plugin_to_run['requires']}"
-            )
+    def lookup(self, plugin, inputs, parameters, data_manager=None):
+        if not self.cache:
+            return None
 
-            print(inputs, flush=True)
-            cached = True
-            for output in plugin_to_run["provides"]:
-                result_hash = get_hash_for_plugin(
-                    plugin=plugin,
-                    output=output,
-                    inputs=[x.id for _, x in inputs.items()],
-                    parameters=parameters,
-                    version=plugin_to_run["version"],
-                    config={},  # plugin_to_run.config, TODO
-                )
+        plugins = self.plugin.plugin_status_map()
 
-                logging.info(f"[AnalyserPluginManager] {run_id} Cache {result_hash}")
-                cached_data = self.cache.get(result_hash)
-                if cached_data is None:
-                    cached = False
-                    break
+        run_id = uuid.uuid4().hex[:4]
+        if plugin not in plugins:
+            logging.error(f"[AnalyserCacheWrapper] {run_id} plugin: {plugin} not found")
+            return None
 
-                logging.info(
-                    f"[AnalyserPluginManager] {run_id} Cache get {result_hash} {cached_data}"
-                )
-                results[output] = cached_data.get("data_id")
+        plugin_to_run = plugins[plugin]
+        logging.info(f"[AnalyserPluginManager] {run_id} Cache {plugin_to_run}")
 
-        if not cached:
-            logging.info(f"[AnalyserPluginManager] {run_id} plugin: {plugin_to_run}")
-            logging.info(
-                f"[AnalyserPluginManager] {run_id} data: {[{k: x.id} for k, x in inputs.items()]}"
-            )
-            logging.info(f"[AnalyserPluginManager] {run_id} parameters: {parameters}")
-            results = self.plugin(
-                plugin=plugin,
-                inputs=inputs,
-                data_manager=data_manager,
-                parameters=parameters,
-                callbacks=callbacks,
-            )
-            logging.info(
-                f"[AnalyserPluginManager] {run_id} results: {[{k: x} for k, x in results.items()]}"
-            )
+        # all outputs are fetched with a single request
+        result_keys = self.result_keys(plugin, plugin_to_run, inputs, parameters)
+        cached_data = self.cache.mget(list(result_keys.values()))
+        if any(x is None for x in cached_data):
+            return None
 
-        if self.cache:
-            for output, data in results.items():
-                data_id = data
-                logging.error(f"#####DEBUG {data_id} {data} {isinstance(data, Data)}")
-
-                result_hash = get_hash_for_plugin(
-                    plugin=plugin,
-                    output=output,
-                    inputs=[x.id for _, x in inputs.items()],
-                    parameters=parameters,
-                    version=plugin_to_run["version"],
-                    config={},  # plugin_to_run.config, TODO
-                )
-                logging.info(
-                    f"[AnalyserPluginManager] Cache set {result_hash} {data_id}"
-                )
+        logging.info(f"[AnalyserPluginManager] {run_id} Cache get {cached_data}")
+        results = {
+            output: x.get("data_id") for output, x in zip(result_keys, cached_data)
+        }
 
-                self.cache.set(
-                    result_hash,
-                    {"data_id": data_id, "time": time.time(), "type": "plugin_result"},
-                )
+        # the data might have been collected while the entry was still cached
+        if data_manager is not None and any(
+            data_manager.check(x) is None for x in results.values()
+        ):
+            logging.info(f"[AnalyserPluginManager] {run_id} Cache data missing")
+            return None
+        return results
+
+    def store(self, plugin, inputs, parameters, results):
+        if not self.cache or not isinstance(results, dict):
+            return
+
+        plugins = self.plugin.plugin_status_map()
+        if plugin not in plugins:
+            return
+
+        plugin_to_run = plugins[plugin]
+        result_keys = self.result_keys(plugin, plugin_to_run, inputs, parameters)
+        logging.info(f"[AnalyserPluginManager] Cache set {results}")
+
+        self.cache.mset(
+            {
+                result_keys[output]: {
+                    "data_id": data_id,
+                    "time": time.time(),
+                    "type": "plugin_result",
+                }
+                for output, data_id in results.items()
+                if output in result_keys
+            }
+        )
+
+    def __call__(self, plugin, inputs, parameters, data_manager, callbacks):
+        results = self.lookup(plugin, inputs, parameters, data_manager)
+        if results is not None:
+            return results
+
+        logging.info(f"[AnalyserPluginManager] plugin: {plugin}")
+        logging.info(
+            f"[AnalyserPluginManager] data: {[{k: x.id} for k, x in inputs.items()]}"
+        )
+        logging.info(f"[AnalyserPluginManager] parameters: {parameters}")
+        results = self.plugin(
+            plugin=plugin,
+            inputs=inputs,
+            data_manager=data_manager,
+            parameters=parameters,
+            callbacks=callbacks,
+        )
+        logging.info(f"[AnalyserPluginManager] results: {results}")
+
+        self.store(plugin, inputs, parameters, results)
         return results
 
+    def dispatch(self, plugin, inputs, parameters, data_manager, callbacks):
+        """Same as __call__ but returns a future instead of waiting for the plugin"""
+        future = futures.Future()
+
+        results = self.lookup(plugin, inputs, parameters, data_manager)
+        if results is not None:
+            future.set_result(results)
+            return future
+
+        def plugin_done(plugin_future):
+            try:
+                results = plugin_future.result()
+                self.store(plugin, inputs, parameters, results)
+            except Exception as e:
+                future.set_exception(e)
+                return
+            future.set_result(results)
+
+        self.plugin.dispatch(
+            plugin=plugin,
+            inputs=inputs,
+            data_manager=data_manager,
+            parameters=parameters,
+            callbacks=callbacks,
+        ).add_done_callback(plugin_done)
+        return future
+
+
+def parse_plugin_args(params, data_manager):
+    plugin_inputs = {}
+    if "inputs" in params:
+        for data_in in params.get("inputs"):
+            data = data_manager.load(data_in.get("id"))
+            if data is None:
+                logging.error(f"Data not found {data_in.get('id')}")
+                return None
+            plugin_inputs[data_in.get("name")] = data
+
+    plugin_parameters = {}
+    if "parameters" in params:
+        for parameter in params.get("parameters"):
+            if parameter.get("type") == "FLOAT_TYPE":
+                plugin_parameters[parameter.get("name")] = float(parameter.get("value"))
+            if parameter.get("type") == "INT_TYPE":
+                plugin_parameters[parameter.get("name")] = int(parameter.get("value"))
+            if parameter.get("type") == "STRING_TYPE":
+                plugin_parameters[parameter.get("name")] = str(parameter.get("value"))
+            if parameter.get("type") == "BOOL_TYPE":
+                if parameter.get("value") == "False":
+                    plugin_parameters[parameter.get("name")] = False
+                else:
+                    plugin_parameters[parameter.get("name")] = True
+
+    return plugin_inputs, plugin_parameters
+
+
+def to_result_map(plugin, results):
+    if results is None:
+        logging.error(f"[Analyser] {plugin} without results")
+        return []
+
+    result_map = []
+    for key, id in results.items():
+        result_map.append({"name": key, "id": id})
+
+    return result_map
+
+
+def log_exception(e):
+    logging.error(f"[Analyser] {repr(e)}")
+    exc_type, exc_value, exc_traceback = sys.exc_info()
+
+    traceback.print_exception(
+        exc_type,
+        exc_value,
+        exc_traceback,
+        limit=2,
+        file=sys.stdout,
+    )
+
 
 def run_plugin(args):
     try:
@@ -129,35 +223,11 @@ def run_plugin(args):
         shared = args.get("shared")
         shared["progress"] = 0.0
         shared["status"] = analyser_pb2.GetPluginStatusResponse.RUNNING
-        plugin_inputs = {}
-        if "inputs" in params:
-            for data_in in params.get("inputs"):
-                data = data_manager.load(data_in.get("id"))
-                if data is None:
-                    logging.error(f"Data not found {data_in.get('id')}")
-                    return []
-                plugin_inputs[data_in.get("name")] = data
-
-        plugin_parameters = {}
-        if "parameters" in params:
-            for parameter in params.get("parameters"):
-                if parameter.get("type") == "FLOAT_TYPE":
-                    plugin_parameters[parameter.get("name")] = float(
-                        parameter.get("value")
-                    )
-                if parameter.get("type") == "INT_TYPE":
-                    plugin_parameters[parameter.get("name")] = int(
-                        parameter.get("value")
-                    )
-                if parameter.get("type") == "STRING_TYPE":
-                    plugin_parameters[parameter.get("name")] = str(
-                        parameter.get("value")
-                    )
-                if parameter.get("type") == "BOOL_TYPE":
-                    if parameter.get("value") == "False":
-                        plugin_parameters[parameter.get("name")] = False
-                    else:
-                        plugin_parameters[parameter.get("name")] = True
+
+        plugin_args = parse_plugin_args(params, data_manager)
+        if plugin_args is None:
+            return []
+        plugin_inputs, plugin_parameters = plugin_args
 
         callbacks = [AnalyserProgressCallback(shared)]
         results = plugin_manager(
@@ -167,28 +237,54 @@ def run_plugin(args):
             data_manager=data_manager,
             callbacks=callbacks,
         )
-        if results is None:
-            logging.error(f"[Analyser] {params.get('plugin')} without results")
-            return []
+        return to_result_map(params.get("plugin"), results)
+    except Exception as e:
+        # raise e
+        log_exception(e)
+
+
+def start_plugin(args, future):
+    """Prepares a plugin run on a worker and hands it over to the async dispatcher.
+
+    The worker is free again as soon as the request is sent, the result is
+    written to future once the plugin is finished.
+    """
+    try:
+        plugin_manager = globals().get("plugin_manager")
+        data_manager = globals().get("data_manager")
+        params = args.get("params")
+        shared = args.get("shared")
+        shared["progress"] = 0.0
+        shared["status"] = analyser_pb2.GetPluginStatusResponse.RUNNING
+        future.set_running_or_notify_cancel()
 
-        result_map = []
-        for key, id in results.items():
-            # data_manager.save(data)
-            result_map.append({"name": key, "id": id})
+        plugin_args = parse_plugin_args(params, data_manager)
+        if plugin_args is None:
+            future.set_result([])
+            return
+        plugin_inputs, plugin_parameters = plugin_args
 
-        return result_map
+        def plugin_done(plugin_future):
+            try:
+                future.set_result(
+                    to_result_map(params.get("plugin"), plugin_future.result())
+                )
+            except Exception as e:
+                log_exception(e)
+                future.set_result(None)
+
+        callbacks = [AnalyserProgressCallback(shared)]
+        plugin_manager.dispatch(
+            plugin=params.get("plugin"),
+            inputs=plugin_inputs,
+            parameters=plugin_parameters,
+            data_manager=data_manager,
+            callbacks=callbacks,
+        ).add_done_callback(plugin_done)
     except Exception as e:
-        # raise e
-        logging.error(f"[Analyser] {repr(e)}")
-        exc_type, exc_value, exc_traceback = sys.exc_info()
-
-        traceback.print_exception(
-            exc_type,
-            exc_value,
-            exc_traceback,
-            limit=2,
-            file=sys.stdout,
-        )
+        log_exception(e)
+        if not future.done():
+            future.set_result(None)
 
 
 def init_plugins(config):
@@ -206,6 +302,14 @@ def init_plugins(config):
             cache = CacheManager.build(
                 name=cache_config["type"], config=cache_config["params"]
             )
+            # small in-process cache in front of the cache server
+            front_config = cache_config.get("front", {})
+            if cache is not None and front_config is not None:
+                cache = LRUCache(
+                    cache,
+                    max_size=front_config.get("max_size", 4096),
+                    ttl=front_config.get("ttl", 300.0),
+                )
 
     data_manager = DataManager(data_dir=data_dir, cache=cache)
     data_dict["data_manager"] = data_manager
@@ -225,8 +329,10 @@ def init_plugins(config):
     return data_dict
 
 
-def init_process(config):
-    globals().update(init_plugins(config))
+def init_process(managers):
+    # the workers share the managers of the server, so there is only one
+    # dispatcher, connection pool and front cache per process
+    globals().update(managers)
 
 
 class Commune(analyser_pb2_grpc.AnalyserServicer):
@@ -236,13 +342,45 @@ class Commune(analyser_pb2_grpc.AnalyserServicer):
         self.process_pool = futures.ThreadPoolExecutor(
             max_workers=self.config.get("num_worker", 4),
             initializer=init_process,
-            initargs=(config,),
+            initargs=(self.managers,),
         )
         self.shared_manager = mp.Manager()
-        self.futures = []
+
+        jobs_config = self.config.get("jobs", {})
+        self.queue_timeout = jobs_config.get("queue_timeout", 60.0)
+        self.jobs = JobRegistry(
+            max_active=jobs_config.get("max_active", 1024),
+            max_done=jobs_config.get("max_done", 4096),
+            ttl=jobs_config.get("ttl", 24 * 60 * 60),
+            collected_ttl=jobs_config.get("collected_ttl", 10 * 60),
+        )
+        self.pipelines = JobRegistry(
+            max_active=jobs_config.get("max_active", 1024),
+            max_done=jobs_config.get("max_done", 4096),
+            ttl=jobs_config.get("ttl", 24 * 60 * 60),
+            collected_ttl=jobs_config.get("collected_ttl", 10 * 60),
+            state_fn=lambda x: "running",
+        )
+        self.watch_interval = self.config.get("watch_interval", 1.0)
 
         # self.max_results = config.get("Analyser", {}).get("max_results", 100)
 
+    def referenced_data(self) -> Set[str]:
+        """Ids of the data used by the jobs and pipelines that are still known"""
+        references = set()
+        for job in self.jobs.values():
+            references.update(x.get("id") for x in job["params"].get("inputs", []))
+            future = job.get("future")
+            if future is None or not future.done() or future.exception() is not None:
+                continue
+            for x in future.result() or []:
+                references.add(x.get("id"))
+
+        for pipeline in self.pipelines.values():
+            with pipeline.lock:
+                references.update(pipeline.symbols.values())
+        return references
+
     def list_plugins(self, request, context):
         reply = analyser_pb2.ListPluginsReply()
 
@@ -272,6 +410,20 @@ class Commune(analyser_pb2_grpc.AnalyserServicer):
             return analyser_pb2.UploadDataResponse(success=False)
 
     def upload_file(self, request_iterator, context):
+        request_iterator = iter(request_iterator)
+        first_request = next(request_iterator)
+        request_iterator = itertools.chain([first_request], request_iterator)
+
+        if first_request.upload_id:
+            data, hash, offset = self.managers[
+                "data_manager"
+            ].load_file_from_resumable_stream(request_iterator)
+            if data is None:
+                return analyser_pb2.UploadFileResponse(success=False, offset=offset)
+            return analyser_pb2.UploadFileResponse(
+                success=True, id=data.id, hash=hash, offset=offset
+            )
+
         # try:
         data, hash = self.managers["data_manager"].load_file_from_stream(
             request_iterator
@@ -288,11 +440,21 @@ class Commune(analyser_pb2_grpc.AnalyserServicer):
         #     context.set_details(f"Error transferring data with id {data.id}")
         #     return analyser_pb2.UploadDataResponse(success=False)
 
+    def get_upload_status(self, request, context):
+        offset = self.managers["data_manager"].upload_offset(request.upload_id)
+        return analyser_pb2.UploadStatusResponse(offset=offset)
+
     def check_data(self, request, context):
         try:
-            data = self.managers["data_manager"].check(request.id)
-            if data is not None:
-                return analyser_pb2.CheckDataResponse(exists=True)
+            data_manager = self.managers["data_manager"]
+            if request.hash:
+                data_id = data_manager.find(request.hash)
+            else:
+                data_id = data_manager.check(request.id)
+            if data_id is not None:
+                return analyser_pb2.CheckDataResponse(
+                    exists=True, id=data_id, hash=request.hash
+                )
             return analyser_pb2.CheckDataResponse(exists=False)
 
         except Exception as e:
@@ -318,17 +480,55 @@ class Commune(analyser_pb2_grpc.AnalyserServicer):
         d["status"] = analyser_pb2.GetPluginStatusResponse.WAITING
         variable["shared"] = d
         process_args["shared"] = d
-        future = self.process_pool.submit(run_plugin, process_args)
+
+        if not self.jobs.add(job_id, variable, timeout=self.queue_timeout):
+            context.abort(
+                grpc.StatusCode.RESOURCE_EXHAUSTED, "Too many jobs in the queue"
+            )
+
+        future = self.submit_plugin(process_args)
         variable["future"] = future
-        self.futures.append(variable)
+        future.add_done_callback(lambda _: self.jobs.finish(job_id))
 
         return analyser_pb2.RunPluginResponse(success=True, id=job_id)
 
+    def submit_plugin(self, args):
+        if not self.managers["plugin_manager"].is_async:
+            return self.process_pool.submit(run_plugin, args)
+
+        future = futures.Future()
+        self.process_pool.submit(start_plugin, args, future)
+        return future
+
     def get_plugin_status(self, request, context):
-        futures_lut = {x["id"]: i for i, x in enumerate(self.futures)}
+        return self.plugin_status(request.id)
+
+    def watch_plugin_status(self, request, context):
+        last_state = None
+        while context.is_active():
+            response = self.plugin_status(request.id)
+
+            state = (response.status, response.progress)
+            if state != last_state:
+                yield response
+                last_state = state
+
+            if response.status not in (
+                analyser_pb2.GetPluginStatusResponse.WAITING,
+                analyser_pb2.GetPluginStatusResponse.RUNNING,
+            ):
+                return
+
+            job_data = self.jobs.get(request.id)
+            if job_data is None:
+                return
+            # wakes up as soon as the job is done, otherwise checks the progress again
+            futures.wait([job_data["future"]], timeout=self.watch_interval)
+
+    def plugin_status(self, job_id):
         response = analyser_pb2.GetPluginStatusResponse()
-        if request.id in futures_lut:
-            job_data = self.futures[futures_lut[request.id]]
+        job_data = self.jobs.get(job_id)
+        if job_data is not None:
             done = job_data["future"].done()
 
             status = job_data["shared"].get(
@@ -341,6 +541,8 @@ class Commune(analyser_pb2_grpc.AnalyserServicer):
             if not done:
                 return response
 
+            # the client receives the final state now, so the job can be evicted soon
+            self.jobs.collect(job_id)
             try:
                 results = job_data["future"].result()
 
@@ -366,6 +568,75 @@ class Commune(analyser_pb2_grpc.AnalyserServicer):
 
         return response
 
+    def run_pipeline(self, request, context):
+        pipeline_id = uuid.uuid4().hex
+
+        pipeline = Pipeline(
+            MessageToDict(request),
+            submit_fn=self.submit_plugin,
+            shared_fn=self.shared_manager.dict,
+            done_fn=lambda: self.pipelines.finish(pipeline_id),
+        )
+
+        if not self.pipelines.add(pipeline_id, pipeline, timeout=self.queue_timeout):
+            context.abort(
+                grpc.StatusCode.RESOURCE_EXHAUSTED, "Too many pipelines in the queue"
+            )
+
+        if not pipeline.start():
+            self.pipelines.finish(pipeline_id)
+            return analyser_pb2.RunPipelineResponse(success=False)
+
+        return analyser_pb2.RunPipelineResponse(success=True, id=pipeline_id)
+
+    def get_pipeline_status(self, request, context):
+        return self.pipeline_status(request.id)
+
+    def watch_pipeline_status(self, request, context):
+        last_state = None
+        while context.is_active():
+            response = self.pipeline_status(request.id)
+
+            state = (response.status, response.progress)
+            if state != last_state:
+                yield response
+                last_state = state
+
+            if response.status not in (
+                analyser_pb2.GetPieplineStatusResponse.WAITING,
+                analyser_pb2.GetPieplineStatusResponse.RUNNING,
+            ):
+                return
+
+            pipeline = self.pipelines.get(request.id)
+            if pipeline is None:
+                return
+            pipeline.wait(timeout=self.watch_interval)
+
+    def pipeline_status(self, pipeline_id):
+        response = analyser_pb2.GetPieplineStatusResponse()
+        pipeline = self.pipelines.get(pipeline_id)
+        if pipeline is None:
+            response.status = analyser_pb2.GetPieplineStatusResponse.UNKNOWN
+            return response
+
+        response.progress = pipeline.progress()
+
+        if not pipeline.done():
+            response.status = analyser_pb2.GetPieplineStatusResponse.RUNNING
+            return response
+
+        self.pipelines.collect(pipeline_id)
+
+        response.status = pipeline.status
+        if pipeline.status == analyser_pb2.GetPieplineStatusResponse.DONE:
+            for symbol, data_id in pipeline.outputs().items():
+                output = response.outputs.add()
+                output.symbol = symbol
+                output.id = data_id
+
+        return response
+
     def download_data(self, request, context):
         try:
             for x in self.managers["data_manager"].dump_to_stream(request.id):
@@ -387,7 +658,12 @@ class Server:
 
         self.commune = Commune(config)
 
-        pool = futures.ThreadPoolExecutor(max_workers=10)
+        grpc_config = config.get("grpc", {})
+
+        # every watch_*_status stream holds one worker until its job is finished
+        pool = futures.ThreadPoolExecutor(
+            max_workers=grpc_config.get("max_workers", 256)
+        )
 
         self.server = grpc.server(
             pool,
@@ -401,20 +677,48 @@ class Server:
             self.server,
         )
 
-        grpc_config = config.get("grpc", {})
         port = grpc_config.get("port", 50051)
         self.server.add_insecure_port(f"[::]:{port}")
 
+        # garbage collection of the data store is only enabled if configured
+        self.gc_config = (config.get("data") or {}).get("gc")
+
+    def collect_garbage(self):
+        data_manager = self.commune.managers["data_manager"]
+        while True:
+            time.sleep(self.gc_config.get("interval", 60 * 60))
+            try:
+                reachable = cache_references(
+                    data_manager, max_age=self.gc_config.get("max_age")
+                )
+                reachable |= self.commune.referenced_data()
+                result = collect_garbage(
+                    data_manager,
+                    reachable,
+                    grace_period=self.gc_config.get(
+                        "grace_period", DEFAULT_GRACE_PERIOD
+                    ),
+                )
+                logging.info(f"[Server] gc {result}")
+            except Exception as e:
+                logging.error(f"[Server] gc {repr(e)}")
+                logging.error(traceback.format_exc())
+
     def run(self):
         logging.info("[Server] starting")
         self.server.start()
         logging.info("[Server] ready")
 
+        if self.gc_config is not None:
+            threading.Thread(target=self.collect_garbage, daemon=True).start()
+
         try:
             while True:
-                num_jobs = len(self.commune.futures)
-                num_jobs_done = len(
-                    [x for x in self.commune.futures if x["future"].done()]
+                self.commune.jobs.evict()
+                self.commune.pipelines.evict()
+                logging.debug(
+                    f"[Server] jobs: {self.commune.jobs.counts()} "
+                    f"pipelines: {self.commune.pipelines.counts()}"
                 )
                 time.sleep(10)
         except KeyboardInterrupt:
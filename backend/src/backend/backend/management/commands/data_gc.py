@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from backend.models import PluginRunResult
+
+from tibava_data import DataManager
+from tibava_data.gc import DEFAULT_GRACE_PERIOD, collect_garbage
+
+
+class Command(BaseCommand):
+    help = "Deletes data containers that are not referenced by any plugin run result"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--data-dir", type=str, default="/predictions/")
+        parser.add_argument(
+            "--grace-period",
+            type=float,
+            default=DEFAULT_GRACE_PERIOD,
+            help="seconds, newer containers are kept",
+        )
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        data_manager = DataManager(options["data_dir"])
+
+        reachable = set(
+            PluginRunResult.objects.exclude(data_id=None).values_list(
+                "data_id", flat=True
+            )
+        )
+        result = collect_garbage(
+            data_manager,
+            reachable,
+            grace_period=options["grace_period"],
+            dry_run=options["dry_run"],
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Collected {result['containers']} containers "
+                f"({result['files']} files, {result['bytes'] / 1024**3:.2f} GiB), "
+                f"kept {result['kept']}"
+            )
+        )
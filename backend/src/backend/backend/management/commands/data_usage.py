@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from backend.models import PluginRunResult
+
+from tibava_data import DataManager
+from tibava_data.gc import disk_usage
+
+
+class Command(BaseCommand):
+    help = "Reports the disk usage of the data containers per type and per user"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--data-dir", type=str, default="/predictions/")
+
+    def handle(self, *args, **options):
+        data_manager = DataManager(options["data_dir"])
+
+        owners = dict(
+            PluginRunResult.objects.exclude(data_id=None).values_list(
+                "data_id", "plugin_run__video__owner__username"
+            )
+        )
+        usage = disk_usage(data_manager, owners=owners)
+
+        def format_entry(name, entry):
+            return f"{name}: {entry['count']} containers, {entry['bytes'] / 1024**3:.2f} GiB"
+
+        self.stdout.write(self.style.SUCCESS(format_entry("Total", usage["total"])))
+        for data_type, entry in sorted(
+            usage["types"].items(), key=lambda x: -x[1]["bytes"]
+        ):
+            self.stdout.write(format_entry(f"Type {data_type}", entry))
+        for owner, entry in sorted(
+            usage["owners"].items(), key=lambda x: -x[1]["bytes"]
+        ):
+            self.stdout.write(format_entry(f"User {owner or '(unreferenced)'}", entry))
@@ -1,4 +1,5 @@
 from django.contrib.auth.base_user import BaseUserManager
+from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 class TibavaUserManager(BaseUserManager):
@@ -7,4 +8,18 @@ class TibavaUserManager(BaseUserManager):
         user = self.model(username=username, email=email)
         user.set_password(password)
         user.save()
-        return user
\ No newline at end of file
+        return user
+
+
+class TimelineSegmentQuerySet(models.QuerySet):
+    """Range predicates on segments, they are served by the (timeline, start)
+    and (timeline, end) indexes when filtered by timeline"""
+
+    def within(self, start, end):
+        return self.filter(start__gte=start, end__lte=end)
+
+    def containing(self, time):
+        return self.filter(start__lte=time, end__gte=time)
+
+    def overlapping(self, start, end):
+        return self.filter(start__lte=end, end__gte=start)
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.6 on 2026-10-18 09:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0024_tibavauser_max_plugin_runs_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='timelinesegment',
+            index=models.Index(fields=['timeline', 'start'], name='backend_tim_timelin_8254a3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timelinesegment',
+            index=models.Index(fields=['timeline', 'end'], name='backend_tim_timelin_b81a0e_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 import logging
 import os
 from random import random
+from typing import Dict, List, Tuple
 import uuid
 
 from django.conf import settings
@@ -12,7 +13,8 @@ from backend.utils.color import rgb_to_hex, random_rgb
 
 from tibava_data import DataManager
 from backend.utils import media_path_to_video
-from .managers import TibavaUserManager
+from backend.utils.result_cache import delete_result_cache
+from .managers import TibavaUserManager, TimelineSegmentQuerySet
 
 
 logger = logging.getLogger(__name__)
@@ -71,20 +73,20 @@ class Video(models.Model):
             "num_timelines": len(Timeline.objects.filter(video=self)),
         }
 
-    def clone(self, owner=None, include_timelines=True, include_annotations=True):
-        video_dict = self.to_dict(include_refs_hashes=False, include_refs=False)
-        del video_dict["id"]
-        if owner is not None:
-            video_dict["owner"] = owner
-
-        new_video_db = Video.objects.create(**video_dict)
-        if include_timelines:
-            for timeline in Timeline.objects.filter(video=self):
-                timeline.clone(
-                    video=new_video_db, include_annotations=include_annotations
-                )
-
-        return new_video_db  # FIXME
+    def clone(
+        self,
+        owner=None,
+        include_timelines=True,
+        include_annotations=True,
+        include_results=True,
+    ):
+        return clone_video(
+            self,
+            owner=owner,
+            include_timelines=include_timelines,
+            include_annotations=include_annotations,
+            include_results=include_results,
+        )
 
 
 @receiver(post_delete, sender=Video)
@@ -204,6 +206,7 @@ def delete_pluginresult_data(sender, instance, **kwargs):
         f"Deleting PluginRunResult {instance.id} by user {instance.plugin_run.video.owner.username}"
     )
     data_manager = DataManager("/predictions/")
+    delete_result_cache(instance.id)
 
     # check if the data are reference somewhere else
     for x in PluginRunResult.objects.filter(data_id=instance.data_id):
@@ -212,11 +215,11 @@ def delete_pluginresult_data(sender, instance, **kwargs):
         return
     try:
         if instance.type == PluginRunResult.TYPE_IMAGES:
-            data = data_manager.load(instance.data_id)
+            # only the ids and extensions of the images are required
+            data = data_manager.load(instance.data_id, fields=["ext"])
             try:
                 with data:
-                    data.load()
-                images = data.images
+                    images = data.images
             except AttributeError:
                 images = []
             for image in images:
@@ -334,14 +337,11 @@ class Timeline(models.Model):
             video=video, name=self.name, type=self.type
         )
 
-        timeline_segment_added = []
-        timeline_segment_annotations_added = []
-        for segment in self.timelinesegment_set.all():
-            result = segment.clone(new_timeline_db, include_annotations)
-            timeline_segment_added.extend(result["timeline_segment_added"])
-            timeline_segment_annotations_added.extend(
-                result["timeline_segment_annotation_added"]
-            )
+        timeline_segment_added, timeline_segment_annotations_added = clone_segments(
+            self.timelinesegment_set.all(),
+            timeline_map={self.id: new_timeline_db.id},
+            include_annotations=include_annotations,
+        )
 
         return {
             "timeline_added": new_timeline_db,
@@ -405,8 +405,14 @@ class TimelineSegment(models.Model):
     start = models.FloatField(default=0)
     end = models.FloatField(default=0)
 
+    objects = TimelineSegmentQuerySet.as_manager()
+
     class Meta:
         ordering = ["start"]
+        indexes = [
+            models.Index(fields=["timeline", "start"]),
+            models.Index(fields=["timeline", "end"]),
+        ]
 
     def to_dict(self, include_refs_hashes=True, include_refs=False, **kwargs):
         result = {
@@ -426,25 +432,15 @@ class TimelineSegment(models.Model):
         return result
 
     def clone(self, timeline=None, include_annotations=True):
-        if not timeline:
-            timeline = self.timeline
-        new_timeline_segment_db = TimelineSegment.objects.create(
-            timeline=timeline, color=self.color, start=self.start, end=self.end
+        timeline_map = {} if not timeline else {self.timeline_id: timeline.id}
+        timeline_segment_added, timeline_segment_annotation_added = clone_segments(
+            TimelineSegment.objects.filter(id=self.id),
+            timeline_map=timeline_map,
+            include_annotations=include_annotations,
         )
 
-        if not include_annotations:
-            return new_timeline_segment_db
-
-        timeline_segment_annotation_added = []
-        for annotation in self.timelinesegmentannotation_set.all():
-            timeline_segment_annotation_added.extend(
-                annotation.clone(new_timeline_segment_db)[
-                    "timeline_segment_annotation_added"
-                ]
-            )
-
         return {
-            "timeline_segment_added": [new_timeline_segment_db],
+            "timeline_segment_added": timeline_segment_added,
             "timeline_segment_annotation_added": timeline_segment_annotation_added,
         }
 
@@ -655,3 +651,173 @@ class VideoAnalysisState(models.Model):
         }
 
         return result
+
+
+# rows per INSERT statement when subtrees are cloned
+CLONE_BATCH_SIZE = 2000
+
+
+def copy_instance(obj: models.Model, pk=None, **fields) -> models.Model:
+    """Unsaved copy of a row, fields are given by attname (e.g. video_id).
+
+    Rows with an uuid primary key get a new one unless pk is given.
+    """
+    values = {x.attname: getattr(obj, x.attname) for x in obj._meta.concrete_fields}
+    values.update(fields)
+    if pk is None and isinstance(obj._meta.pk, models.UUIDField):
+        pk = uuid.uuid4()
+    if pk is not None:
+        values[obj._meta.pk.attname] = pk
+    return type(obj)(**values)
+
+
+def clone_rows(model, rows, id_map: Dict = None, **fields) -> List[models.Model]:
+    """Copies rows with bulk inserts and records their new ids in id_map.
+
+    A field value that is a dict translates the old value of the field, values
+    that are not in the dict are kept (e.g. parent_id=timeline_map). Ids that
+    are already in id_map are used for the copies.
+    """
+    if id_map is None:
+        id_map = {}
+    new_rows = []
+    for x in rows:
+        values = {}
+        for name, value in fields.items():
+            if isinstance(value, dict):
+                old_value = getattr(x, name)
+                value = value.get(old_value, old_value)
+            values[name] = value
+        new_row = copy_instance(x, pk=id_map.get(x.pk), **values)
+        id_map[x.pk] = new_row.pk
+        new_rows.append(new_row)
+    model.objects.bulk_create(new_rows, batch_size=CLONE_BATCH_SIZE)
+    return new_rows
+
+
+def clone_segments(
+    segments,
+    timeline_map: Dict = None,
+    annotation_map: Dict = None,
+    include_annotations: bool = True,
+) -> Tuple[List[TimelineSegment], List[TimelineSegmentAnnotation]]:
+    """Copies a queryset of segments and their annotations with two queries.
+
+    Segments are moved to the timelines in timeline_map and their
+    annotations are replaced according to annotation_map.
+    """
+    segment_map = {}
+    new_segments = clone_rows(
+        TimelineSegment, segments, segment_map, timeline_id=timeline_map or {}
+    )
+    if not include_annotations:
+        return new_segments, []
+
+    new_segment_annotations = clone_rows(
+        TimelineSegmentAnnotation,
+        TimelineSegmentAnnotation.objects.filter(timeline_segment__in=segments),
+        timeline_segment_id=segment_map,
+        annotation_id=annotation_map or {},
+    )
+    return new_segments, new_segment_annotations
+
+
+def clone_video(
+    video: Video,
+    owner=None,
+    include_timelines: bool = True,
+    include_annotations: bool = True,
+    include_results: bool = True,
+) -> Video:
+    """Deep copy of a video with a constant number of queries.
+
+    Every level of the subtree (plugin runs and results, categories,
+    annotations, timelines, segments, clusters) is read with one query, its
+    ids are remapped in memory and it is written with bulk inserts. Data
+    packages of plugin results are shared with the original.
+    """
+    new_video_db = copy_instance(
+        video, owner_id=video.owner_id if owner is None else owner.id
+    )
+    new_video_db.save()
+
+    plugin_run_map = {}
+    plugin_run_result_map = {}
+    if include_results:
+        plugin_runs = PluginRun.objects.filter(
+            video=video, status=PluginRun.STATUS_DONE
+        )
+        clone_rows(PluginRun, plugin_runs, plugin_run_map, video_id=new_video_db.id)
+        clone_rows(
+            PluginRunResult,
+            PluginRunResult.objects.filter(plugin_run__in=plugin_runs),
+            plugin_run_result_map,
+            plugin_run_id=plugin_run_map,
+        )
+
+    owner_id = new_video_db.owner_id
+    annotation_map = {}
+    if include_annotations:
+        category_map = {}
+        clone_rows(
+            AnnotationCategory,
+            AnnotationCategory.objects.filter(video=video),
+            category_map,
+            video_id=new_video_db.id,
+            owner_id=owner_id,
+        )
+        clone_rows(
+            Annotation,
+            Annotation.objects.filter(video=video),
+            annotation_map,
+            category_id=category_map,
+            video_id=new_video_db.id,
+            owner_id=owner_id,
+        )
+
+    timeline_map = {}
+    if include_timelines:
+        timelines = list(Timeline.objects.filter(video=video))
+        # parents can come after their children
+        timeline_map = {x.id: uuid.uuid4() for x in timelines}
+        clone_rows(
+            Timeline,
+            timelines,
+            timeline_map,
+            video_id=new_video_db.id,
+            parent_id=timeline_map,
+            plugin_run_result_id=plugin_run_result_map,
+        )
+        clone_segments(
+            TimelineSegment.objects.filter(timeline__video=video),
+            timeline_map=timeline_map,
+            annotation_map=annotation_map,
+            include_annotations=include_annotations,
+        )
+
+    if include_results:
+        cluster_timeline_item_map = {}
+        clone_rows(
+            ClusterTimelineItem,
+            ClusterTimelineItem.objects.filter(video=video),
+            cluster_timeline_item_map,
+            video_id=new_video_db.id,
+            plugin_run_id=plugin_run_map,
+        )
+        clone_rows(
+            ClusterItem,
+            ClusterItem.objects.filter(cluster_timeline_item__video=video),
+            cluster_timeline_item_id=cluster_timeline_item_map,
+            video_id=new_video_db.id,
+            plugin_run_result_id=plugin_run_result_map,
+        )
+        clone_rows(
+            VideoAnalysisState,
+            VideoAnalysisState.objects.filter(video=video),
+            {video.id: new_video_db.id},
+            selected_shots_id=timeline_map,
+            selected_place_clustering_id=plugin_run_map,
+            selected_face_clustering_id=plugin_run_map,
+        )
+
+    return new_video_db
@@ -9,6 +9,7 @@ from celery import shared_task
 from backend.models import PluginRun, Video, TibavaUser, PluginRunResult
 
 from backend.exceptions import RateLimitExceededException
+from backend.utils.result_cache import write_result_cache
 from tibava_data import DataManager
 
 from django.conf import settings
@@ -155,35 +156,14 @@ class PluginManager:
 def generate_plugin_run_result_cache(
     data_manager, plugin_run_result: List[str]
 ) -> None:
-    for plugin_run_result_id in plugin_run_result:
-        x = PluginRunResult.objects.get(id=plugin_run_result_id)
-        # print("B", flush=True)
-        cache_path = os.path.join(settings.DATA_CACHE_ROOT, f"{x.id}.json")
-        # print("C", flush=True)
-        # print(cache_path, flush=True)
-        cached = False
+    """Precomputes the payloads that the result list sends for new results"""
+    for x in PluginRunResult.objects.filter(id__in=plugin_run_result).select_related(
+        "plugin_run"
+    ):
         try:
-            if os.path.exists(cache_path):
-                with open(cache_path, "r") as f:
-                    cached = True
+            write_result_cache(data_manager, x)
         except Exception:
-            logger.exception("Cache reading failed")
-        if cached:
-            continue
-        # print(f"x {x}")
-        # TODO fix me
-        data = data_manager.load(x.data_id)
-        if data is None:
-            continue
-        # print(data)
-        with data:
-            result_dict = {**x.to_dict(), "data": data.to_dict()}
-            try:
-                with open(cache_path, "w") as f:
-                    json.dump(result_dict, f)
-                    logger.debug(f"Writin result {x.id} to cache")
-            except Exception:
-                logger.exception("Cache couldn't write")
+            logger.exception("Cache couldn't write")
 
 
 @shared_task(bind=True, max_retries=None)
@@ -0,0 +1,122 @@
+from collections import defaultdict
+from typing import Dict, List
+
+from django.db.models import QuerySet
+
+from backend.models import (
+    PluginRunResult,
+    Timeline,
+    TimelineSegment,
+    TimelineSegmentAnnotation,
+)
+
+# The functions in this module produce the same dicts as the to_dict methods
+# of the models with include_refs_hashes=True. They read plain values instead
+# of model instances and fetch every relation with a single query, so the
+# number of queries does not depend on the number of rows.
+
+
+def _hex(value) -> str:
+    return value.hex if value is not None else None
+
+
+def _group(rows) -> Dict:
+    groups = defaultdict(list)
+    for key, value in rows:
+        groups[key].append(value.hex)
+    return groups
+
+
+def serialize_timelines(
+    timelines: QuerySet, add_results_type: bool = False
+) -> List[Dict]:
+    """Timelines with the ids of their segments, two queries"""
+    segment_ids = _group(
+        TimelineSegment.objects.filter(timeline__in=timelines).values_list(
+            "timeline_id", "id"
+        )
+    )
+
+    entries = []
+    for x in timelines.values(
+        "id",
+        "video_id",
+        "name",
+        "type",
+        "visualization",
+        "order",
+        "collapse",
+        "colormap",
+        "colormap_inverse",
+        "parent_id",
+        "plugin_run_result_id",
+        "plugin_run_result__type",
+    ):
+        entry = {
+            "id": x["id"].hex,
+            "video_id": x["video_id"].hex,
+            "name": x["name"],
+            "type": Timeline.TYPE[x["type"]],
+            "visualization": Timeline.VISUALIZATION[x["visualization"]],
+            "order": x["order"],
+            "collapse": x["collapse"],
+            "colormap": x["colormap"],
+            "colormap_inverse": x["colormap_inverse"],
+            "parent_id": _hex(x["parent_id"]),
+            "timeline_segment_ids": segment_ids.get(x["id"], []),
+        }
+        if x["plugin_run_result_id"] is not None:
+            entry["plugin_run_result_id"] = x["plugin_run_result_id"].hex
+        if add_results_type:
+            entry["plugin"] = {
+                "type": PluginRunResult.TYPE.get(x["plugin_run_result__type"])
+            }
+        entries.append(entry)
+    return entries
+
+
+def serialize_timeline_segments(segments: QuerySet) -> List[Dict]:
+    """Segments with the ids of their annotations, two queries"""
+    annotation_ids = _group(
+        TimelineSegmentAnnotation.objects.filter(
+            timeline_segment__in=segments
+        ).values_list("timeline_segment_id", "annotation_id")
+    )
+
+    return [
+        {
+            "id": x["id"].hex,
+            "timeline_id": x["timeline_id"].hex,
+            "color": x["color"],
+            "start": x["start"],
+            "end": x["end"],
+            "annotation_ids": annotation_ids.get(x["id"], []),
+        }
+        for x in segments.values("id", "timeline_id", "color", "start", "end")
+    ]
+
+
+def serialize_timeline_segment_annotations(
+    segment_annotations: QuerySet,
+) -> List[Dict]:
+    return [
+        {
+            "id": x["id"].hex,
+            "date": x["date"],
+            "annotation_id": x["annotation_id"].hex,
+            "timeline_segment_id": x["timeline_segment_id"].hex,
+        }
+        for x in segment_annotations.values(
+            "id", "date", "annotation_id", "timeline_segment_id"
+        )
+    ]
+
+
+def serialize_annotations(annotations: QuerySet) -> List[Dict]:
+    entries = []
+    for x in annotations.values("id", "name", "color", "category_id"):
+        entry = {"id": x["id"].hex, "name": x["name"], "color": x["color"]}
+        if x["category_id"] is not None:
+            entry["category_id"] = x["category_id"].hex
+        entries.append(entry)
+    return entries
@@ -7,7 +7,7 @@ from backend.models import PluginRun, Video, Timeline
 from backend.plugin_manager import PluginManager
 
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 from backend.utils.color import get_color_from_label
 
 from tibava_data import DataManager  # type: ignore
@@ -142,7 +142,8 @@ class AudioClassification(Task):
                         timeline.id.hex
                     )
                     for annotation in sub_data.annotations:
-                        timeline_segment_db = TimelineSegment.objects.create(
+                        timeline_segment_db = ingest.create(
+                            TimelineSegment,
                             timeline=timeline,
                             start=annotation.start,
                             end=annotation.end,
@@ -154,20 +155,21 @@ class AudioClassification(Task):
                                     label[: max(0, settings.ANNOTATION_MAX_LENGTH - 4)]
                                     + " ..."
                                 )
-                            annotation_db, _ = Annotation.objects.get_or_create(
+                            annotation_db, _ = ingest.get_or_create_annotation(
                                 name=label,
                                 video=video,
                                 owner=user,
                                 color=get_color_from_label(label),
                             )
 
-                            TimelineSegmentAnnotation.objects.create(
+                            ingest.create(
+                                TimelineSegmentAnnotation,
                                 annotation=annotation_db,
                                 timeline_segment=timeline_segment_db,
                             )
             return result_timelines
 
-        with transaction.atomic():
+        with transaction.atomic(), BulkIngest() as ingest:
             result_timelines = {}
             with result[1]["annotations"] as data:
                 logging.info(data)
@@ -7,7 +7,7 @@ from backend.models import PluginRun, Video, Timeline
 from backend.plugin_manager import PluginManager
 
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 from backend.utils.color import color_map
 
 from tibava_data import DataManager  # type: ignore
@@ -122,7 +122,8 @@ class AudioGender(Task):
             result_timelines = {"annotation": parent_timeline.id.hex}
 
             for annotation in ann_data.annotations:
-                timeline_segment_db = TimelineSegment.objects.create(
+                timeline_segment_db = ingest.create(
+                    TimelineSegment,
                     timeline=parent_timeline,
                     start=annotation.start,
                     end=annotation.end,
@@ -130,7 +131,7 @@ class AudioGender(Task):
 
                 label = str(annotation.labels[0][annotation_key])
 
-                annotation_db, _ = Annotation.objects.get_or_create(
+                annotation_db, _ = ingest.get_or_create_annotation(
                     name=label.title(),
                     video=video,
                     owner=user,
@@ -138,7 +139,8 @@ class AudioGender(Task):
                     color=color_mapping[label],
                 )
 
-                TimelineSegmentAnnotation.objects.create(
+                ingest.create(
+                    TimelineSegmentAnnotation,
                     annotation=annotation_db,
                     timeline_segment=timeline_segment_db,
                 )
@@ -154,7 +156,8 @@ class AudioGender(Task):
                 result_timelines[gender] = timeline.id.hex
 
                 for annotation in ann_data.annotations:
-                    timeline_segment_db = TimelineSegment.objects.create(
+                    timeline_segment_db = ingest.create(
+                        TimelineSegment,
                         timeline=timeline,
                         start=annotation.start,
                         end=annotation.end,
@@ -162,21 +165,22 @@ class AudioGender(Task):
 
                     prob = annotation.labels[0][prob_key][idx]
 
-                    annotation_db, _ = Annotation.objects.get_or_create(
+                    annotation_db, _ = ingest.get_or_create_annotation(
                         name=f"{round(prob * 100, 1)}%",
                         video=video,
                         owner=user,
                         color=color_map(prob),
                     )
 
-                    TimelineSegmentAnnotation.objects.create(
+                    ingest.create(
+                        TimelineSegmentAnnotation,
                         annotation=annotation_db,
                         timeline_segment=timeline_segment_db,
                     )
 
             return result_timelines
 
-        with transaction.atomic():
+        with transaction.atomic(), BulkIngest() as ingest:
             with result[1]["annotations"] as ann_data:
                 genders = {"female": 0, "male": 1}
 
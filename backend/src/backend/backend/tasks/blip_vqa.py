@@ -7,7 +7,7 @@ from backend.models import PluginRun, PluginRunResult, Video, Timeline
 from backend.plugin_manager import PluginManager
 from backend.utils import media_path_to_video
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 from tibava_data import Shot, DataManager
 from backend.models import (
     AnnotationCategory,
@@ -119,7 +119,7 @@ class BLIPVQA(Task):
             logging.warning("dry_run or plugin_run is None")
             return {}
 
-        with transaction.atomic():
+        with transaction.atomic(), BulkIngest() as ingest:
             with result[1]["annotations"] as data:
                 # print("A", flush=True)
                 """
@@ -138,7 +138,8 @@ class BLIPVQA(Task):
 
                 # print("B", flush=True)
                 for annotation in data.annotations:
-                    timeline_segment_db = TimelineSegment.objects.create(
+                    timeline_segment_db = ingest.create(
+                        TimelineSegment,
                         timeline=annotation_timeline_db,
                         start=annotation.start,
                         end=annotation.end,
@@ -151,7 +152,7 @@ class BLIPVQA(Task):
                                 label[: max(0, settings.ANNOTATION_MAX_LENGTH - 4)]
                                 + " ..."
                             )
-                        annotation_db, _ = Annotation.objects.get_or_create(
+                        annotation_db, _ = ingest.get_or_create_annotation(
                             name=label,
                             video=video,
                             category=category_db,
@@ -160,7 +161,8 @@ class BLIPVQA(Task):
                         )
                         # print(f"D {str(label)}", flush=True)
 
-                        TimelineSegmentAnnotation.objects.create(
+                        ingest.create(
+                            TimelineSegmentAnnotation,
                             annotation=annotation_db,
                             timeline_segment=timeline_segment_db,
                         )
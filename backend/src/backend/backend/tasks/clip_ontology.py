@@ -18,7 +18,7 @@ from backend.models import (
 from backend.plugin_manager import PluginManager
 from backend.utils import media_path_to_video
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 from tibava_data import Shot, DataManager
 from django.db import transaction
 from django.conf import settings
@@ -137,7 +137,7 @@ class CLIPOntology(Task):
             logging.warning("dry_run or plugin_run is None")
             return {}
 
-        with transaction.atomic():
+        with transaction.atomic(), BulkIngest() as ingest:
             with aggregate_result[1]["aggregated_scalars"] as data:
                 # Annotate shots
                 if shots_id:
@@ -163,7 +163,8 @@ class CLIPOntology(Task):
 
                         for annotation in annotations_data.annotations:
                             # create TimelineSegment
-                            timeline_segment_db = TimelineSegment.objects.create(
+                            timeline_segment_db = ingest.create(
+                                TimelineSegment,
                                 timeline=annotation_timeline_db,
                                 start=annotation.start,
                                 end=annotation.end,
@@ -171,14 +172,15 @@ class CLIPOntology(Task):
 
                             for label in annotation.labels:
                                 # add annotion to TimelineSegment
-                                annotation_db, _ = Annotation.objects.get_or_create(
+                                annotation_db, _ = ingest.get_or_create_annotation(
                                     name=label,
                                     video=video,
                                     category=category_db,
                                     owner=user,
                                 )
 
-                                TimelineSegmentAnnotation.objects.create(
+                                ingest.create(
+                                    TimelineSegmentAnnotation,
                                     annotation=annotation_db,
                                     timeline_segment=timeline_segment_db,
                                 )
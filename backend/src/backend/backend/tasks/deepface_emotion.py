@@ -18,7 +18,7 @@ from backend.utils import media_path_to_video
 from ..utils.analyser_client import TaskAnalyserClient
 from tibava_data import Shot, ShotsData, DataManager
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 
 from django.db import transaction
 from django.conf import settings
@@ -145,7 +145,7 @@ class DeepfaceEmotion(Task):
             logging.warning("dry_run or plugin_run is None")
             return {}
 
-        with transaction.atomic():
+        with transaction.atomic(), BulkIngest() as ingest:
             with aggregate_result[1]["aggregated_scalars"] as data:
                 timeline_dict = {}
                 # Annotate shots
@@ -175,7 +175,8 @@ class DeepfaceEmotion(Task):
 
                         for annotation in annotations_data.annotations:
                             # create TimelineSegment
-                            timeline_segment_db = TimelineSegment.objects.create(
+                            timeline_segment_db = ingest.create(
+                                TimelineSegment,
                                 timeline=annotation_timeline_db,
                                 start=annotation.start,
                                 end=annotation.end,
@@ -183,14 +184,15 @@ class DeepfaceEmotion(Task):
 
                             for label in annotation.labels:
                                 # add annotion to TimelineSegment
-                                annotation_db, _ = Annotation.objects.get_or_create(
+                                annotation_db, _ = ingest.get_or_create_annotation(
                                     name=LABEL_LUT.get(label, label),
                                     video=video,
                                     category=category_db,
                                     owner=user,
                                 )
 
-                                TimelineSegmentAnnotation.objects.create(
+                                ingest.create(
+                                    TimelineSegmentAnnotation,
                                     annotation=annotation_db,
                                     timeline_segment=timeline_segment_db,
                                 )
@@ -19,7 +19,7 @@ from backend.utils import media_path_to_video
 from ..utils.analyser_client import TaskAnalyserClient
 from tibava_data import DataManager
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 from django.db import transaction
 from django.conf import settings
 
@@ -73,139 +73,116 @@ class FaceClustering(Task):
             manager=manager,
         )
 
-        # face detector
         video_data_id = self.upload_video(client, video)
-        facedetector_result = self.run_analyser(
-            client,
-            "insightface_video_detector_torch",
-            parameters={
-                "fps": parameters.get("fps"),
-            },
-            inputs={"video": video_data_id},
-            outputs=["images", "kpss", "faces", "bboxes"],
-        )
-
-        if plugin_run is not None:
-            plugin_run.progress = 0.2
-            plugin_run.save()
-
-        if facedetector_result is None:
-            raise Exception
-
-        face_size_filter_result = self.run_analyser(
-            client,
-            "face_size_filter",
-            parameters={
-                "min_face_height": parameters.get("min_face_height"),
-            },
-            inputs=facedetector_result[0],
-            outputs=["images", "kpss", "faces", "bboxes"],
-            downloads=["images", "kpss", "faces", "bboxes"],
-        )
-
-        if plugin_run is not None:
-            plugin_run.progress = 0.4
-            plugin_run.save()
-
-        if face_size_filter_result is None:
-            raise Exception
-
-        # create image embeddings
-        image_feature_result = self.run_analyser(
-            client,
-            "insightface_video_feature_extractor",
-            inputs={
-                "video": video_data_id,
-                "kpss": face_size_filter_result[0]["kpss"],
-                "faces": face_size_filter_result[0]["faces"],
-            },
-            outputs=["features"],
-            downloads=["features"],
-        )
-
-        if plugin_run is not None:
-            plugin_run.progress = 0.6
-            plugin_run.save()
-
-        if image_feature_result is None:
-            raise Exception
 
         # cluster faces
         if parameters.get("clustering_method").lower() == "agglomerative":
-            cluster_result = self.run_analyser(
-                client,
-                "clustering",
-                parameters={
+            clustering = {
+                "plugin": "clustering",
+                "parameters": {
                     "cluster_threshold": parameters.get("cluster_threshold"),
                     "max_samples_per_cluster": parameters.get(
                         "max_samples_per_cluster"
                     ),
                 },
-                inputs={
-                    "embeddings": image_feature_result[0]["features"],
-                },
-                outputs=["cluster_data"],
-                downloads=["cluster_data"],
-            )
+            }
         elif parameters.get("clustering_method").lower() == "dbscan":
-            cluster_result = self.run_analyser(
-                client,
-                "dbscanclustering",
-                parameters={
+            clustering = {
+                "plugin": "dbscanclustering",
+                "parameters": {
                     "cluster_threshold": parameters.get("cluster_threshold"),
                     "metric": parameters.get("metric"),
                     "max_samples_per_cluster": parameters.get(
                         "max_samples_per_cluster"
                     ),
                 },
-                inputs={
-                    "embeddings": image_feature_result[0]["features"],
-                },
-                outputs=["cluster_data"],
-                downloads=["cluster_data"],
-            )
+            }
         else:
             raise Exception
 
-        if plugin_run is not None:
-            plugin_run.progress = 0.8
-            plugin_run.save()
-
-        if cluster_result is None:
-            raise Exception
-
-        # cluster filter top k clusters
-        cluster_filter_result = self.run_analyser(
+        pipeline_result = self.run_pipeline(
             client,
-            "cluster_size_filter",
-            parameters={
-                "max_cluster": parameters.get("max_cluster"),
-            },
-            inputs={
-                "clusters": cluster_result[0]["cluster_data"],
-            },
-            downloads=["clusters"],
+            [
+                # face detector
+                {
+                    "plugin": "insightface_video_detector_torch",
+                    "parameters": {"fps": parameters.get("fps")},
+                    "inputs": {"video": "video"},
+                    "outputs": {
+                        "images": "detector_images",
+                        "kpss": "detector_kpss",
+                        "faces": "detector_faces",
+                        "bboxes": "detector_bboxes",
+                    },
+                },
+                {
+                    "plugin": "face_size_filter",
+                    "parameters": {
+                        "min_face_height": parameters.get("min_face_height"),
+                    },
+                    "inputs": {
+                        "images": "detector_images",
+                        "kpss": "detector_kpss",
+                        "faces": "detector_faces",
+                        "bboxes": "detector_bboxes",
+                    },
+                    "outputs": {
+                        "images": "images",
+                        "kpss": "kpss",
+                        "faces": "faces",
+                        "bboxes": "bboxes",
+                    },
+                },
+                # create image embeddings
+                {
+                    "plugin": "insightface_video_feature_extractor",
+                    "inputs": {"video": "video", "kpss": "kpss", "faces": "faces"},
+                    "outputs": {"features": "features"},
+                },
+                {
+                    **clustering,
+                    "inputs": {"embeddings": "features"},
+                    "outputs": {"cluster_data": "cluster_data"},
+                },
+                # cluster filter top k clusters
+                {
+                    "plugin": "cluster_size_filter",
+                    "parameters": {"max_cluster": parameters.get("max_cluster")},
+                    "inputs": {"clusters": "cluster_data"},
+                    "outputs": {"clusters": "clusters"},
+                },
+            ],
+            inputs={"video": video_data_id},
+            downloads=["images", "kpss", "faces", "bboxes", "features", "clusters"],
+            plugin_run=plugin_run,
         )
 
-        if cluster_filter_result is None:
+        if pipeline_result is None:
             raise Exception
 
+        _, pipeline_data = pipeline_result
+
         # save thumbnails
-        with face_size_filter_result[1]["images"] as d:
+        with pipeline_data["images"] as d:
             # extract thumbnails
             d.extract_all(manager)
 
         embedding_face_lut = {}
-        with image_feature_result[1]["features"] as d:
+        with pipeline_data["features"] as d:
             for embedding in d.embeddings:
                 embedding_face_lut[embedding.id] = embedding.ref_id
 
+        # the first image of every face
+        face_image_lut = {}
+        for image in pipeline_data["images"].images:
+            face_image_lut.setdefault(image.ref_id, image)
+
         if dry_run or plugin_run is None:
             logging.warning("dry_run or plugin_run is None")
             return {}
 
-        with transaction.atomic():
-            with cluster_filter_result[1]["clusters"] as data:
+        with transaction.atomic(), BulkIngest() as ingest:
+            with pipeline_data["clusters"] as data:
                 # save cluster results
                 plugin_run_result_db = PluginRunResult.objects.create(
                     plugin_run=plugin_run,
@@ -216,62 +193,62 @@ class FaceClustering(Task):
 
                 plugin_run_result_faces_db = PluginRunResult.objects.create(
                     plugin_run=plugin_run,
-                    data_id=face_size_filter_result[1]["faces"].id,
+                    data_id=pipeline_data["faces"].id,
                     name="faces",
                     type=PluginRunResult.TYPE_FACE,
                 )
 
                 plugin_run_result_bboxes_db = PluginRunResult.objects.create(
                     plugin_run=plugin_run,
-                    data_id=face_size_filter_result[1]["bboxes"].id,
+                    data_id=pipeline_data["bboxes"].id,
                     name="bboxes",
                     type=PluginRunResult.TYPE_BBOXES,
                 )
 
                 plugin_run_result_kpss_db = PluginRunResult.objects.create(
                     plugin_run=plugin_run,
-                    data_id=face_size_filter_result[1]["kpss"].id,
+                    data_id=pipeline_data["kpss"].id,
                     name="kpss",
                     type=PluginRunResult.TYPE_KPSS,
                 )
 
                 plugin_run_result_images_db = PluginRunResult.objects.create(
                     plugin_run=plugin_run,
-                    data_id=face_size_filter_result[1]["images"].id,
+                    data_id=pipeline_data["images"].id,
                     name="images",
                     type=PluginRunResult.TYPE_IMAGES,
                 )
 
                 plugin_run_result_features_db = PluginRunResult.objects.create(
                     plugin_run=plugin_run,
-                    data_id=image_feature_result[1]["features"].id,
+                    data_id=pipeline_data["features"].id,
                     name="features",
                     type=PluginRunResult.TYPE_IMAGE_EMBEDDINGS,
                 )
 
                 # create a cti for every detected cluster
                 for cluster_index, cluster in enumerate(data.clusters):
-                    cluster_timeline_item_db = ClusterTimelineItem.objects.create(
+                    cluster_timeline_item_db = ingest.create(
+                        ClusterTimelineItem,
                         video=video,
                         cluster_id=cluster.id,
                         name=f"Cluster {cluster_index + 1}",
                         plugin_run=plugin_run,
                     )
 
+                    sample_embedding_ids = set(cluster.sample_embedding_ids)
+
                     # create a face db item for every detected face
                     for face_index, embedding_id in enumerate(cluster.embedding_ids):
-                        image = [
-                            f
-                            for f in face_size_filter_result[1]["images"].images
-                            if f.ref_id == embedding_face_lut[embedding_id]
-                        ][0]
+                        image = face_image_lut[embedding_face_lut[embedding_id]]
                         image_path = os.path.join(
                             self.config.get("base_url"),
                             image.id[0:2],
                             image.id[2:4],
                             f"{image.id}.{image.ext}",
                         )
-                        _ = ClusterItem.objects.create(
+                        ingest.create(
+                            ClusterItem,
                             cluster_timeline_item=cluster_timeline_item_db,
                             video=video,
                             # plugin_item_ref=embedding_face_lut[embedding_id],
@@ -281,7 +258,7 @@ class FaceClustering(Task):
                             type=ClusterItem.TYPE_FACE,
                             time=image.time,
                             delta_time=image.delta_time,
-                            is_sample=embedding_id in cluster.sample_embedding_ids,
+                            is_sample=embedding_id in sample_embedding_ids,
                         )
 
                 return {
@@ -295,7 +272,7 @@ class FaceClustering(Task):
                         plugin_run_result_features_db.id.hex,
                     ],
                     "timelines": {},
-                    "data": {"clusters": cluster_filter_result[1]["clusters"].id},
+                    "data": {"clusters": pipeline_data["clusters"].id},
                 }
 
     def get_results(self, analyse):
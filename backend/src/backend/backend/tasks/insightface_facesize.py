@@ -18,7 +18,7 @@ from backend.utils import media_path_to_video
 from ..utils.analyser_client import TaskAnalyserClient
 from tibava_data import Shot, ShotsData, DataManager
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 from django.db import transaction
 from django.conf import settings
 
@@ -147,7 +147,7 @@ class InsightfaceFacesize(Task):
             logging.warning("dry_run or plugin_run is None")
             return {}
 
-        with transaction.atomic():
+        with transaction.atomic(), BulkIngest() as ingest:
             with facesize_result[1]["annotations"] as annotations:
                 annotation_timeline_db = Timeline.objects.create(
                     video=video,
@@ -160,7 +160,8 @@ class InsightfaceFacesize(Task):
                 )
                 for annotation in annotations.annotations:
                     # create TimelineSegment
-                    timeline_segment_db = TimelineSegment.objects.create(
+                    timeline_segment_db = ingest.create(
+                        TimelineSegment,
                         timeline=annotation_timeline_db,
                         start=annotation.start,
                         end=annotation.end,
@@ -168,14 +169,15 @@ class InsightfaceFacesize(Task):
 
                     for label in annotation.labels:
                         # add annotion to TimelineSegment
-                        annotation_db, _ = Annotation.objects.get_or_create(
+                        annotation_db, _ = ingest.get_or_create_annotation(
                             name=LABEL_LUT.get(label, label),
                             video=video,
                             category=category_db,
                             owner=user,
                         )
 
-                        TimelineSegmentAnnotation.objects.create(
+                        ingest.create(
+                            TimelineSegmentAnnotation,
                             annotation=annotation_db,
                             timeline_segment=timeline_segment_db,
                         )
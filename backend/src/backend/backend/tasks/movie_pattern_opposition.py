@@ -22,7 +22,7 @@ from tibava_data import Shot, ShotsData
 
 from tibava_data import DataManager
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 from django.db import transaction
 from django.conf import settings
 
@@ -210,7 +210,7 @@ class MoviePatternOpposition(Task):
             logging.warning("dry_run or plugin_run is None")
             return {}
 
-        with transaction.atomic():
+        with transaction.atomic(), BulkIngest() as ingest:
             with movie_pattern_opposition[1]["opposition"] as data:
                 annotation_timeline_db = Timeline.objects.create(
                     video=video,
@@ -223,7 +223,8 @@ class MoviePatternOpposition(Task):
                 )
 
                 for annotation in data.annotations:
-                    timeline_segment_db = TimelineSegment.objects.create(
+                    timeline_segment_db = ingest.create(
+                        TimelineSegment,
                         timeline=annotation_timeline_db,
                         start=annotation.start,
                         end=annotation.end,
@@ -235,14 +236,15 @@ class MoviePatternOpposition(Task):
                                 label[: max(0, settings.ANNOTATION_MAX_LENGTH - 4)]
                                 + " ..."
                             )
-                        annotation_db, _ = Annotation.objects.get_or_create(
+                        annotation_db, _ = ingest.get_or_create_annotation(
                             name=label,
                             video=video,
                             category=category_db,
                             owner=user,
                         )
 
-                        TimelineSegmentAnnotation.objects.create(
+                        ingest.create(
+                            TimelineSegmentAnnotation,
                             annotation=annotation_db,
                             timeline_segment=timeline_segment_db,
                         )
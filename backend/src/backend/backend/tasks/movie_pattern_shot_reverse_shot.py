@@ -22,7 +22,7 @@ from tibava_data import Shot, ShotsData
 
 from tibava_data import DataManager
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 from django.db import transaction
 from django.conf import settings
 
@@ -240,7 +240,7 @@ class MoviePatternShotReverseShot(Task):
             f" Create scalar color (SC) timeline with probabilities for each class"
         )
 
-        with transaction.atomic():
+        with transaction.atomic(), BulkIngest() as ingest:
             with movie_pattern_shot_reverse_shot[1]["shot_reverse_shot"] as data:
                 annotation_timeline_db = Timeline.objects.create(
                     video=video,
@@ -253,7 +253,8 @@ class MoviePatternShotReverseShot(Task):
                 )
 
                 for annotation in data.annotations:
-                    timeline_segment_db = TimelineSegment.objects.create(
+                    timeline_segment_db = ingest.create(
+                        TimelineSegment,
                         timeline=annotation_timeline_db,
                         start=annotation.start,
                         end=annotation.end,
@@ -265,14 +266,15 @@ class MoviePatternShotReverseShot(Task):
                                 label[: max(0, settings.ANNOTATION_MAX_LENGTH - 4)]
                                 + " ..."
                             )
-                        annotation_db, _ = Annotation.objects.get_or_create(
+                        annotation_db, _ = ingest.get_or_create_annotation(
                             name=label,
                             video=video,
                             category=category_db,
                             owner=user,
                         )
 
-                        TimelineSegmentAnnotation.objects.create(
+                        ingest.create(
+                            TimelineSegmentAnnotation,
                             annotation=annotation_db,
                             timeline_segment=timeline_segment_db,
                         )
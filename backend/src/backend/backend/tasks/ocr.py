@@ -19,7 +19,7 @@ from backend.plugin_manager import PluginManager
 
 from ..utils.analyser_client import TaskAnalyserClient
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 from django.db import transaction
 
 from django.conf import settings
@@ -81,7 +81,7 @@ class OCRTask(Task):
         if video_text_detection_result is None:
             raise Exception
 
-        with transaction.atomic():
+        with transaction.atomic(), BulkIngest() as ingest:
             with video_text_detection_result[1]["annotations"] as data:
                 """
                 Create a timeline labeled
@@ -97,13 +97,14 @@ class OCRTask(Task):
                 )
 
                 for annotation in data.annotations:
-                    timeline_segment_db = TimelineSegment.objects.create(
+                    timeline_segment_db = ingest.create(
+                        TimelineSegment,
                         timeline=annotation_timeline_db,
                         start=annotation.start,
                         end=annotation.end,
                     )
                     for label in annotation.labels:
-                        annotation_db, _ = Annotation.objects.get_or_create(
+                        annotation_db, _ = ingest.get_or_create_annotation(
                             name=str(label),
                             video=video,
                             category=category_db,
@@ -111,7 +112,8 @@ class OCRTask(Task):
                             # color=color,
                         )
 
-                        TimelineSegmentAnnotation.objects.create(
+                        ingest.create(
+                            TimelineSegmentAnnotation,
                             annotation=annotation_db,
                             timeline_segment=timeline_segment_db,
                         )
@@ -20,7 +20,7 @@ from backend.utils import media_path_to_video
 from ..utils.analyser_client import TaskAnalyserClient
 from tibava_data import DataManager, Shot
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 from django.db import transaction
 from django.conf import settings
 
@@ -194,7 +194,7 @@ class PlaceClustering(Task):
             logging.warning("dry_run or plugin_run is None")
             return {}
 
-        with transaction.atomic():
+        with transaction.atomic(), BulkIngest() as ingest:
             with cluster_filter_result[1]["clusters"] as data:
                 # save cluster results
                 plugin_run_result_db = PluginRunResult.objects.create(
@@ -220,13 +220,16 @@ class PlaceClustering(Task):
 
                 # create a cti for every detected cluster
                 for cluster_index, cluster in enumerate(data.clusters):
-                    cluster_timeline_item_db = ClusterTimelineItem.objects.create(
+                    cluster_timeline_item_db = ingest.create(
+                        ClusterTimelineItem,
                         video=video,
                         cluster_id=cluster.id,
                         name=f"Cluster {cluster_index + 1}",
                         plugin_run=plugin_run,
                     )
 
+                    sample_embedding_ids = set(cluster.sample_embedding_ids)
+
                     # create a face db item for every detected face
                     for embedding_id in cluster.embedding_ids:
                         image_id = embedding_lut[embedding_id].ref_id
@@ -236,7 +239,8 @@ class PlaceClustering(Task):
                             image_id[2:4],
                             f"{image_id}.jpg",
                         )
-                        _ = ClusterItem.objects.create(
+                        ingest.create(
+                            ClusterItem,
                             cluster_timeline_item=cluster_timeline_item_db,
                             video=video,
                             embedding_id=embedding_id,
@@ -245,7 +249,7 @@ class PlaceClustering(Task):
                             type=ClusterItem.TYPE_PLACE,
                             time=embedding_lut[embedding_id].time,
                             delta_time=embedding_lut[embedding_id].delta_time,
-                            is_sample=embedding_id in cluster.sample_embedding_ids,
+                            is_sample=embedding_id in sample_embedding_ids,
                         )
 
                 return {
@@ -21,7 +21,7 @@ from backend.utils import media_path_to_video
 
 from celery import shared_task
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 from django.db import transaction
 from django.conf import settings
 
@@ -116,7 +116,7 @@ class PlacesClassifier(Task):
             logging.warning("dry_run or plugin_run is None")
             return {}
 
-        with transaction.atomic():
+        with transaction.atomic(), BulkIngest() as ingest:
             result_annotations = {}
             if shots_id:
                 for key, data_id in result[0].items():
@@ -143,7 +143,8 @@ class PlacesClassifier(Task):
 
             segments = {}
             for shot in shots.shots:
-                timeline_segment_db = TimelineSegment.objects.create(
+                timeline_segment_db = ingest.create(
+                    TimelineSegment,
                     timeline=annotation_timeline,
                     start=shot.start,
                     end=shot.end,
@@ -163,14 +164,15 @@ class PlacesClassifier(Task):
                     for annotation in annotations.annotations:
                         for label in annotation.labels:
                             # add annotion to TimelineSegment
-                            annotation_db, _ = Annotation.objects.get_or_create(
+                            annotation_db, _ = ingest.get_or_create_annotation(
                                 name=label,
                                 video=video,
                                 category=category_db,
                                 owner=user,
                             )
 
-                            timeline_db = TimelineSegmentAnnotation.objects.create(
+                            timeline_db = ingest.create(
+                                TimelineSegmentAnnotation,
                                 annotation=annotation_db,
                                 timeline_segment=segments[annotation.start],
                             )
@@ -18,7 +18,7 @@ from ..utils.analyser_client import TaskAnalyserClient
 
 from tibava_data import DataManager, Shot
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 from django.db import transaction
 from django.conf import settings
 
@@ -128,30 +128,33 @@ class ShotLevel(Task):
                 "ground": "#9EB600",
             }
 
-            with annotations_result[1]["annotations"] as annotations:
-                for annotation in annotations.annotations:
-                    # create TimelineSegment
-                    timeline_segment_db = TimelineSegment.objects.create(
-                        timeline=annotation_timeline,
-                        start=annotation.start,
-                        end=annotation.end,
-                    )
-
-                    for label in annotation.labels:
-                        # add annotion to TimelineSegment
-                        annotation_db, _ = Annotation.objects.get_or_create(
-                            name=label.title(),
-                            video=video,
-                            category=category_db,
-                            owner=user,
-                            color=color_mapping.get(label, "#EEEEEE"),
+            with transaction.atomic(), BulkIngest() as ingest:
+                with annotations_result[1]["annotations"] as annotations:
+                    for annotation in annotations.annotations:
+                        # create TimelineSegment
+                        timeline_segment_db = ingest.create(
+                            TimelineSegment,
+                            timeline=annotation_timeline,
+                            start=annotation.start,
+                            end=annotation.end,
                         )
 
-                        TimelineSegmentAnnotation.objects.create(
-                            annotation=annotation_db,
-                            timeline_segment=timeline_segment_db,
-                        )
-                result_data["annotations"] = annotations.id
+                        for label in annotation.labels:
+                            # add annotion to TimelineSegment
+                            annotation_db, _ = ingest.get_or_create_annotation(
+                                name=label.title(),
+                                video=video,
+                                category=category_db,
+                                owner=user,
+                                color=color_mapping.get(label, "#EEEEEE"),
+                            )
+
+                            ingest.create(
+                                TimelineSegmentAnnotation,
+                                annotation=annotation_db,
+                                timeline_segment=timeline_segment_db,
+                            )
+                    result_data["annotations"] = annotations.id
 
         if dry_run or plugin_run is None:
             logging.warning("dry_run or plugin_run is None")
@@ -25,7 +25,7 @@ from backend.utils import media_path_to_video
 
 from tibava_data import DataManager
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 
 from django.db import transaction
 from django.conf import settings
@@ -109,7 +109,7 @@ class ShotScalarAnnotation(Task):
             logging.warning("dry_run or plugin_run is None")
             return {}
 
-        with transaction.atomic():
+        with transaction.atomic(), BulkIngest() as ingest:
             with result[1]["annotations"] as data:
                 """
                 Create a timeline labeled
@@ -139,7 +139,8 @@ class ShotScalarAnnotation(Task):
                 s = 0.6
 
                 for annotation in data.annotations:
-                    timeline_segment_db = TimelineSegment.objects.create(
+                    timeline_segment_db = ingest.create(
+                        TimelineSegment,
                         timeline=annotation_timeline_db,
                         start=annotation.start,
                         end=annotation.end,
@@ -152,7 +153,7 @@ class ShotScalarAnnotation(Task):
                         except:
                             v = 0.6
                         color = rgb_to_hex(hsv_to_rgb(h, s, v))
-                        annotation_db, _ = Annotation.objects.get_or_create(
+                        annotation_db, _ = ingest.get_or_create_annotation(
                             name=str(value),
                             video=video,
                             category=category_db,
@@ -160,7 +161,8 @@ class ShotScalarAnnotation(Task):
                             color=color,
                         )
 
-                        TimelineSegmentAnnotation.objects.create(
+                        ingest.create(
+                            TimelineSegmentAnnotation,
                             annotation=annotation_db,
                             timeline_segment=timeline_segment_db,
                         )
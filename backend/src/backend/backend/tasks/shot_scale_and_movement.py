@@ -18,7 +18,7 @@ from ..utils.analyser_client import TaskAnalyserClient
 
 from tibava_data import DataManager, Shot
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 from django.db import transaction
 from django.conf import settings
 
@@ -193,30 +193,35 @@ class ShotScaleAndMovement(Task):
                 name=cfg["cat_name"], video=cfg["video"], owner=cfg["user"]
             )
 
-            with annotations_result[1]["annotations"] as annotations:
-                for annotation in annotations.annotations:
-                    # create TimelineSegment
-                    timeline_segment_db = TimelineSegment.objects.create(
-                        timeline=annotation_timeline,
-                        start=annotation.start,
-                        end=annotation.end,
-                    )
-
-                    for label in annotation.labels:
-                        # add annotion to TimelineSegment
-                        annotation_db, _ = Annotation.objects.get_or_create(
-                            name=cfg["label_LUT"].get(label, f"'{label}' not in LUT"),
-                            video=cfg["video"],
-                            category=category_db,
-                            owner=cfg["user"],
-                            color=cfg["color_mapping"].get(label, "#EEEEEE"),
+            with transaction.atomic(), BulkIngest() as ingest:
+                with annotations_result[1]["annotations"] as annotations:
+                    for annotation in annotations.annotations:
+                        # create TimelineSegment
+                        timeline_segment_db = ingest.create(
+                            TimelineSegment,
+                            timeline=annotation_timeline,
+                            start=annotation.start,
+                            end=annotation.end,
                         )
 
-                        TimelineSegmentAnnotation.objects.create(
-                            annotation=annotation_db,
-                            timeline_segment=timeline_segment_db,
-                        )
-                result_data[f"{cfg['result_name']}_annotations"] = annotations.id
+                        for label in annotation.labels:
+                            # add annotion to TimelineSegment
+                            annotation_db, _ = ingest.get_or_create_annotation(
+                                name=cfg["label_LUT"].get(
+                                    label, f"'{label}' not in LUT"
+                                ),
+                                video=cfg["video"],
+                                category=category_db,
+                                owner=cfg["user"],
+                                color=cfg["color_mapping"].get(label, "#EEEEEE"),
+                            )
+
+                            ingest.create(
+                                TimelineSegmentAnnotation,
+                                annotation=annotation_db,
+                                timeline_segment=timeline_segment_db,
+                            )
+                    result_data[f"{cfg['result_name']}_annotations"] = annotations.id
 
         if cfg["dry_run"] or cfg["plugin_run"] is None:
             logging.warning("dry_run or plugin_run is None")
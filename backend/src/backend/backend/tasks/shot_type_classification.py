@@ -22,7 +22,7 @@ from tibava_data import Shot, ShotsData
 
 from tibava_data import DataManager
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 from django.db import transaction
 from django.conf import settings
 
@@ -134,29 +134,32 @@ class ShotTypeClassifier(Task):
                 name="Shot Size", video=video, owner=user
             )
 
-            with annotations_result[1]["annotations"] as annotations:
-                for annotation in annotations.annotations:
-                    # create TimelineSegment
-                    timeline_segment_db = TimelineSegment.objects.create(
-                        timeline=annotation_timeline,
-                        start=annotation.start,
-                        end=annotation.end,
-                    )
-
-                    for label in annotation.labels:
-                        # add annotion to TimelineSegment
-                        annotation_db, _ = Annotation.objects.get_or_create(
-                            name=LABEL_LUT.get(label, label),
-                            video=video,
-                            category=category_db,
-                            owner=user,
+            with transaction.atomic(), BulkIngest() as ingest:
+                with annotations_result[1]["annotations"] as annotations:
+                    for annotation in annotations.annotations:
+                        # create TimelineSegment
+                        timeline_segment_db = ingest.create(
+                            TimelineSegment,
+                            timeline=annotation_timeline,
+                            start=annotation.start,
+                            end=annotation.end,
                         )
 
-                        TimelineSegmentAnnotation.objects.create(
-                            annotation=annotation_db,
-                            timeline_segment=timeline_segment_db,
-                        )
-                result_data["annotations"] = annotations.id
+                        for label in annotation.labels:
+                            # add annotion to TimelineSegment
+                            annotation_db, _ = ingest.get_or_create_annotation(
+                                name=LABEL_LUT.get(label, label),
+                                video=video,
+                                category=category_db,
+                                owner=user,
+                            )
+
+                            ingest.create(
+                                TimelineSegmentAnnotation,
+                                annotation=annotation_db,
+                                timeline_segment=timeline_segment_db,
+                            )
+                    result_data["annotations"] = annotations.id
 
         if dry_run or plugin_run is None:
             logging.warning("dry_run or plugin_run is None")
@@ -11,7 +11,7 @@ from backend.plugin_manager import PluginManager
 from ..utils.analyser_client import TaskAnalyserClient
 from tibava_data import DataManager
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 
 from django.db import transaction
 from django.conf import settings
@@ -67,7 +67,7 @@ class ShotDetection(Task):
             logging.warning("dry_run or plugin_run is None")
             return {}
 
-        with transaction.atomic():
+        with transaction.atomic(), BulkIngest() as ingest:
             with result[1]["shots"] as d:
                 # TODO translate the name
                 timeline = Timeline.objects.create(
@@ -77,7 +77,8 @@ class ShotDetection(Task):
                 )
                 for shot in d.shots:
                     segment_id = uuid.uuid4().hex
-                    timeline_segment = TimelineSegment.objects.create(
+                    timeline_segment = ingest.create(
+                        TimelineSegment,
                         timeline=timeline,
                         id=segment_id,
                         start=shot.start,
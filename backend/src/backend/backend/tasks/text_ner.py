@@ -7,7 +7,7 @@ from backend.models import PluginRun, Video, Timeline
 from backend.plugin_manager import PluginManager
 
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 
 from tibava_data import DataManager  # type: ignore
 from backend.models import (
@@ -116,7 +116,8 @@ class NamedEntityRecognition(Task):
             )
             result_timeline[f"{timeline_name}_{data.name}"] = timeline.id.hex
             for annotation in data.annotations:
-                timeline_segment_db = TimelineSegment.objects.create(
+                timeline_segment_db = ingest.create(
+                    TimelineSegment,
                     timeline=timeline,
                     start=annotation.start,
                     end=annotation.end,
@@ -129,20 +130,21 @@ class NamedEntityRecognition(Task):
                                 label[: max(0, settings.ANNOTATION_MAX_LENGTH - 4)]
                                 + " ..."
                             )
-                        annotation_db, _ = Annotation.objects.get_or_create(
+                        annotation_db, _ = ingest.get_or_create_annotation(
                             name=label,
                             video=video,
                             owner=user,
                             color=color_mapping.get(label_object[color_key], "#EEEEEE"),
                         )
 
-                        TimelineSegmentAnnotation.objects.create(
+                        ingest.create(
+                            TimelineSegmentAnnotation,
                             annotation=annotation_db,
                             timeline_segment=timeline_segment_db,
                         )
             return result_timeline
 
-        with transaction.atomic():
+        with transaction.atomic(), BulkIngest() as ingest:
             result_timelines = {}
             with result[1]["annotations"] as data:
                 color_mapping = {
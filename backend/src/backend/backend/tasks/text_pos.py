@@ -7,7 +7,7 @@ from backend.models import PluginRun, Video, Timeline
 from backend.plugin_manager import PluginManager
 
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 from backend.utils import rgb_to_hex
 
 
@@ -127,7 +127,8 @@ class PoSTagging(Task):
                 )
                 result_timelines[f"{timelines_name}_{data.name}"] = timeline.id.hex
                 for annotation in data.annotations:
-                    timeline_segment_db = TimelineSegment.objects.create(
+                    timeline_segment_db = ingest.create(
+                        TimelineSegment,
                         timeline=timeline,
                         start=annotation.start,
                         end=annotation.end,
@@ -139,20 +140,21 @@ class PoSTagging(Task):
                         color = max(0, (max_tag_count - tag_count) / max_tag_count)
                         hex_color = rgb_to_hex((color, color, color))
 
-                        annotation_db, _ = Annotation.objects.get_or_create(
+                        annotation_db, _ = ingest.get_or_create_annotation(
                             name=str(tag_count),
                             video=video,
                             owner=user,
                             color=hex_color,
                         )
 
-                        TimelineSegmentAnnotation.objects.create(
+                        ingest.create(
+                            TimelineSegmentAnnotation,
                             annotation=annotation_db,
                             timeline_segment=timeline_segment_db,
                         )
             return result_timelines
 
-        with transaction.atomic():
+        with transaction.atomic(), BulkIngest() as ingest:
             result_timelines = {}
             with result[1]["annotations"] as data:
                 # from plugin upos
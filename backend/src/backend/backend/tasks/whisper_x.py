@@ -7,7 +7,7 @@ from backend.models import PluginRun, Video, Timeline
 from backend.plugin_manager import PluginManager
 
 from backend.utils.parser import Parser
-from backend.utils.task import Task
+from backend.utils.task import BulkIngest, Task
 
 from tibava_data import DataManager  # type: ignore
 from backend.models import (
@@ -94,7 +94,7 @@ class WhisperX(Task):
             logging.warning("dry_run or plugin_run is None")
             return {}
 
-        with transaction.atomic():
+        with transaction.atomic(), BulkIngest() as ingest:
             with result[1]["annotations"] as data:
                 """
                 Create a timeline labeled
@@ -121,7 +121,8 @@ class WhisperX(Task):
                         )
                         result_timelines[sub_data.name] = timeline.id.hex
                         for annotation in sub_data.annotations:
-                            timeline_segment_db = TimelineSegment.objects.create(
+                            timeline_segment_db = ingest.create(
+                                TimelineSegment,
                                 timeline=timeline,
                                 start=annotation.start,
                                 end=annotation.end,
@@ -135,7 +136,7 @@ class WhisperX(Task):
                                         ]
                                         + " ..."
                                     )
-                                annotation_db, _ = Annotation.objects.get_or_create(
+                                annotation_db, _ = ingest.get_or_create_annotation(
                                     name=label,
                                     video=video,
                                     category=category_db,
@@ -143,7 +144,8 @@ class WhisperX(Task):
                                     color="#EEEEEE",  # white/gray
                                 )
 
-                                TimelineSegmentAnnotation.objects.create(
+                                ingest.create(
+                                    TimelineSegmentAnnotation,
                                     annotation=annotation_db,
                                     timeline_segment=timeline_segment_db,
                                 )
@@ -1,3 +1,170 @@
+from django.db import connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
-# Create your tests here.
+from backend.models import (
+    Annotation,
+    AnnotationCategory,
+    Timeline,
+    TimelineSegment,
+    TimelineSegmentAnnotation,
+    TibavaUser,
+    Video,
+)
+from backend.serializers import (
+    serialize_annotations,
+    serialize_timeline_segment_annotations,
+    serialize_timeline_segments,
+    serialize_timelines,
+)
+from backend.utils.task import BulkIngest
+
+
+class VideoGraphSerializationTest(TestCase):
+    """The timeline graph of a video is read in a constant number of queries"""
+
+    def create_video(self, num_timelines, num_segments):
+        video = Video.objects.create(owner=self.user, name="video", ext="mp4")
+        category = AnnotationCategory.objects.create(owner=self.user, video=video)
+        annotations = [
+            Annotation.objects.create(
+                owner=self.user, video=video, category=category, name=f"{i}"
+            )
+            for i in range(4)
+        ]
+        annotations.append(
+            Annotation.objects.create(owner=self.user, video=video, name="none")
+        )
+        parent = None
+        for i in range(num_timelines):
+            timeline = Timeline.objects.create(
+                video=video, name=f"{i}", order=i, parent=parent
+            )
+            parent = timeline
+            segments = TimelineSegment.objects.bulk_create(
+                TimelineSegment(timeline=timeline, start=j, end=j + 1)
+                for j in range(num_segments)
+            )
+            TimelineSegmentAnnotation.objects.bulk_create(
+                TimelineSegmentAnnotation(
+                    timeline_segment=x, annotation=annotations[j % len(annotations)]
+                )
+                for j, x in enumerate(segments)
+            )
+        return video
+
+    def serialize(self, video):
+        return {
+            "timelines": serialize_timelines(Timeline.objects.filter(video=video)),
+            "segments": serialize_timeline_segments(
+                TimelineSegment.objects.filter(timeline__video=video)
+            ),
+            "segment_annotations": serialize_timeline_segment_annotations(
+                TimelineSegmentAnnotation.objects.filter(
+                    timeline_segment__timeline__video=video
+                )
+            ),
+            "annotations": serialize_annotations(
+                Annotation.objects.filter(video=video)
+            ),
+        }
+
+    def setUp(self):
+        self.user = TibavaUser.objects.create(username="user")
+
+    def test_matches_to_dict(self):
+        video = self.create_video(num_timelines=3, num_segments=5)
+        graph = self.serialize(video)
+
+        self.assertEqual(
+            graph["timelines"],
+            [x.to_dict() for x in Timeline.objects.filter(video=video)],
+        )
+        self.assertEqual(
+            graph["segments"],
+            [
+                x.to_dict()
+                for x in TimelineSegment.objects.filter(timeline__video=video)
+            ],
+        )
+        self.assertEqual(
+            graph["segment_annotations"],
+            [
+                x.to_dict()
+                for x in TimelineSegmentAnnotation.objects.filter(
+                    timeline_segment__timeline__video=video
+                )
+            ],
+        )
+        self.assertEqual(
+            graph["annotations"],
+            [x.to_dict() for x in Annotation.objects.filter(video=video)],
+        )
+
+    def test_query_count(self):
+        small = self.create_video(num_timelines=1, num_segments=1)
+        large = self.create_video(num_timelines=20, num_segments=200)
+
+        with CaptureQueriesContext(connection) as small_queries:
+            self.serialize(small)
+        with self.assertNumQueries(len(small_queries)):
+            graph = self.serialize(large)
+
+        self.assertEqual(len(small_queries), 6)
+        self.assertEqual(len(graph["timelines"]), 20)
+        self.assertEqual(len(graph["segments"]), 20 * 200)
+        self.assertEqual(len(graph["segment_annotations"]), 20 * 200)
+
+
+class BulkIngestTest(TestCase):
+    def setUp(self):
+        self.user = TibavaUser.objects.create(username="user")
+        self.video = Video.objects.create(owner=self.user, name="video", ext="mp4")
+        self.timeline = Timeline.objects.create(video=self.video, name="timeline")
+
+    def test_get_or_create_annotation(self):
+        category = AnnotationCategory.objects.create(
+            owner=self.user, video=self.video, name="category"
+        )
+        existing = Annotation.objects.create(
+            owner=self.user, video=self.video, category=category, name="a"
+        )
+
+        with transaction.atomic(), BulkIngest() as ingest:
+            for i in range(10):
+                segment = ingest.create(
+                    TimelineSegment, timeline=self.timeline, start=i, end=i + 1
+                )
+                for x in [
+                    {"name": "a", "category": category},
+                    {"name": "b", "category": category},
+                    {"name": "a", "color": "#ff0000"},
+                    {"name": "b"},
+                ]:
+                    annotation, _ = ingest.get_or_create_annotation(
+                        video=self.video, owner=self.user, **x
+                    )
+                    ingest.create(
+                        TimelineSegmentAnnotation,
+                        annotation=annotation,
+                        timeline_segment=segment,
+                    )
+
+        self.assertEqual(TimelineSegment.objects.count(), 10)
+        self.assertEqual(TimelineSegmentAnnotation.objects.count(), 40)
+        self.assertEqual(Annotation.objects.filter(category=category).count(), 2)
+        self.assertEqual(Annotation.objects.filter(category__isnull=True).count(), 2)
+        self.assertEqual(
+            Annotation.objects.get(category__isnull=True, name="a").color, "#ff0000"
+        )
+        self.assertEqual(
+            TimelineSegmentAnnotation.objects.filter(annotation=existing).count(), 10
+        )
+
+        # a second ingest finds the annotations without a category
+        with transaction.atomic(), BulkIngest() as ingest:
+            annotation, created = ingest.get_or_create_annotation(
+                name="b", video=self.video, owner=self.user
+            )
+        self.assertFalse(created)
+        self.assertIsNone(annotation.category)
@@ -29,6 +29,11 @@ urlpatterns = [
         views.PluginRunResultList.as_view(),
         name="plugin_run_list",
     ),
+    path(
+        "plugin/run/result/get",
+        views.PluginRunResultGet.as_view(),
+        name="plugin_run_result_get",
+    ),
     #
     path(
         "cluster/timeline/item/create",
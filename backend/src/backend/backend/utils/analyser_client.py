@@ -37,7 +37,10 @@ class TaskAnalyserClient(AnalyserClient):
                 sleeping_policy=ExponentialBackoff(
                     init_backoff_ms=100, max_backoff_ms=1600, multiplier=2
                 ),
-                status_for_retry=(grpc.StatusCode.UNAVAILABLE,),
+                status_for_retry=(
+                    grpc.StatusCode.UNAVAILABLE,
+                    grpc.StatusCode.RESOURCE_EXHAUSTED,
+                ),
             ),
         )
 
@@ -117,6 +120,32 @@ class TaskAnalyserClient(AnalyserClient):
                 plugin_run_db.save()
         return None
 
+    def run_pipeline(self, *args, **kwargs):
+        plugin_run_db = self.plugin_run_db
+        try:
+            return super().run_pipeline(*args, **kwargs)
+        except grpc.RpcError as rpc_error:
+            logger.error(
+                f"GRPC error: code={rpc_error.code()} message={rpc_error.details()}"
+            )
+            if plugin_run_db:
+                plugin_run_db.status = PluginRun.STATUS_ERROR
+                plugin_run_db.save()
+        return None
+
+    def get_pipeline_status(self, *args, **kwargs):
+        plugin_run_db = self.plugin_run_db
+        try:
+            return super().get_pipeline_status(*args, **kwargs)
+        except grpc.RpcError as rpc_error:
+            logger.error(
+                f"GRPC error: code={rpc_error.code()} message={rpc_error.details()}"
+            )
+            if plugin_run_db:
+                plugin_run_db.status = PluginRun.STATUS_ERROR
+                plugin_run_db.save()
+        return None
+
     def download_data(self, *args, **kwargs):
         plugin_run_db = self.plugin_run_db
         try:
@@ -143,6 +172,11 @@ class TaskAnalyserClient(AnalyserClient):
                 plugin_run_db.save()
         return None
 
+    def _set_plugin_run_error(self, plugin_run_db):
+        if plugin_run_db:
+            plugin_run_db.status = PluginRun.STATUS_ERROR
+            plugin_run_db.save()
+
     # 24 hours timeout
     def get_plugin_results(
         self, job_id, plugin_run_db=None, status_fn=None, timeout=86400
@@ -151,57 +185,80 @@ class TaskAnalyserClient(AnalyserClient):
             plugin_run_db if plugin_run_db is not None else self.plugin_run_db
         )
 
-        result = None
-
-        start_time = time.time()
         if status_fn is None:
             status_fn = analyser_status_to_task_status
-        while True:
-            if timeout:
-                if time.time() - start_time > timeout:
-                    logger.error(f"Timeout")
-                    if plugin_run_db:
-                        plugin_run_db.status = PluginRun.STATUS_ERROR
+
+        try:
+            # the analyser only sends a message if the status or progress changes
+            for result in self.watch_plugin_status(job_id, timeout=timeout):
+                if plugin_run_db is not None:
+                    status = status_fn(result.status)
+                    if status is not None and status != plugin_run_db.status:
+                        plugin_run_db.status = status
                         plugin_run_db.save()
-                    return None
-            try:
-                result = self.get_plugin_status(job_id)
-            except grpc.RpcError as rpc_error:
+
+                if result.status == analyser_pb2.GetPluginStatusResponse.UNKNOWN:
+                    logger.error("Job is unknown by the analyser")
+                    return
+                elif result.status == analyser_pb2.GetPluginStatusResponse.ERROR:
+                    logger.error("Job is crashing")
+                    return
+                elif result.status == analyser_pb2.GetPluginStatusResponse.DONE:
+                    return result
+        except grpc.RpcError as rpc_error:
+            if rpc_error.code() == grpc.StatusCode.DEADLINE_EXCEEDED:
+                logger.error(f"Timeout")
+            else:
                 logger.error(
                     f"GRPC error: code={rpc_error.code()} message={rpc_error.details()}"
                 )
-                if plugin_run_db:
-                    plugin_run_db.status = PluginRun.STATUS_ERROR
-                    plugin_run_db.save()
+            self._set_plugin_run_error(plugin_run_db)
+            return None
 
-                return None
-            if result is None:
-                logger.error(f"GRPC error: not valid return Code")
-                if plugin_run_db:
-                    plugin_run_db.status = PluginRun.STATUS_ERROR
-                    plugin_run_db.save()
+        logger.error(f"GRPC error: status stream closed before the job was finished")
+        self._set_plugin_run_error(plugin_run_db)
+        return None
 
-                return None
+    # 24 hours timeout
+    def get_pipeline_results(self, pipeline_id, plugin_run_db=None, timeout=86400):
+        plugin_run_db = (
+            plugin_run_db if plugin_run_db is not None else self.plugin_run_db
+        )
 
-            if plugin_run_db is not None:
-                status = status_fn(result.status)
-                if status is not None:
-                    plugin_run_db.status = status
+        try:
+            for result in self.watch_pipeline_status(pipeline_id, timeout=timeout):
+                if plugin_run_db is not None:
+                    changed = False
+                    status = analyser_status_to_task_status(result.status)
+                    if status is not None and status != plugin_run_db.status:
+                        plugin_run_db.status = status
+                        changed = True
+                    if result.progress != plugin_run_db.progress:
+                        plugin_run_db.progress = result.progress
+                        changed = True
+                    if changed:
+                        plugin_run_db.save()
 
-                plugin_run_db.save()
+                if result.status == analyser_pb2.GetPieplineStatusResponse.UNKNOWN:
+                    logger.error("Pipeline is unknown by the analyser")
+                    return
+                elif result.status == analyser_pb2.GetPieplineStatusResponse.ERROR:
+                    logger.error("Pipeline is crashing")
+                    return
+                elif result.status == analyser_pb2.GetPieplineStatusResponse.DONE:
+                    return result
+        except grpc.RpcError as rpc_error:
+            if rpc_error.code() == grpc.StatusCode.DEADLINE_EXCEEDED:
+                logger.error(f"Timeout")
+            else:
+                logger.error(
+                    f"GRPC error: code={rpc_error.code()} message={rpc_error.details()}"
+                )
+            self._set_plugin_run_error(plugin_run_db)
+            return None
 
-            if result.status == analyser_pb2.GetPluginStatusResponse.UNKNOWN:
-                logger.error("Job is unknown by the analyser")
-                return
-            elif result.status == analyser_pb2.GetPluginStatusResponse.WAITING:
-                pass
-            elif result.status == analyser_pb2.GetPluginStatusResponse.RUNNING:
-                pass
-            elif result.status == analyser_pb2.GetPluginStatusResponse.ERROR:
-                logger.error("Job is crashing")
-                return
-            elif result.status == analyser_pb2.GetPluginStatusResponse.DONE:
-                break
-            time.sleep(1.0)
-
-        return result
+        logger.error(
+            f"GRPC error: status stream closed before the pipeline was finished"
+        )
+        self._set_plugin_run_error(plugin_run_db)
+        return None
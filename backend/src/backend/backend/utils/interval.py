@@ -0,0 +1,55 @@
+import heapq
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+def overlapping_intervals(
+    queries: Sequence[Tuple[float, float]],
+    intervals: Sequence[Tuple[float, float]],
+) -> List[List[int]]:
+    """Indices of the intervals that overlap each query, boundaries included.
+
+    Two intervals overlap if one of them starts inside the other. Intervals
+    that start inside a query are a slice of the intervals sorted by start,
+    intervals that already cover the start of a query are found with a sweep
+    over the queries in start order. This takes O((n + m) log m + k) instead
+    of comparing every query with every interval. The indices of each query
+    are returned in ascending order.
+    """
+    result = [[] for _ in queries]
+    if len(queries) == 0 or len(intervals) == 0:
+        return result
+
+    starts = np.asarray([x[0] for x in intervals], dtype=np.float64)
+    ends = np.asarray([x[1] for x in intervals], dtype=np.float64)
+    order = np.argsort(starts, kind="stable")
+    sorted_starts = starts[order]
+
+    query_starts = np.asarray([x[0] for x in queries], dtype=np.float64)
+    query_ends = np.asarray([x[1] for x in queries], dtype=np.float64)
+
+    # intervals with query start <= start <= query end
+    lower = np.searchsorted(sorted_starts, query_starts, side="left")
+    upper = np.searchsorted(sorted_starts, query_ends, side="right")
+    for i in range(len(queries)):
+        if lower[i] < upper[i]:
+            result[i].extend(order[lower[i] : upper[i]].tolist())
+
+    # intervals with start < query start <= end
+    active = []
+    next_interval = 0
+    for i in np.argsort(query_starts, kind="stable"):
+        query_start = query_starts[i]
+        while next_interval < len(order) and sorted_starts[next_interval] < query_start:
+            j = order[next_interval]
+            heapq.heappush(active, (ends[j], j))
+            next_interval += 1
+        while active and active[0][0] < query_start:
+            heapq.heappop(active)
+        if active:
+            result[i].extend(int(j) for _, j in active)
+
+    for x in result:
+        x.sort()
+    return result
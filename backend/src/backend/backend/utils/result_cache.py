@@ -0,0 +1,217 @@
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import typing
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from django.conf import settings
+
+from tibava_data import Data, DataManager
+
+
+logger = logging.getLogger(__name__)
+
+# bump this when the payload format changes, old cache files are ignored then
+RESULT_CACHE_VERSION = 1
+
+# decimals that are kept for values and times
+VALUE_PRECISION = 4
+TIME_PRECISION = 3
+
+
+def result_cache_path(result_id) -> str:
+    return os.path.join(
+        settings.DATA_CACHE_ROOT, f"{result_id}.v{RESULT_CACHE_VERSION}.json"
+    )
+
+
+def result_cache_etag(result_id) -> Optional[str]:
+    """Changes whenever the cached payload of a result is rewritten"""
+    try:
+        stat = os.stat(result_cache_path(result_id))
+    except FileNotFoundError:
+        return None
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+def delete_result_cache(result_id) -> None:
+    # payloads of older versions are removed as well
+    for path in (
+        result_cache_path(result_id),
+        os.path.join(settings.DATA_CACHE_ROOT, f"{result_id}.json"),
+    ):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _round(values: np.ndarray, decimals: int) -> List:
+    return np.round(np.asarray(values, dtype=np.float64), decimals).tolist()
+
+
+def downsample(
+    time: np.ndarray,
+    values: np.ndarray,
+    delta_time: float,
+    max_samples: int,
+    reduce: str = "mean",
+):
+    """Reduces a time series to at most max_samples bins.
+
+    Every bin starts at the time of its first sample, values are either
+    averaged or the maximum is kept (so that peaks stay visible).
+    """
+    time = np.asarray(time)
+    values = np.asarray(values, dtype=np.float64)
+    if max_samples is None or max_samples <= 0 or len(time) <= max_samples:
+        return time, values, delta_time
+
+    factor = int(np.ceil(len(time) / max_samples))
+    starts = np.arange(0, len(time), factor)
+    if reduce == "max":
+        values = np.maximum.reduceat(values, starts, axis=0)
+    else:
+        counts = np.diff(np.append(starts, len(time)))
+        counts = counts.reshape((-1,) + (1,) * (values.ndim - 1))
+        values = np.add.reduceat(values, starts, axis=0) / counts
+
+    if delta_time is not None:
+        delta_time = delta_time * factor
+    return time[starts], values, delta_time
+
+
+def _compact_series(data: Data, name: str, reduce: str, max_samples: int) -> Dict:
+    time, values, delta_time = downsample(
+        data.time, getattr(data, name), data.delta_time, max_samples, reduce=reduce
+    )
+    return {
+        **Data.to_dict(data),
+        name: _round(values, VALUE_PRECISION),
+        "time": _round(time, TIME_PRECISION),
+        "delta_time": delta_time,
+    }
+
+
+def _compact_embeddings(data: Data, max_samples: int) -> Dict:
+    result = data.to_dict()
+    for x in result.get("embeddings", []):
+        x.pop("embedding", None)
+    return result
+
+
+def _compact_list(data: Data, max_samples: int) -> Dict:
+    result = {**Data.to_dict(data), "data": [], "index": []}
+    for i, x in data:
+        with x:
+            result["index"].append(i)
+            result["data"].append(compact_payload(x, max_samples))
+    return result
+
+
+_compact_types = {
+    "ScalarData": lambda x, n: _compact_series(x, "y", "max", n),
+    "HistData": lambda x, n: _compact_series(x, "hist", "mean", n),
+    "RGBData": lambda x, n: _compact_series(x, "colors", "mean", n),
+    "ImageEmbeddings": _compact_embeddings,
+    "TextEmbeddings": _compact_embeddings,
+    "TimeNDEmbeddings": _compact_embeddings,
+    "VideoTemporalEmbeddings": _compact_embeddings,
+    "ListData": _compact_list,
+}
+
+
+def compact_payload(data: Data, max_samples: int = None) -> Dict:
+    """What the frontend needs of a loaded data container.
+
+    Time series are reduced to max_samples values, raw embedding vectors
+    are dropped and numbers are rounded. Unknown types use to_dict.
+    """
+    if max_samples is None:
+        max_samples = settings.RESULT_CACHE_MAX_SAMPLES
+    compact = _compact_types.get(data.type)
+    if compact is None:
+        return data.to_dict()
+    return compact(data, max_samples)
+
+
+def _projection(data: Data) -> Optional[List[str]]:
+    # every field of the items except the raw embedding vectors
+    for x in dataclasses.fields(data):
+        if x.name != "embeddings":
+            continue
+        item_cls = typing.get_args(x.type)
+        if len(item_cls) != 1 or not dataclasses.is_dataclass(item_cls[0]):
+            return None
+        return [
+            y.name for y in dataclasses.fields(item_cls[0]) if y.name != "embedding"
+        ]
+    return None
+
+
+def write_result_cache(data_manager: DataManager, result) -> Optional[str]:
+    """Precomputes the payload of a PluginRunResult and returns its path.
+
+    The file holds the serialized entry of the result list, so it can be
+    sent without parsing it again. None if the data does not exist.
+    """
+    data = data_manager.load(result.data_id)
+    if data is None:
+        return None
+
+    data.select(_projection(data))
+    with data:
+        payload = {**result.to_dict(), "data": compact_payload(data)}
+
+    path = result_cache_path(result.id)
+    tmp_path = f"{path}.tmp"
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    logger.debug(f"Write result {result.id} to cache")
+    return path
+
+
+def ensure_result_cache(data_manager: DataManager, result) -> Optional[str]:
+    """Path of the payload of a result, it is built if it is missing"""
+    path = result_cache_path(result.id)
+    if os.path.exists(path):
+        return path
+    try:
+        return write_result_cache(data_manager, result)
+    except Exception:
+        logger.exception(f"Cache couldn't write {result.id}")
+        return None
+
+
+def read_result_cache(result) -> bytes:
+    """The serialized entry of a result, without data if it has no payload"""
+    try:
+        with open(result_cache_path(result.id), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return json.dumps(result.to_dict()).encode("utf-8")
+
+
+def results_etag(results: List) -> str:
+    """Validator of a list of results, it changes when one payload changes"""
+    hash_stream = hashlib.sha1(f"{RESULT_CACHE_VERSION}".encode())
+    for x in results:
+        etag = result_cache_etag(x.id)
+        hash_stream.update(f"{x.id}:{x.data_id}:{etag};".encode())
+    return f'"{hash_stream.hexdigest()}"'
+
+
+def stream_result_list(results: List) -> Iterator[bytes]:
+    """The body of the result list, payloads are sent as they are stored"""
+    yield b'{"status":"ok","entries":['
+    for i, x in enumerate(results):
+        if i > 0:
+            yield b","
+        yield read_result_cache(x)
+    yield b"]}"
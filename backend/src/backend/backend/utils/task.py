@@ -1,16 +1,105 @@
 import logging
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+from django.db import models
 
 from ..utils.analyser_client import TaskAnalyserClient
 
-from backend.models import PluginRun, PluginRunResult, Video, Timeline
+from backend.models import (
+    Annotation,
+    AnnotationCategory,
+    PluginRun,
+    PluginRunResult,
+    TibavaUser,
+    Video,
+    Timeline,
+)
 from backend.utils import media_path_to_video
 
 
 logger = logging.getLogger(__name__)
 
 
+class BulkIngest:
+    """Collects the rows of a plugin result and inserts them with bulk_create.
+
+    Use it inside a transaction, e.g. `with transaction.atomic(), BulkIngest()
+    as ingest:`. Rows are written per model in the order the models were first
+    added, whenever batch_size rows are pending and when the block is left
+    without an exception. Primary keys are uuids, so created objects can be
+    referenced before they are written. save() and the save signals are not
+    called for these rows.
+    """
+
+    def __init__(self, batch_size: int = 2000):
+        self.batch_size = batch_size
+        self.pending = {}
+        self.count = 0
+        self.annotations = {}
+
+    def __enter__(self) -> "BulkIngest":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.flush()
+
+    def add(self, obj: models.Model) -> models.Model:
+        self.pending.setdefault(type(obj), []).append(obj)
+        self.count += 1
+        if self.count >= self.batch_size:
+            self.flush()
+        return obj
+
+    def create(self, model: type, **kwargs) -> models.Model:
+        """Replacement for model.objects.create"""
+        return self.add(model(**kwargs))
+
+    def flush(self) -> None:
+        for model, objs in self.pending.items():
+            if len(objs) > 0:
+                model.objects.bulk_create(objs, batch_size=self.batch_size)
+                objs.clear()
+        self.count = 0
+
+    def get_or_create_annotation(
+        self,
+        name: str,
+        video: Video,
+        owner: TibavaUser,
+        category: AnnotationCategory = None,
+        color: str = None,
+    ) -> Tuple[Annotation, bool]:
+        """Replacement for Annotation.objects.get_or_create.
+
+        The annotations of a category (or without a category) are fetched
+        with one query, new ones are inserted with the other rows.
+        """
+        key = (video.id, category.id if category else None, owner.id)
+        lut = self.annotations.get(key)
+        if lut is None:
+            lut = {}
+            for x in Annotation.objects.filter(
+                video=video, category=category, owner=owner
+            ):
+                lut.setdefault((x.name, x.color), x)
+                lut.setdefault((x.name, None), x)
+            self.annotations[key] = lut
+
+        annotation = lut.get((name, color))
+        if annotation is not None:
+            return annotation, False
+
+        kwargs = {} if color is None else {"color": color}
+        annotation = self.create(
+            Annotation, name=name, video=video, category=category, owner=owner, **kwargs
+        )
+        lut[(name, annotation.color)] = annotation
+        lut.setdefault((name, None), annotation)
+        return annotation, True
+
+
 class Task:
     def __init__(self):
         pass
@@ -75,3 +164,66 @@ class Task:
                 download_data[output.name] = data
 
         return result_ids, download_data
+
+    def run_pipeline(
+        self,
+        client: TaskAnalyserClient,
+        plugins: List[Dict],
+        inputs: Dict = None,
+        downloads: List = None,
+        plugin_run: PluginRun = None,
+    ) -> Optional[Tuple[Dict, Dict]]:
+        """Run a graph of analysers with a single request.
+
+        plugins: list of {"plugin", "parameters", "inputs", "outputs"}, where the
+            inputs and outputs map plugin names to pipeline symbols
+        inputs: {symbol: data_id} for data that is already uploaded
+        downloads: symbols that should be downloaded after the pipeline is done
+        """
+
+        if inputs is None:
+            inputs = {}
+        if downloads is None:
+            downloads = []
+
+        pipeline_id = client.run_pipeline(
+            [{"symbol": k, "id": v} for k, v in inputs.items()],
+            [
+                {
+                    "plugin": x["plugin"],
+                    "inputs": x.get("inputs", {}),
+                    "outputs": x.get("outputs", {}),
+                    "parameters": [
+                        {"name": k, "value": v}
+                        for k, v in x.get("parameters", {}).items()
+                    ],
+                }
+                for x in plugins
+            ],
+        )
+        if pipeline_id is None:
+            return None
+        logger.info(
+            f"Pipeline started: analyser pipeline_id: {pipeline_id} plugin_run_id: {plugin_run}"
+        )
+
+        result = client.get_pipeline_results(
+            pipeline_id=pipeline_id, plugin_run_db=plugin_run
+        )
+        if result is None:
+            logger.error(
+                f"Pipeline is crashing: analyser pipeline_id: {pipeline_id} plugin_run_id: {plugin_run}"
+            )
+            return None
+
+        result_ids = {}
+        for output in result.outputs:
+            result_ids[output.symbol] = output.id
+
+        download_data = {}
+        for output in result.outputs:
+            if output.symbol in downloads:
+                data = client.download_data(output.id)
+                download_data[output.symbol] = data
+
+        return result_ids, download_data
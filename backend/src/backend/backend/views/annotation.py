@@ -8,6 +8,7 @@ from django.views import View
 from django.http import JsonResponse
 
 from backend.models import Annotation, AnnotationCategory, Video
+from backend.serializers import serialize_annotations
 
 
 logger = logging.getLogger(__name__)
@@ -127,9 +128,7 @@ class AnnoatationList(View):
 
             query_results = Annotation.objects.filter(**query_args)
 
-            entries = []
-            for annotation in query_results:
-                entries.append(annotation.to_dict())
+            entries = serialize_annotations(query_results)
             return JsonResponse({"status": "ok", "entries": entries})
         except Exception:
             logger.exception('Failed to list annotations')
@@ -5,13 +5,19 @@ import logging
 import traceback
 
 from django.views import View
-from django.http import JsonResponse
+from django.http import HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.utils.http import parse_etags
 from django.conf import settings
 
 # from django.core.exceptions import BadRequest
 
 from backend.models import PluginRunResult, Video, PluginRun
 from backend.plugin_manager import PluginManager
+from backend.utils.result_cache import (
+    ensure_result_cache,
+    results_etag,
+    stream_result_list,
+)
 from tibava_data import DataManager
 
 
@@ -50,51 +56,66 @@ class PluginRunResultList(View):
 
                 query_dict["plugin_run"] = plugin_run_db
 
-            analyses = PluginRunResult.objects.filter(**query_dict)
-            # print("PluginRunResultList")
-            # for x in analyses:
-            #     print(f"\t {x.id.hex}")
+            analyses = PluginRunResult.objects.filter(**query_dict).select_related(
+                "plugin_run"
+            )
 
             add_results = request.GET.get("add_results", True)
-            if add_results:
-                # print("A", flush=True)
-
-                entries = []
-                for x in analyses:
-                    # print("B", flush=True)
-                    cache_path = os.path.join(settings.DATA_CACHE_ROOT, f"{x.id}.json")
-                    # print("C", flush=True)
-                    # print(cache_path, flush=True)
-                    cached = False
-                    try:
-                        if os.path.exists(cache_path):
-                            with open(cache_path, "r") as f:
-                                entries.append(json.load(f))
-                                cached = True
-                    except Exception:
-                        logger.exception(f"Cache couldn't read {e}")
-                    if cached:
-                        continue
-                    # print(f"x {x}")
-                    # TODO fix me
-                    data = data_manager.load(x.data_id)
-                    if data is None:
-                        entries.append({**x.to_dict()})
-                        continue
-                    # print(data)
-                    with data:
-                        result_dict = {**x.to_dict(), "data": data.to_dict()}
-                        try:
-                            with open(cache_path, "w") as f:
-                                json.dump(result_dict, f)
-                        except Exception:
-                            logger.exception(f"Cache couldn't write {e}")
-
-                        entries.append(result_dict)
+            if not add_results:
+                entries = [x.to_dict() for x in analyses]
+                return JsonResponse({"status": "ok", "entries": entries})
+
+            # payloads are precomputed when a plugin finishes, older results
+            # get theirs on the first request
+            analyses = list(analyses)
+            for x in analyses:
+                ensure_result_cache(data_manager, x)
 
+            etag = results_etag(analyses)
+            if etag in parse_etags(request.headers.get("If-None-Match", "")):
+                response = HttpResponseNotModified()
             else:
-                entries = [x.to_dict() for x in analyses]
-            return JsonResponse({"status": "ok", "entries": entries})
+                response = StreamingHttpResponse(
+                    stream_result_list(analyses), content_type="application/json"
+                )
+            response["ETag"] = etag
+            # the browser has to revalidate, but can reuse unchanged results
+            response["Cache-Control"] = "private, no-cache"
+            return response
         except Exception:
             logger.exception("Failed to list plugin run results")
             return JsonResponse({"status": "error"})
+
+
+class PluginRunResultGet(View):
+    """A single result with its data in full resolution, e.g. for exports.
+
+    The list only contains the compact payload, where long series are
+    downsampled and numbers are rounded.
+    """
+
+    def get(self, request):
+        if not request.user.is_authenticated:
+            logger.error("PluginRunResultGet::not_authenticated")
+            return JsonResponse({"status": "error"})
+
+        data_manager = DataManager("/predictions/")
+        try:
+            try:
+                result_db = PluginRunResult.objects.select_related("plugin_run").get(
+                    id=request.GET.get("id"),
+                    plugin_run__video__owner=request.user,
+                )
+            except PluginRunResult.DoesNotExist:
+                return JsonResponse({"status": "error", "type": "not_exist"})
+
+            entry = result_db.to_dict()
+            data = data_manager.load(result_db.data_id)
+            if data is None:
+                return JsonResponse({"status": "error", "type": "not_exist"})
+            with data:
+                entry["data"] = data.to_dict()
+            return JsonResponse({"status": "ok", "entry": entry})
+        except Exception:
+            logger.exception("Failed to get plugin run result")
+            return JsonResponse({"status": "error"})
@@ -5,7 +5,8 @@ import traceback
 from django.views import View
 from django.http import JsonResponse
 
-from backend.models import Video, Timeline, TimelineSegment, PluginRunResult
+from backend.models import Video, Timeline, TimelineSegment
+from backend.serializers import serialize_timelines
 
 
 logger = logging.getLogger(__name__)
@@ -22,20 +23,7 @@ class TimelineList(View):
                 timelines = Timeline.objects.filter(video=video_db)
             else:
                 timelines = Timeline.objects.all()
-            timelines = (
-                timelines.select_related("video")
-                .select_related("plugin_run_result")
-                .prefetch_related("timelinesegment_set")
-            )
-
-            # print("TimelineList")
-            # for x in timelines:
-            #     if x.plugin_run_result:
-            #         print(f"\t {x.id.hex} {x.plugin_run_result.id.hex}")
-            entries = []
-            for timeline in timelines:
-                result = timeline.to_dict()
-                entries.append(result)
+            entries = serialize_timelines(timelines)
             return JsonResponse({"status": "ok", "entries": entries})
         except Exception:
             logger.exception("Failed to list timelines")
@@ -48,18 +36,12 @@ class TimelineListAll(View):
             if not request.user.is_authenticated:
                 return JsonResponse({"status": "error"})
             
-            timelines = (Timeline.objects.filter(video__owner=request.user)
-                                         .prefetch_related('plugin_run_result'))
+            timelines = Timeline.objects.filter(video__owner=request.user)
             add_results_type = request.GET.get("add_results_type", False)
 
-            entries = []
-            for timeline in timelines:
-                result = timeline.to_dict()
-                if add_results_type:
-                    result['plugin'] = {'type': None}
-                    if timeline.plugin_run_result:
-                        result['plugin']['type'] = PluginRunResult.TYPE[timeline.plugin_run_result.type]
-                entries.append(result)
+            entries = serialize_timelines(
+                timelines, add_results_type=bool(add_results_type)
+            )
             return JsonResponse({"status": "ok", "entries": entries})
         except Exception:
             logger.exception("Failed to list all timelines")
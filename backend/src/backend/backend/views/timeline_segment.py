@@ -24,6 +24,7 @@ import time
 # from django.core.exceptions import BadRequest
 
 from backend.models import AnnotationCategory, Annotation, TimelineSegment, TimelineSegmentAnnotation, Timeline
+from backend.serializers import serialize_timeline_segments
 
 
 logger = logging.getLogger(__name__)
@@ -172,8 +173,8 @@ class TimelineSegmentAnnotateRange(View):
             video_db = timeline_db.video
 
             # first find everything between
-            timeline_segment_dbs = TimelineSegment.objects.filter(
-                timeline=timeline_db, start__gte=data.get("start"), end__lte=data.get("end")
+            timeline_segment_dbs = TimelineSegment.objects.filter(timeline=timeline_db).within(
+                data.get("start"), data.get("end")
             )
             # for x in timeline_segment_dbs:
             #     print(x.to_dict())
@@ -181,12 +182,12 @@ class TimelineSegmentAnnotateRange(View):
             timeline_segment_ids = [x.id for x in timeline_segment_dbs]
 
             # left segment
-            left_timeline_segment_dbs = TimelineSegment.objects.filter(
-                timeline=timeline_db, start__lte=data.get("start"), end__gte=data.get("start")
+            left_timeline_segment_dbs = TimelineSegment.objects.filter(timeline=timeline_db).containing(
+                data.get("start")
             )
             # right segment
-            right_timeline_segment_dbs = TimelineSegment.objects.filter(
-                timeline=timeline_db, start__lte=data.get("end"), end__gte=data.get("end")
+            right_timeline_segment_dbs = TimelineSegment.objects.filter(timeline=timeline_db).containing(
+                data.get("end")
             )
 
             # delete all old stuff
@@ -311,9 +312,7 @@ class TimelineSegmentGet(View):
 
             timeline_segments = TimelineSegment.objects.filter(**query_args).order_by("start")
 
-            entries = []
-            for segment in timeline_segments:
-                entries.append(segment.to_dict())
+            entries = serialize_timeline_segments(timeline_segments)
             return JsonResponse({"status": "ok", "entries": entries})
         except Exception:
             logger.exception("Failed to get timeline segment")
@@ -336,12 +335,8 @@ class TimelineSegmentList(View):
             if "video_id" in request.GET:
                 query_args["timeline__video__id"] = request.GET.get("video_id")
 
-            timeline_segments = (
-                TimelineSegment.objects.filter(**query_args).select_related("timeline").prefetch_related("annotations")
-            )
-            entries = []
-            for segment in timeline_segments:
-                entries.append(segment.to_dict())
+            timeline_segments = TimelineSegment.objects.filter(**query_args)
+            entries = serialize_timeline_segments(timeline_segments)
             return JsonResponse({"status": "ok", "entries": entries})
         except Exception:
             logger.exception("Failed to list timeline segments")
@@ -389,8 +384,8 @@ class TimelineSegmentMerge(View):
             color = timeline_segments[0].timeline.id
 
             timeline_segment_dbs = TimelineSegment.objects.filter(
-                start__gte=start, timeline__id=timeline_segments[0].timeline.id, end__lte=end
-            )
+                timeline__id=timeline_segments[0].timeline.id
+            ).within(start, end)
 
             timeline_segment_deleted = []
             timeline_segment_added = []
@@ -24,6 +24,7 @@ from django.conf import settings
 # from django.core.exceptions import BadRequest
 
 from backend.models import TimelineSegment, TimelineSegmentAnnotation, Annotation, AnnotationCategory
+from backend.serializers import serialize_timeline_segment_annotations
 
 
 logger = logging.getLogger(__name__)
@@ -306,20 +307,13 @@ class TimelineSegmentAnnoatationList(View):
             query_args = {}
 
             if "timeline_segment_id" in request.GET:
-                query_args["timeline_segment_set__id"] = request.GET.get("timeline_segment_id")
+                query_args["timeline_segment__id"] = request.GET.get("timeline_segment_id")
 
             if "video_id" in request.GET:
                 query_args["timeline_segment__timeline__video__id"] = request.GET.get("video_id")
 
-            query_results = (
-                TimelineSegmentAnnotation.objects.filter(**query_args)
-                .select_related("timeline_segment")
-                .select_related("annotation")
-            )
-
-            entries = []
-            for timeline_segment_annotation in query_results:
-                entries.append(timeline_segment_annotation.to_dict())
+            query_results = TimelineSegmentAnnotation.objects.filter(**query_args)
+            entries = serialize_timeline_segment_annotations(query_results)
 
             end = time.time()
             logger.debug(f"Getting TimelineSegmentAnnotationList took {end-start}s")
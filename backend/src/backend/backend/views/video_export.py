@@ -7,12 +7,14 @@ import io
 import csv
 import yaml
 import base64
+import itertools
+from collections import defaultdict
 from dataclasses import dataclass
 
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Tuple
 
 from django.views import View
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.conf import settings
 
 from pympi.Elan import Eaf, to_eaf
@@ -30,11 +32,13 @@ from backend.utils import (
 )
 
 from backend.utils.color import get_closest_color
+from backend.utils.interval import overlapping_intervals
 from backend.models import (
     Video,
     Annotation,
     Timeline,
     TimelineSegment,
+    TimelineSegmentAnnotation,
     PluginRunResult,
     PluginRun,
 )
@@ -46,6 +50,9 @@ import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# number of csv rows that are written to the response at once
+EXPORT_CHUNK_ROWS = 1000
+
 
 def json_to_csv(json_obj):
     df = pd.DataFrame(json_obj)
@@ -67,6 +74,83 @@ def time_to_string(sec, loc="en"):
     return f"{hours}:{min}:{sec}.{sec_frac}"
 
 
+def segment_reduce(time, values, starts, ends, reduce=np.add):
+    """Reduces the values with start <= time <= end for every segment.
+
+    The samples of a segment are found with a binary search on the sorted
+    time stamps and all segments are reduced with a single reduceat call.
+    Returns the reduced values and the number of samples of each segment,
+    segments without samples are 0.
+    """
+    time = np.asarray(time, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    if len(time) > 1 and np.any(time[1:] < time[:-1]):
+        order = np.argsort(time, kind="stable")
+        time, values = time[order], values[order]
+
+    lower = np.searchsorted(time, np.asarray(starts, dtype=np.float64), side="left")
+    upper = np.searchsorted(time, np.asarray(ends, dtype=np.float64), side="right")
+    counts = np.maximum(upper - lower, 0)
+
+    result = np.zeros(len(counts), dtype=np.float64)
+    valid = counts > 0
+    if np.any(valid):
+        # segment i is reduced between indices 2i and 2i+1, the padding keeps
+        # the upper index valid for segments that end with the last sample
+        indices = np.stack([lower[valid], upper[valid]], axis=1).reshape(-1)
+        result[valid] = reduce.reduceat(np.append(values, 0.0), indices)[::2]
+    return result, counts
+
+
+def timeline_segment_labels(
+    timeline: Timeline, include_category: bool = True, separator: str = "::"
+) -> List[Tuple[float, float, List[str]]]:
+    """Start, end and annotation labels of all segments of a timeline"""
+    labels = defaultdict(list)
+    for segment_id, name, category in TimelineSegmentAnnotation.objects.filter(
+        timeline_segment__timeline=timeline
+    ).values_list(
+        "timeline_segment_id", "annotation__name", "annotation__category__name"
+    ):
+        if include_category and category is not None:
+            labels[segment_id].append(f"{category}{separator}{name}")
+        else:
+            labels[segment_id].append(name)
+
+    return [
+        (start, end, labels.get(id, []))
+        for id, start, end in TimelineSegment.objects.filter(
+            timeline=timeline
+        ).values_list("id", "start", "end")
+    ]
+
+
+def csv_chunks(rows: Iterable, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[str]:
+    """Writes rows as csv and yields the text every chunk_rows rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_ALL)
+    for i, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if i % chunk_rows == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell() > 0:
+        yield buffer.getvalue()
+
+
+def stream_export(chunks: Iterable[str], extension: str) -> StreamingHttpResponse:
+    """The json response of an export, the file is escaped chunk by chunk"""
+
+    def stream():
+        yield f'{{"status": "ok", "extension": "{extension}", "file": "'
+        for chunk in chunks:
+            yield json.dumps(chunk)[1:-1]
+        yield '"}'
+
+    return StreamingHttpResponse(stream(), content_type="application/json")
+
+
 @dataclass
 class TimeExport:
     start: int
@@ -196,25 +280,17 @@ class VideoExport(View):
 
         headlines = [timeline.name]
 
-        annotations = []
         with data_manager.load(plugin_run_reuslts.data_id) as data:
-            y = np.asarray(data.y)
-            time = np.asarray(data.time)
-            for segment in segments:
-                shot_y_data = y[
-                    np.logical_and(time >= segment.start, time <= segment.end)
-                ]
-
-                if len(shot_y_data) <= 0:
-                    annotations.append(0.0)
-                    continue
-
-                y_agg = np.mean(shot_y_data)
-
-                anno = y_agg.item()
-                annotations.append(anno)
+            sums, counts = segment_reduce(
+                data.time,
+                data.y,
+                starts=[x.start for x in segments],
+                ends=[x.end for x in segments],
+            )
 
-        return TimelineExport(headlines=headlines, annotations=annotations)
+        # segments without samples are exported as 0.0
+        means = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+        return TimelineExport(headlines=headlines, annotations=means.tolist())
 
     def export_annotation_timeline(
         self,
@@ -229,63 +305,29 @@ class VideoExport(View):
 
         headlines = [timeline.name]
 
-        annotations = []
-        for segment_db in timeline.timelinesegment_set.all():
-            annotation_labels = []
-            for segment_annotation_db in segment_db.timelinesegmentannotation_set.all():
-                if include_category and segment_annotation_db.annotation.category:
-                    annotation_labels.append(
-                        segment_annotation_db.annotation.category.name
-                        + "::"
-                        + segment_annotation_db.annotation.name
-                    )
-                else:
-                    annotation_labels.append(segment_annotation_db.annotation.name)
-
-            if len(annotation_labels) > 0:
-                annotations.append(
-                    {
-                        "annotation": "+".join(annotation_labels),
-                        "start": float(segment_db.start),
-                        "end": float(segment_db.end),
-                    }
-                )
-            else:
-                annotations.append(
-                    {
-                        "annotation": empty_annotation,
-                        "start": float(segment_db.start),
-                        "end": float(segment_db.end),
-                    }
-                )
+        annotations = [
+            {
+                "annotation": "+".join(labels) if len(labels) > 0 else empty_annotation,
+                "start": float(start),
+                "end": float(end),
+            }
+            for start, end, labels in timeline_segment_labels(
+                timeline, include_category=include_category
+            )
+        ]
 
         # change segmentation if the user ask for another timeline segmentation
         if segments:
             new_annotations = []
-            for segment in segments:
-                new_annotation_labels = []
-
-                for annotation in annotations:
-                    if (
-                        (
-                            annotation["start"] >= segment.start
-                            and annotation["start"] <= segment.end
-                        )
-                        or (
-                            annotation["end"] >= segment.start
-                            and annotation["end"] <= segment.end
-                        )
-                        or (
-                            annotation["start"] <= segment.start
-                            and annotation["end"] >= segment.end
-                        )
-                    ):
-                        new_annotation_labels.append(annotation["annotation"])
-                if len(new_annotation_labels) <= 0:
+            overlaps = overlapping_intervals(
+                [(x.start, x.end) for x in segments],
+                [(x["start"], x["end"]) for x in annotations],
+            )
+            for indices in overlaps:
+                if len(indices) <= 0:
                     col_text = empty_annotation
                 else:
-                    col_text = "+".join(new_annotation_labels)
-                # print(f'################ {col_text} {segment["end"]} {segment["annotation"]} {s} {d}')
+                    col_text = "+".join(annotations[i]["annotation"] for i in indices)
                 new_annotations.append(col_text)
 
             annotations = new_annotations
@@ -319,10 +361,7 @@ class VideoExport(View):
         use_seconds = parameters.get("use_seconds", True)
         merge_timeline = parameters.get("merge_timeline", True)
         split_places = parameters.get("split_places", False)
-        import time
 
-        t = time.time()
-        start_time = time.time()
         # TODO timeline selection
         time_segments = self.get_segment_times_from_timeline(video=video_db)
 
@@ -336,9 +375,6 @@ class VideoExport(View):
                 )
             )
 
-        print(f"A {time.time() - t}")
-        t = time.time()
-
         if use_seconds:
             cols.append(
                 self.export_time_annotations(
@@ -405,44 +441,22 @@ class VideoExport(View):
                 )
             )
 
-        print(f"B {time.time() - t}")
-        t = time.time()
-        for timeline_db in (
-            video_db.timeline_set.all()
-            .prefetch_related("timelinesegment_set")
-            .prefetch_related("timelinesegment_set__timelinesegmentannotation_set")
-            .prefetch_related(
-                "timelinesegment_set__timelinesegmentannotation_set__annotation"
-            )
-            .prefetch_related(
-                "timelinesegment_set__timelinesegmentannotation_set__annotation__category"
-            )
+        for timeline_db in video_db.timeline_set.all().select_related(
+            "plugin_run_result"
         ):
             cols.append(
                 self.export_timeline(timeline=timeline_db, segments=time_segments)
             )
 
-            print(f"{timeline_db.name} {time.time() - t}")
-            t = time.time()
-
-        csv_cols = []
-        for col in cols:
-            if col is None:
-                continue
-            # print(f"{col.headlines} {len(col.headlines)} {len(col.annotations)}")
-            csv_cols.append(col.headlines + col.annotations)
-
-        rows = list(map(list, zip(*csv_cols)))
-
-        buffer = io.StringIO()
-        writer = csv.writer(buffer, quoting=csv.QUOTE_ALL)
-        for line in rows:
-            writer.writerow(line)
-
-        print(f"C {time.time() - t}")
-        print(f"TOTAL {time.time() - start_time}")
-
-        return buffer.getvalue()
+        # rows are only built while the response is sent
+        rows = zip(
+            *[
+                itertools.chain(col.headlines, col.annotations)
+                for col in cols
+                if col is not None
+            ]
+        )
+        return csv_chunks(rows)
 
     def export_individual_csv(self, parameters, video_db):
         include_category = parameters.get("include_category", True)
@@ -533,30 +547,12 @@ class VideoExport(View):
                         str(t[1]) for t in time_duration
                     ]
 
-                annotations["annotations"] = []
-
-                for segment in shot_timeline_segments:
-                    if len(segment.timelinesegmentannotation_set.all()) > 0:
-                        all_annotations = []
-                        for (
-                            segment_annotation_db
-                        ) in segment.timelinesegmentannotation_set.all():
-                            if (
-                                include_category
-                                and segment_annotation_db.annotation.category
-                            ):
-                                all_annotations.append(
-                                    segment_annotation_db.annotation.category.name
-                                    + "::"
-                                    + segment_annotation_db.annotation.name
-                                )
-                            else:
-                                all_annotations.append(
-                                    segment_annotation_db.annotation.name
-                                )
-                        annotations["annotations"].append(json.dumps(all_annotations))
-                    else:
-                        annotations["annotations"].append("")
+                annotations["annotations"] = [
+                    json.dumps(labels) if len(labels) > 0 else ""
+                    for _, _, labels in timeline_segment_labels(
+                        timeline_db, include_category=include_category
+                    )
+                ]
 
             timeline_annotations.append(annotations)
             timeline_names.append(timeline_db.name)
@@ -599,8 +595,6 @@ class VideoExport(View):
                 data_id = plugin_run_result_db.data_id
                 if data_id not in data_ids:
                     data_ids.add(data_id)
-                    print(plugin_run_result_db.data_id, flush=True)
-                    print(plugin_run_result_db.plugin_run, flush=True)
                     # Write the CSV data to the individual file
                     zip_file.writestr(
                         f"data/{plugin_run_result_db.data_id}.zip", f.read()
@@ -608,15 +602,12 @@ class VideoExport(View):
 
         timelines = []
 
-        print(len(Timeline.objects.filter(video=video_db)))
         for timeline_db in Timeline.objects.filter(video=video_db):
-            print(timeline_db.to_dict(), flush=True)
             timelines.append(timeline_db.to_dict())
             if timeline_db.type == Timeline.TYPE_ANNOTATION:
                 with data_manager.create_data(
                     "AnnotationData", timeline_db.id.hex
                 ) as data:
-                    print("ANNOTATION", data.to_dict(), flush=True)
                     shot_timeline_segments = TimelineSegment.objects.filter(
                         timeline=timeline_db
                     )
@@ -702,23 +693,26 @@ class VideoExport(View):
             raise Exception
 
         aggregation = ["max", "min", "mean"][parameters.get("aggregation")]
+        aggregation_functions = {"max": np.maximum, "min": np.minimum, "mean": np.add}
 
         # if the timeline is not of type annotation, raise an Exception
         if shot_timeline_db.type != Timeline.TYPE_ANNOTATION:
             raise Exception
 
         # get the shots from the boundary timeline
-        shots = []
-        shot_timeline_segments = TimelineSegment.objects.filter(
-            timeline=shot_timeline_db
-        )
-        for x in shot_timeline_segments:
-            shots.append(Shot(start=x.start, end=x.end))
+        shots = [
+            Shot(start=start, end=end)
+            for start, end in TimelineSegment.objects.filter(
+                timeline=shot_timeline_db
+            ).values_list("start", "end")
+        ]
 
         data_manager = DataManager("/predictions/")
 
         # for all timelines
-        for timeline_db in Timeline.objects.filter(video=video_db):
+        for timeline_db in Timeline.objects.filter(video=video_db).select_related(
+            "plugin_run_result"
+        ):
             tier = timeline_db.name
 
             # ignore timelines with the same name TODO: check if there is a better way
@@ -737,69 +731,49 @@ class VideoExport(View):
 
                 scalar_data = data_manager.load(timeline_db.plugin_run_result.data_id)
                 with scalar_data:
-                    y = np.asarray(scalar_data.y)
-                    time = np.asarray(scalar_data.time)
-                    for i, shot in enumerate(shots):
-                        annotations = []
-                        shot_y_data = y[
-                            np.logical_and(time >= shot.start, time <= shot.end)
-                        ]
-                        # print(f"{shot.start} - {shot.end}")
-
-                        if len(shot_y_data) <= 0:
-                            continue
-
-                        y_agg = 0
-
-                        if aggregation == "mean":
-                            y_agg = np.mean(shot_y_data)
-                        if aggregation == "max":
-                            y_agg = np.max(shot_y_data)
-                        if aggregation == "min":
-                            y_agg = np.min(shot_y_data)
-
-                        start_time = int(shot.start * 1000)
-                        end_time = int(shot.end * 1000)
-                        anno = str(round(float(y_agg), 3))
-
-                        annotations.append(f"value:{anno}")
-                        if len(annotations) > 0:
-                            eaf.add_annotation(
-                                tier,
-                                start=start_time,
-                                end=end_time,
-                                value=", ".join(annotations),
-                            )
+                    values, counts = segment_reduce(
+                        scalar_data.time,
+                        scalar_data.y,
+                        starts=[x.start for x in shots],
+                        ends=[x.end for x in shots],
+                        reduce=aggregation_functions[aggregation],
+                    )
+                if aggregation == "mean":
+                    values = values / np.maximum(counts, 1)
+
+                for shot, y_agg, count in zip(shots, values.tolist(), counts):
+                    # shots without samples are skipped
+                    if count <= 0:
+                        continue
+
+                    start_time = int(shot.start * 1000)
+                    end_time = int(shot.end * 1000)
+                    anno = str(round(float(y_agg), 3))
+
+                    eaf.add_annotation(
+                        tier,
+                        start=start_time,
+                        end=end_time,
+                        value=f"value:{anno}",
+                    )
             # if it is an annotation timeline already, just export it
             else:
-                for id, segment_db in enumerate(timeline_db.timelinesegment_set.all()):
-                    start_time = int(segment_db.start * 1000)
-                    end_time = int(segment_db.end * 1000)
-                    # print(f"{start_time} - {end_time}")
+                for id, (start, end, annotations) in enumerate(
+                    timeline_segment_labels(timeline_db, separator=":")
+                ):
+                    start_time = int(start * 1000)
+                    end_time = int(end * 1000)
                     # TODO: check why this occurs
                     if start_time >= end_time:
                         continue
-                    annotations = []
                     # if the timeline contains annotations, export them
-                    if len(segment_db.timelinesegmentannotation_set.all()) > 0:
-                        annotations = []
-                        for (
-                            segment_annotation_db
-                        ) in segment_db.timelinesegmentannotation_set.all():
-                            category = segment_annotation_db.annotation.category
-                            name = segment_annotation_db.annotation.name
-                            if category is not None:
-                                anno = f"{category.name}:{name}"
-                            else:
-                                anno = f"{name}"
-                            annotations.append(anno)
-                        if len(annotations) > 0:
-                            eaf.add_annotation(
-                                tier,
-                                start=start_time,
-                                end=end_time,
-                                value="; ".join(annotations),
-                            )
+                    if len(annotations) > 0:
+                        eaf.add_annotation(
+                            tier,
+                            start=start_time,
+                            end=end_time,
+                            value="; ".join(annotations),
+                        )
                     else:
                         # if it does not contain annotations, export the boundaries with placeholder values (here: shot number)
                         eaf.add_annotation(
@@ -859,9 +833,7 @@ class VideoExport(View):
 
             if request.POST.get("format") == "merged_csv":
                 result = self.export_merged_csv(parameters, video_db)
-                return JsonResponse(
-                    {"status": "ok", "file": result, "extension": "csv"}
-                )
+                return stream_export(result, extension="csv")
 
             elif request.POST.get("format") == "individual_csv":
                 result = self.export_individual_csv(parameters, video_db)
@@ -871,9 +843,7 @@ class VideoExport(View):
 
             elif request.POST.get("format") == "elan":
                 result = self.export_elan(parameters, video_db)
-                return JsonResponse(
-                    {"status": "ok", "file": result, "extension": "eaf"}
-                )
+                return stream_export([result], extension="eaf")
 
             elif request.POST.get("format") == "data":
                 result = self.export_data(parameters, video_db)
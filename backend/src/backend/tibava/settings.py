@@ -216,6 +216,10 @@ DATA_CACHE_ROOT = get_value(config, "DATA_CACHE_ROOT", "data_cache_root", "/cach
 DATA_OUTPUT_PATH = get_value(
     config, "DATA_OUTPUT_PATH", "data_output_path", "/predictions"
 )
+# time series in result payloads are reduced to this length, 0 keeps all samples
+RESULT_CACHE_MAX_SAMPLES = int(
+    get_value(config, "RESULT_CACHE_MAX_SAMPLES", "result_cache.max_samples", 4096)
+)
 
 
 GRPC_HOST = get_value(config, "ANALYSER_GRPC_HOST", "analyser.grpc_host", "analyser")
@@ -68,6 +68,16 @@ export const usePluginRunResultStore = defineStore('pluginRunResult', {
             //   commit('error/update', info, { root: true });
             // });
         },
+        async fetchData(id) {
+            // the list only holds the compact (downsampled) data of a result
+            return axios.get(`${config.API_LOCATION}/plugin/run/result/get`, { params: { id } })
+                .then((res) => {
+                    if (res.data.status === 'ok') {
+                        return res.data.entry;
+                    }
+                    return null;
+                });
+        },
         clearStore() {
             this.pluginRunResults = {}
             this.pluginRunResultList = []
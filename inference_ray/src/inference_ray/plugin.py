@@ -3,10 +3,17 @@ import os
 import re
 from typing import Dict, List, Any, Type, Callable
 
+import asyncio
 import importlib
 import json
 import requests
+import threading
+import time
 import uuid
+from concurrent import futures
+
+import aiohttp
+from requests.adapters import HTTPAdapter
 
 from tibava_utils import convert_name
 from tibava_utils.plugin import Plugin, Manager
@@ -66,6 +73,15 @@ class AnalyserPlugin(Plugin):
     def provides(cls):
         return cls._provides
 
+    def frame_cache_args(self) -> Dict[str, Any]:
+        """Arguments of VideoData.__call__ for the frame cache. It is disabled
+        unless frame_cache is set in the config of the plugin, the size of the
+        cached frames is limited by frame_cache_max_bytes."""
+        return {
+            "cache": self.config.get("frame_cache", False),
+            "cache_max_bytes": self.config.get("frame_cache_max_bytes"),
+        }
+
     @classmethod
     def update_callbacks(cls, callbacks: List[AnalyserPluginCallback], **kwargs):
         if callbacks is None or not isinstance(callbacks, (list, set)):
@@ -91,6 +107,63 @@ class AnalyserPlugin(Plugin):
         return result
 
 
+class AsyncDispatcher:
+    """Sends plugin requests to ray serve from a single asyncio event loop.
+
+    All requests share one keep-alive connection pool and every route has its
+    own concurrency limit. A request that is waiting for a remote plugin does
+    not block a thread, so many deployments can be kept busy at once.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 512,
+        route_concurrency: int = 64,
+        on_error: Callable = None,
+    ):
+        self.pool_size = pool_size
+        self.route_concurrency = route_concurrency
+        self.on_error = on_error
+
+        self.session = None
+        self.semaphores = {}
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    async def _post(self, route: str, url: str, payload: Dict):
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=None),
+            )
+        if route not in self.semaphores:
+            self.semaphores[route] = asyncio.Semaphore(self.route_concurrency)
+
+        async with self.semaphores[route]:
+            try:
+                async with self.session.post(url, json=payload) as response:
+                    if response.status != 200:
+                        logging.error(f"AsyncDispatcher: {url} {response.status}")
+                        if self.on_error is not None:
+                            self.on_error()
+                    return await response.json(content_type=None)
+            except aiohttp.ClientError as e:
+                logging.error(f"AsyncDispatcher: Can start plugin on ray server {e}")
+                if self.on_error is not None:
+                    self.on_error()
+                return []
+            except ValueError:
+                logging.error("AsyncDispatcher: Can decode response from ray server")
+                return []
+
+    def post(self, route: str, url: str, payload: Dict) -> futures.Future:
+        return asyncio.run_coroutine_threadsafe(
+            self._post(route, url, payload), self.loop
+        )
+
+
 class AnalyserPluginManager(Manager):
     _plugins = {}
 
@@ -119,6 +192,29 @@ class AnalyserPluginManager(Manager):
         self.find()
         self.plugin_list = []
 
+        # keep-alive connections to ray serve that are shared between all calls
+        pool_size = self.config.get("pool_size", 512)
+        self.session = requests.Session()
+        self.session.mount(
+            "http://", HTTPAdapter(pool_connections=16, pool_maxsize=pool_size)
+        )
+
+        # with dispatch: async plugin calls do not block a worker while running
+        self.dispatcher = None
+        if self.config.get("dispatch", "sync") == "async":
+            self.dispatcher = AsyncDispatcher(
+                pool_size=pool_size,
+                route_concurrency=self.config.get("route_concurrency", 64),
+                on_error=self.invalidate_plugin_status,
+            )
+
+        # ray serve status is cached and refreshed in the background
+        self.status_ttl = self.config.get("status_ttl", 30.0)
+        self.status_lock = threading.Lock()
+        self.status_cache = None
+        self.status_time = 0.0
+        self.status_thread = None
+
         # logging.error(self.plugin_list)
 
     @classmethod
@@ -129,23 +225,22 @@ class AnalyserPluginManager(Manager):
 
         return export_helper
 
-    # TODO I am not sure if this is fine here
-
-    def plugin_status(self):
-        print(f"{self.status_base_url}/api/serve/applications/", flush=True)
+    def fetch_plugin_status(self):
+        logging.info(f"{self.status_base_url}/api/serve/applications/")
         try:
-            status = requests.get(
+            status = self.session.get(
                 f"{self.status_base_url}/api/serve/applications/"
             ).json()
         except:
             logging.error("AnalyserPluginMananger: Can get status from ray server")
-            return []
+            return None
 
         running_model_map = {}
+        deployment_args = {}
         for _, app in status.get("applications", {}).items():
-            model_name = (
-                app.get("deployed_app_config", {}).get("args", {}).get("model", "")
-            )
+            args = app.get("deployed_app_config", {}).get("args", {})
+            model_name = args.get("model", "")
+            deployment_args[model_name] = args
             route = app.get("deployed_app_config", {}).get("route_prefix", "")
             is_running = app.get("status", "DEPLOY_FAILED") == "RUNNING"
             if model_name in running_model_map:
@@ -167,10 +262,56 @@ class AnalyserPluginManager(Manager):
                     "requires": plugin_cls.requires,
                     "provides": plugin_cls.provides,
                     "version": plugin_cls.version,
+                    # a changed config of a deployment invalidates cached results
+                    "config": {
+                        **(plugin_cls.default_config or {}),
+                        **deployment_args.get(name, {}),
+                    },
                 }
             )
 
-        return list(running_model_map.values())
+        return running_model_map
+
+    def refresh_plugin_status(self):
+        status = self.fetch_plugin_status()
+        with self.status_lock:
+            if status is not None:
+                self.status_cache = status
+                self.status_time = time.time()
+            else:
+                self.status_cache = None
+        return status
+
+    def invalidate_plugin_status(self):
+        with self.status_lock:
+            self.status_cache = None
+
+    def _refresh_loop(self):
+        while True:
+            time.sleep(self.status_ttl / 2)
+            self.refresh_plugin_status()
+
+    def plugin_status_map(self):
+        if self.status_thread is None:
+            with self.status_lock:
+                if self.status_thread is None:
+                    self.status_thread = threading.Thread(
+                        target=self._refresh_loop, daemon=True
+                    )
+                    self.status_thread.start()
+
+        with self.status_lock:
+            status = self.status_cache
+            if status is not None and time.time() - self.status_time < self.status_ttl:
+                return status
+
+        status = self.refresh_plugin_status()
+        if status is None:
+            return {}
+        return status
+
+    def plugin_status(self):
+        return list(self.plugin_status_map().values())
 
     def plugins(self):
         return self._plugins
@@ -200,6 +341,49 @@ class AnalyserPluginManager(Manager):
 
         return plugin_to_run(config)
 
+    def dispatch(
+        self,
+        plugin: str,
+        inputs: Dict[str, Data],
+        data_manager: DataManager,
+        parameters: Dict = None,
+        callbacks: Callable = None,
+    ) -> futures.Future:
+        """Start a plugin and return a future with its results"""
+        if self.dispatcher is None:
+            future = futures.Future()
+            try:
+                future.set_result(
+                    self(
+                        plugin=plugin,
+                        inputs=inputs,
+                        data_manager=data_manager,
+                        parameters=parameters,
+                        callbacks=callbacks,
+                    )
+                )
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        plugins = self.plugin_status_map()
+
+        if plugin not in plugins:
+            logging.error(f"[AnalyserPluginManager] plugin: {plugin} not found")
+            future = futures.Future()
+            future.set_result(None)
+            return future
+
+        route = plugins[plugin]["route"]
+        return self.dispatcher.post(
+            route,
+            f"{self.base_url}{route}",
+            {
+                "inputs": {x: y.id for x, y in inputs.items()},
+                "parameters": parameters,
+            },
+        )
+
     def __call__(
         self,
         plugin: str,
@@ -208,7 +392,16 @@ class AnalyserPluginManager(Manager):
         parameters: Dict = None,
         callbacks: Callable = None,
     ):
-        plugins = {x["plugin"]: x for x in self.plugin_status()}
+        if self.dispatcher is not None:
+            return self.dispatch(
+                plugin=plugin,
+                inputs=inputs,
+                data_manager=data_manager,
+                parameters=parameters,
+                callbacks=callbacks,
+            ).result()
+
+        plugins = self.plugin_status_map()
 
         if plugin not in plugins:
             logging.error(f"[AnalyserPluginManager] plugin: {plugin} not found")
@@ -216,9 +409,9 @@ class AnalyserPluginManager(Manager):
 
         plugin_to_run = plugins[plugin]
 
-        print(f"{self.base_url}{plugin_to_run['route']}", flush=True)
+        logging.info(f"{self.base_url}{plugin_to_run['route']}")
         try:
-            results = requests.post(
+            results = self.session.post(
                 f"{self.base_url}{plugin_to_run['route']}",
                 json={
                     "inputs": {x: y.id for x, y in inputs.items()},
@@ -227,8 +420,14 @@ class AnalyserPluginManager(Manager):
             )
         except:
             logging.error("AnalyserPluginMananger: Can start plugin on ray server")
+            # the deployment might be gone, so the cached status is outdated
+            self.invalidate_plugin_status()
             return []
 
+        if not results.ok:
+            logging.error(f"AnalyserPluginMananger: {results}")
+            self.invalidate_plugin_status()
+
         try:
             data = results.json()
         except:
@@ -92,7 +92,6 @@ class ActiveSpeakerDetection(
                 video_data.open_video() as video_file,
             ):
                 durationSet = {1, 1, 1, 2, 2, 2, 3, 3, 4, 5, 6}
-                # TODO cv2.VideoCapture does not work with zipfile to get only frames for each shot (this is quite memory inefficient)
                 fps = int(parameters.get("fps"))
                 video_decoder = VideoDecoder(
                     video_file,
@@ -100,7 +99,6 @@ class ActiveSpeakerDetection(
                     extension=f".{video_data.ext}",
                     ref_id=video_data.id,
                 )
-                video_frames = [f["frame"] for f in video_decoder]
                 audio_array, _ = librosa.load(
                     audio_file, sr=parameters.get("sampling_rate")
                 )
@@ -120,10 +118,18 @@ class ActiveSpeakerDetection(
                         winlen=0.025,
                         winstep=0.010,
                     )
+                    # only decode the frames of the current track
+                    video_frames = [
+                        f["frame"]
+                        for f in video_decoder.get_frames(
+                            i / fps
+                            for i in range(
+                                track_data["frames"][0], track_data["frames"][-1]
+                            )
+                        )
+                    ]
                     face_video_frames = self.crop_face(
-                        video_frames[
-                            track_data["frames"][0] : track_data["frames"][-1]
-                        ],
+                        video_frames,
                         np.array(track_data["bboxes"]),
                         parameters["crop_scale"],
                     )
@@ -17,7 +17,7 @@ from tibava_data import DataManager, Data
 from typing import Callable, Optional, Dict
 
 # from inference import InferenceServer
-from tibava_utils import VideoDecoder
+from tibava_utils import VideoDecoder, VideoBatcher
 from tibava_utils.imageops import image_resize, image_crop, image_pad
 
 
@@ -29,6 +29,7 @@ class ImagePreprozessorWrapper:
         self.image_size = clip.visual.image_size
         self.transform = self.image_transform()
         self.format = format
+        self._batch_transform = None
 
     def image_transform(self):
         OPENAI_DATASET_MEAN = (0.48145466, 0.4578275, 0.40821073)
@@ -93,6 +94,56 @@ class ImagePreprozessorWrapper:
 
         return torch.stack(result, axis=0).to(self.format)
 
+    def batch_transform(self):
+        from torchvision.transforms import (
+            Compose,
+            InterpolationMode,
+            Resize,
+            CenterCrop,
+            ConvertImageDtype,
+        )
+
+        image_size = self.image_size
+        if isinstance(image_size, (list, tuple)) and image_size[0] == image_size[1]:
+            image_size = image_size[0]
+
+        # same steps as image_transform but on a batch of uint8 tensors
+        return Compose(
+            [
+                Resize(
+                    image_size,
+                    interpolation=InterpolationMode.BICUBIC,
+                    antialias=True,
+                ),
+                CenterCrop(image_size),
+                ConvertImageDtype(self.format),
+                # reuse the Normalize of image_transform
+                self.transform.transforms[-1],
+            ]
+        )
+
+    def batch(self, images, size, device):
+        """Pads, resizes and normalizes a batch of frames (NHWC uint8) on device"""
+        import torch
+
+        if self._batch_transform is None:
+            self._batch_transform = self.batch_transform()
+
+        height, width = images.shape[1:3]
+        pad_x = max(0, (height - width) // 2)
+        pad_y = max(0, (width - height) // 2)
+
+        x = torch.from_numpy(np.ascontiguousarray(images)).to(device)
+        x = x.permute(0, 3, 1, 2).float()
+        x = torch.nn.functional.pad(x, (pad_x, pad_x, pad_y, pad_y))
+        # bicubic with antialiasing gives the same result as the PIL resize.
+        # size is (height, width), as in image_resize, which reverses it for PIL
+        x = torch.nn.functional.interpolate(
+            x, size=tuple(size), mode="bicubic", align_corners=False, antialias=True
+        )
+        x = x.clamp(0, 255).round().to(torch.uint8)
+        return self._batch_transform(x)
+
 
 default_config = {
     "data_dir": "/data/",
@@ -102,6 +153,7 @@ default_config = {
 img_embd_parameters = {
     "fps": 2,
     "crop_size": [224, 224],
+    "batch_size": 32,
 }
 
 
@@ -142,7 +194,6 @@ class ClipImageEmbedding(
         parameters: Dict = None,
         callbacks: Callable = None,
     ) -> Dict[str, Data]:
-        from sklearn.preprocessing import normalize
         import imageio
         import torch
         import open_clip
@@ -165,29 +216,37 @@ class ClipImageEmbedding(
             data_manager.create_data("ImageEmbeddings") as output_data,
         ):
             with input_data(fps=parameters.get("fps")) as input_iterator:
-                for i, frame in enumerate(input_iterator):
-                    # self.update_callbacks(
-                    #     callbacks, progress=float(i / len(input_iterator))
-                    # )
-
-                    img = frame.get("frame")
-                    img = self.image_resize_crop(
-                        img, parameters.get("resize_size"), parameters.get("crop_size")
+                batches = VideoBatcher(
+                    input_iterator, batch_size=parameters.get("batch_size")
+                )
+                num_batches = max(len(batches), 1)
+
+                embeddings = []
+                times = []
+                for i, batch in enumerate(batches):
+                    imgs = self.preprocess.batch(
+                        batch.get("frame"), parameters.get("crop_size"), device
                     )
-                    img = self.preprocess(img).to(device)
 
                     with torch.no_grad(), torch.cuda.amp.autocast():
-                        embedding = self.model(img)
+                        embedding = self.model(imgs)
                         embedding = torch.nn.functional.normalize(embedding, dim=-1)
-                    embedding = embedding.cpu().detach()
-                    output_data.embeddings.append(
-                        ImageEmbedding(
-                            embedding=normalize(embedding),
-                            time=frame.get("time"),
-                            ref_id=frame.get("id"),
-                            delta_time=1 / parameters.get("fps"),
+                    embeddings.append(embedding.float().cpu().numpy())
+                    times.extend(batch.get("time"))
+
+                    self.update_callbacks(callbacks, progress=i / num_batches)
+
+                if len(embeddings) > 0:
+                    # one contiguous array, every embedding is a (1, dim) view of it
+                    embeddings = np.concatenate(embeddings, axis=0)
+                    for i, time in enumerate(times):
+                        output_data.embeddings.append(
+                            ImageEmbedding(
+                                embedding=embeddings[i : i + 1],
+                                time=time,
+                                delta_time=1 / parameters.get("fps"),
+                            )
                         )
-                    )
 
                 self.update_callbacks(callbacks, progress=1.0)
             return {"embeddings": output_data}
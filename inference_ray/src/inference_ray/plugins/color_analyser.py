@@ -53,14 +53,11 @@ class ColorAnalyser(
         ):
             kcolors = []
             time = []
-            with input_data.open_video() as f_video:
-                video_decoder = VideoDecoder(
-                    f_video,
-                    max_dimension=parameters.get("max_resolution"),
-                    fps=parameters.get("fps"),
-                    extension=f".{input_data.ext}",
-                )
-
+            with input_data(
+                fps=parameters.get("fps"),
+                max_dimension=parameters.get("max_resolution"),
+                **self.frame_cache_args(),
+            ) as video_decoder:
                 num_frames = video_decoder.duration() * video_decoder.fps()
                 for i, frame in enumerate(video_decoder):
                     self.update_callbacks(callbacks, progress=i / num_frames)
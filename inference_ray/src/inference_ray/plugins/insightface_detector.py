@@ -1,5 +1,5 @@
 from inference_ray.plugin import AnalyserPlugin, AnalyserPluginManager
-from tibava_utils import VideoDecoder
+from tibava_utils import VideoDecoder, VideoBatcher, iterate_in_thread
 
 from tibava_data import (
     BboxData,
@@ -15,6 +15,7 @@ from tibava_data import (
 from tibava_data import DataManager, Data
 
 from typing import Callable, Optional, Dict
+import logging
 import numpy as np
 import time
 
@@ -111,28 +112,44 @@ class InsightfaceDetectorTorch(AnalyserPlugin):
         # nms_thresh = input.get("nms_thresh")
         start_time = time.time()
         # data = np.asarray(input.data)
-        feat_stride_fpn = [8, 16, 32]
-        fmc = 3
-        num_anchors = 2
         input_height = data.shape[1]
         input_width = data.shape[2]
         center_cache = {}
-        scores_list = []
-        bboxes_list = []
-        kpss_list = []
         with torch.no_grad(), torch.cuda.amp.autocast():
             raw_result = self.model(torch.from_numpy(data).to(self.device))
 
-        print(f"RUNNER {time.time() - start_time}")
+        logging.debug(f"RUNNER {time.time() - start_time}")
         start_time = time.time()
         # result = self.con.modelrun(self.model_name, f"data_{job_id}", output_names)
         # net_outs = self.session.run(self.output_names, {self.input_name : blob})  # original function
-        net_outs = [x[0, :, :].cpu().detach().numpy() for x in raw_result]
-        # print(net_outs[0][:5, :5])
-        # for x in net_outs:
-        #     print(x.shape)
-        # exit()
+        raw_result = [x.cpu().detach().numpy() for x in raw_result]
+
+        results = []
+        for b in range(data.shape[0]):
+            net_outs = [x[b, :, :] for x in raw_result]
+            results.append(
+                self.postprocess(
+                    net_outs,
+                    input_height,
+                    input_width,
+                    det_thresh,
+                    nms_thresh,
+                    center_cache,
+                )
+            )
+
+        logging.debug(f"API {time.time() - start_time}")
+        return results
 
+    def postprocess(
+        self, net_outs, input_height, input_width, det_thresh, nms_thresh, center_cache
+    ):
+        feat_stride_fpn = [8, 16, 32]
+        fmc = 3
+        num_anchors = 2
+        scores_list = []
+        bboxes_list = []
+        kpss_list = []
         for idx, stride in enumerate(feat_stride_fpn):
             scores = net_outs[idx]
             bbox_preds = net_outs[idx + fmc]
@@ -181,7 +198,6 @@ class InsightfaceDetectorTorch(AnalyserPlugin):
         kpss = kpss[order, :, :]
         kpss = kpss[keep, :, :]
 
-        print(f"API {time.time() - start_time}")
         return {
             "boxes": det[:, :4],
             "scores": det[:, 4],
@@ -196,6 +212,27 @@ class InsightfaceDetectorTorch(AnalyserPlugin):
         nms_thresh=0.4,
         fps=10,
     ):
+        return self.detect_batch(
+            {"frame": [frame.get("frame")], "time": [frame.get("time")]},
+            input_size=input_size,
+            det_thresh=det_thresh,
+            nms_thresh=nms_thresh,
+            fps=fps,
+        )[0]
+
+    def detect_batch(
+        self,
+        batch,
+        input_size=(640, 640),
+        det_thresh=0.5,
+        nms_thresh=0.4,
+        fps=10,
+        det_imgs=None,
+    ):
+        """Detects the faces of a batch. The "frame" of the batch is an NHWC
+        array (as yielded by VideoBatcher) or a list of images with different
+        sizes. The frames are letterboxed into det_imgs, which is allocated if
+        it is not given."""
         import cv2
         import torch
 
@@ -207,62 +244,105 @@ class InsightfaceDetectorTorch(AnalyserPlugin):
             )
             self.device = device
 
-        img = frame.get("frame")
-        im_ratio = float(img.shape[0]) / img.shape[1]
-        model_ratio = float(input_size[1]) / input_size[0]
-        if im_ratio > model_ratio:
-            new_height = input_size[1]
-            new_width = int(new_height / im_ratio)
-        else:
-            new_width = input_size[0]
-            new_height = int(new_width * im_ratio)
-        det_scale = float(new_height) / img.shape[0]
-        resized_img = cv2.resize(img, (new_width, new_height))
-        det_img = np.zeros((input_size[1], input_size[0], 3), dtype=np.uint8)
-        det_img[:new_height, :new_width, :] = resized_img
-        start_time = time.time()
-        result = self.forward_nms(
-            data=np.expand_dims(det_img, axis=0),
+        frames = batch.get("frame")
+        if det_imgs is None or len(det_imgs) < len(frames):
+            det_imgs = np.empty(
+                (len(frames), input_size[1], input_size[0], 3), dtype=np.uint8
+            )
+        det_imgs = det_imgs[: len(frames)]
+        det_imgs.fill(0)
+
+        # all frames of a batch are letterboxed into one input tensor
+        det_scales = []
+        for b, img in enumerate(frames):
+            im_ratio = float(img.shape[0]) / img.shape[1]
+            model_ratio = float(input_size[1]) / input_size[0]
+            if im_ratio > model_ratio:
+                new_height = input_size[1]
+                new_width = int(new_height / im_ratio)
+            else:
+                new_width = input_size[0]
+                new_height = int(new_width * im_ratio)
+            det_scales.append(float(new_height) / img.shape[0])
+            det_imgs[b, :new_height, :new_width, :] = cv2.resize(
+                img, (new_width, new_height)
+            )
+
+        results = self.forward_nms(
+            data=det_imgs,
             det_thresh=det_thresh,
             nms_thresh=nms_thresh,
         )
 
-        bboxes = result["boxes"] / det_scale
-        kpss = result["kpss"] / det_scale
-        scores = result["scores"]
-
-        # create bbox, kps, and face objects (added to original code)
-        bbox_list = []
-        kps_list = []
-        for i in range(len(scores)):
-            x, y = round(max(0, bboxes[i][0])), round(max(0, bboxes[i][1]))
-            w, h = round(bboxes[i][2] - x), round(bboxes[i][3] - y)
-            det_score = scores[i]
-
-            # store bbox
-            bbox = {
-                "x": float(x / img.shape[1]),
-                "y": float(y / img.shape[0]),
-                "w": float(w / img.shape[1]),
-                "h": float(h / img.shape[0]),
-                "det_score": float(det_score),
-                "time": frame.get("time"),
-                "delta_time": 1 / fps,
-            }
-            bbox_list.append(bbox)
-
-            # store facial keypoints (kps)
-            kps = {
-                "x": [x.item() / img.shape[1] for x in kpss[i, :, 0]],
-                "y": [y.item() / img.shape[0] for y in kpss[i, :, 1]],
-                "time": frame.get("time"),
-                "delta_time": 1 / fps,
-            }
-            kps_list.append(kps)
-
-        return bbox_list, kps_list
-
-    def predict_faces(self, iterator, num_frames, parameters, data_manager, callbacks):
+        detections = []
+        for img, t, det_scale, result in zip(
+            frames, batch.get("time"), det_scales, results
+        ):
+            bboxes = result["boxes"] / det_scale
+            kpss = result["kpss"] / det_scale
+            scores = result["scores"]
+
+            # create bbox, kps, and face objects (added to original code)
+            bbox_list = []
+            kps_list = []
+            for i in range(len(scores)):
+                x, y = round(max(0, bboxes[i][0])), round(max(0, bboxes[i][1]))
+                w, h = round(bboxes[i][2] - x), round(bboxes[i][3] - y)
+                det_score = scores[i]
+
+                # store bbox
+                bbox = {
+                    "x": float(x / img.shape[1]),
+                    "y": float(y / img.shape[0]),
+                    "w": float(w / img.shape[1]),
+                    "h": float(h / img.shape[0]),
+                    "det_score": float(det_score),
+                    "time": t,
+                    "delta_time": 1 / fps,
+                }
+                bbox_list.append(bbox)
+
+                # store facial keypoints (kps)
+                kps = {
+                    "x": [x.item() / img.shape[1] for x in kpss[i, :, 0]],
+                    "y": [y.item() / img.shape[0] for y in kpss[i, :, 1]],
+                    "time": t,
+                    "delta_time": 1 / fps,
+                }
+                kps_list.append(kps)
+            detections.append((bbox_list, kps_list))
+
+        return detections
+
+    def detect_batches(self, batches, parameters):
+        """Yields the index, the frame and the detections of every frame of
+        the batches. A frame is only valid until the next one is requested."""
+        input_size = parameters.get("input_size")
+        # letterbox input that is reused by all batches
+        det_imgs = np.empty(
+            (parameters.get("batch_size", 1), input_size[1], input_size[0], 3),
+            dtype=np.uint8,
+        )
+        i = 0
+        for batch in batches:
+            detections = self.detect_batch(
+                batch,
+                input_size,
+                det_thresh=parameters.get("det_thresh"),
+                nms_thresh=parameters.get("nms_thresh"),
+                fps=parameters.get("fps"),
+                det_imgs=det_imgs,
+            )
+            for b, detection in enumerate(detections):
+                frame = {
+                    "frame": batch["frame"][b],
+                    "time": batch["time"][b],
+                    "ref_id": batch["ref_id"][b],
+                }
+                yield i, frame, detection
+                i += 1
+
+    def predict_faces(self, batches, num_frames, parameters, data_manager, callbacks):
         with (
             data_manager.create_data("ImagesData") as images_data,
             data_manager.create_data("BboxesData") as bboxes_data,
@@ -270,15 +350,10 @@ class InsightfaceDetectorTorch(AnalyserPlugin):
             data_manager.create_data("KpssData") as kpss_data,
         ):
             # iterate through images to get face_images and bboxes
-            for i, frame in enumerate(iterator):
+            for i, frame, (frame_bboxes, frame_kpss) in self.detect_batches(
+                batches, parameters
+            ):
                 self.update_callbacks(callbacks, progress=i / num_frames)
-                frame_bboxes, frame_kpss = self.detect(
-                    frame,
-                    parameters.get("input_size"),
-                    det_thresh=parameters.get("det_thresh"),
-                    nms_thresh=parameters.get("nms_thresh"),
-                    fps=parameters.get("fps"),
-                )
 
                 for i in range(len(frame_bboxes)):
                     # store bboxes, kpss, and faces
@@ -341,6 +416,7 @@ default_parameters = {
     "det_thresh": 0.5,
     "nms_thresh": 0.4,
     "input_size": (640, 640),
+    "batch_size": 32,
 }
 
 requires = {
@@ -376,21 +452,20 @@ class InsightfaceVideoDetectorTorch(
         callbacks: Callable = None,
     ) -> Dict[str, Data]:
         with inputs["video"] as input_data:
-            with input_data.open_video() as f_video:
-                video_decoder = VideoDecoder(
-                    f_video,
-                    fps=parameters.get("fps"),
-                    extension=f".{input_data.ext}",
-                    ref_id=input_data.id,
-                )
-
+            with input_data(
+                fps=parameters.get("fps"),
+                ref_id=input_data.id,
+                **self.frame_cache_args(),
+            ) as video_decoder:
                 # decode video to extract bboxes per frame
                 # video_decoder = VideoDecoder(path=inputs["video"].path, fps=parameters.get("fps"))
 
                 num_frames = video_decoder.duration() * video_decoder.fps()
 
                 return self.predict_faces(
-                    iterator=video_decoder,
+                    batches=VideoBatcher(
+                        video_decoder, batch_size=parameters.get("batch_size")
+                    ),
                     num_frames=num_frames,
                     parameters=parameters,
                     data_manager=data_manager,
@@ -412,6 +487,7 @@ default_parameters = {
     "det_thresh": 0.5,
     "nms_thresh": 0.4,
     "input_size": (640, 640),
+    "batch_size": 32,
 }
 
 requires = {
@@ -447,16 +523,19 @@ class InsightfaceImageDetectorTorch(
         callbacks: Callable = None,
     ) -> Dict[str, Data]:
         with inputs["images"] as input_data:
+            # images differ in size, so a batch holds a list of frames
+            def batch_generator():
+                batch_size = parameters.get("batch_size")
+                for i in range(0, len(input_data), batch_size):
+                    images = input_data.images[i : i + batch_size]
+                    yield {
+                        "frame": [input_data.load_image(x) for x in images],
+                        "time": [0] * len(images),
+                        "ref_id": [x.id for x in images],
+                    }
 
-            def image_generator():
-                for image in input_data:
-                    frame = input_data.load_image(image)
-
-                    yield {"frame": frame, "time": 0, "ref_id": image.id}
-
-            images = image_generator()
             return self.predict_faces(
-                iterator=images,
+                batches=iterate_in_thread(batch_generator(), queue_size=2),
                 num_frames=len(input_data),
                 parameters=parameters,
                 data_manager=data_manager,
@@ -262,20 +262,17 @@ class InsightfaceVideoFeatureExtractor(
                     kps_dict[kps.time].append(kps)
 
                 def get_iterator(video_decoder, kps_dict):
-                    # TODO: change VideoDecoder class to be able to directly seek the video for specific frames
-                    # WORKAROUND: loop over the whole video and store frames whenever there is a face detected
-                    for frame in video_decoder:
-                        t = frame["time"]
-                        if t in kps_dict:
-                            for kps in kps_dict[t]:
-                                face_id = (
-                                    faceid_lut[kps.id] if kps.id in faceid_lut else None
-                                )
-                                yield {
-                                    "frame": frame["frame"],
-                                    "kps": kps,
-                                    "face_id": face_id,
-                                }
+                    # only decode the frames with a detected face
+                    for frame in video_decoder.get_frames(kps_dict.keys()):
+                        for kps in kps_dict[frame["time"]]:
+                            face_id = (
+                                faceid_lut[kps.id] if kps.id in faceid_lut else None
+                            )
+                            yield {
+                                "frame": frame["frame"],
+                                "kps": kps,
+                                "face_id": face_id,
+                            }
 
                 iterator = get_iterator(video_decoder, kps_dict)
                 return self.get_facial_features(
@@ -217,17 +217,14 @@ class InsightfaceVideoGenderAgeCalculator(
                     bbox_dict[bbox.time].append(bbox)
 
                 def get_iterator(video_decoder, bbox_dict):
-                    # TODO: change VideoDecoder class to be able to directly seek the video for specific frames
-                    # WORKAROUND: loop over the whole video and store frames whenever there is a face detected
-                    for frame in video_decoder:
-                        t = frame["time"]
-                        if t in bbox_dict:
-                            for bbox in bbox_dict[t]:
-                                yield {
-                                    "frame": frame["frame"],
-                                    "bbox": bbox,
-                                    "face_id": bbox.ref_id,
-                                }
+                    # only decode the frames with a detected face
+                    for frame in video_decoder.get_frames(bbox_dict.keys()):
+                        for bbox in bbox_dict[frame["time"]]:
+                            yield {
+                                "frame": frame["frame"],
+                                "bbox": bbox,
+                                "face_id": bbox.ref_id,
+                            }
 
                 iterator = get_iterator(video_decoder, bbox_dict)
                 return self.get_genderage(
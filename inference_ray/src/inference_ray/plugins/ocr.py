@@ -602,14 +602,11 @@ class OCRVideoDetectorONNX(
         callbacks: Callable = None,
     ) -> Dict[str, Data]:
         with inputs["video"] as input_data:
-            with input_data.open_video() as f_video:
-                video_decoder = VideoDecoder(
-                    f_video,
-                    fps=parameters.get("fps"),
-                    extension=f".{input_data.ext}",
-                    ref_id=input_data.id,
-                )
-
+            with input_data(
+                fps=parameters.get("fps"),
+                ref_id=input_data.id,
+                **self.frame_cache_args(),
+            ) as video_decoder:
                 num_frames = video_decoder.duration() * video_decoder.fps()
 
                 return self.predict_texts(
@@ -165,14 +165,12 @@ class ShotScaleAndMovement(
 
         with inputs["video"] as video_data:
             with (
-                video_data.open_video() as f_video,
+                video_data(
+                    fps=parameters["fps"], **self.frame_cache_args()
+                ) as video_decoder,
                 data_manager.create_data("ListData") as scale_probs_data,
                 data_manager.create_data("ListData") as movement_probs_data,
             ):
-                video_decoder = VideoDecoder(
-                    path=f_video, extension=f".{video_data.ext}", fps=parameters["fps"]
-                )
-
                 # time batches (1 prediction per batch)
                 _batch = []
                 times = []
@@ -45,14 +45,11 @@ class ThumbnailGenerator(
             inputs["video"] as input_data,
             data_manager.create_data("ImagesData") as output_data,
         ):
-            with input_data.open_video() as f_video:
-                video_decoder = VideoDecoder(
-                    path=f_video,
-                    fps=parameters.get("fps"),
-                    max_dimension=parameters.get("max_dimension"),
-                    extension=f".{input_data.ext}",
-                )
-
+            with input_data(
+                fps=parameters.get("fps"),
+                max_dimension=parameters.get("max_dimension"),
+                **self.frame_cache_args(),
+            ) as video_decoder:
                 num_frames = video_decoder.duration() * video_decoder.fps()
                 for i, frame in enumerate(video_decoder):
                     self.update_callbacks(callbacks, progress=i / num_frames)
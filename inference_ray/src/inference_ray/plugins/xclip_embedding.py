@@ -280,14 +280,12 @@ class XClipVideoEmbedding(
             data_manager.create_data("ImageEmbeddings") as image_data,
             data_manager.create_data("VideoTemporalEmbeddings") as video_data,
         ):
-            with input_data.open_video("r") as f_video:
+            with input_data(
+                fps=parameters.get("fps"), **self.frame_cache_args()
+            ) as decoder:
+                # the temporal model expects windows of exactly batch_size frames
                 video_decoder = VideoBatcher(
-                    VideoDecoder(
-                        f_video,
-                        fps=parameters.get("fps"),
-                        extension=f".{input_data.ext}",
-                    ),
-                    batch_size=parameters.get("batch_size"),
+                    decoder, batch_size=parameters.get("batch_size"), drop_last=True
                 )
                 num_frames = (
                     video_decoder.duration() * video_decoder.fps()
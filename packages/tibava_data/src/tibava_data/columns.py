@@ -0,0 +1,109 @@
+import dataclasses
+import numbers
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, numbers.Number) and not isinstance(value, bool)
+
+
+def encode_column(values: List[Any]) -> Tuple[str, Dict[str, np.ndarray], Any]:
+    """Converts the values of one field into arrays.
+
+    Returns the kind of the column, the arrays that are stored as npy members
+    and a plain value that is stored in the yaml header (only for kinds that
+    have no array representation).
+    """
+    present = [x for x in values if x is not None]
+
+    if len(present) == 0:
+        return "none", {}, None
+
+    if all(isinstance(x, bool) for x in present) and len(present) == len(values):
+        return "bool", {"values": np.asarray(values, dtype=bool)}, None
+
+    if all(isinstance(x, numbers.Integral) and _is_number(x) for x in present):
+        arrays = {"values": np.asarray([x or 0 for x in values], dtype=np.int64)}
+        if len(present) != len(values):
+            arrays["none"] = np.asarray([x is None for x in values], dtype=bool)
+        return "int", arrays, None
+
+    if all(_is_number(x) for x in present):
+        # ints mixed into a float column are marked and restored on load,
+        # unless they cannot be represented exactly as float
+        integral = [isinstance(x, numbers.Integral) for x in values]
+        if any(abs(x) > 2**53 for x, i in zip(values, integral) if i):
+            return "yaml", {}, list(values)
+        arrays = {
+            "values": np.asarray(
+                [np.nan if x is None else x for x in values], dtype=np.float64
+            )
+        }
+        if len(present) != len(values):
+            arrays["none"] = np.asarray([x is None for x in values], dtype=bool)
+        if any(integral):
+            arrays["int"] = np.asarray(integral, dtype=bool)
+        return "float", arrays, None
+
+    if all(isinstance(x, str) for x in present):
+        arrays = {"values": np.asarray(["" if x is None else x for x in values])}
+        if len(present) != len(values):
+            arrays["none"] = np.asarray([x is None for x in values], dtype=bool)
+        return "str", arrays, None
+
+    if len(present) == len(values) and all(
+        isinstance(x, (list, tuple)) and all(_is_number(y) for y in x) for x in present
+    ):
+        if len(set(len(x) for x in present)) == 1:
+            return "list", {"values": np.asarray(values, dtype=np.float64)}, None
+
+    # everything else is kept in the yaml header
+    return "yaml", {}, list(values)
+
+
+def decode_column(
+    kind: str, length: int, arrays: Dict[str, np.ndarray], value: Any = None
+) -> List[Any]:
+    if kind == "none":
+        return [None] * length
+
+    if kind == "yaml":
+        return value
+
+    values = arrays["values"].tolist()
+    if "int" in arrays:
+        values = [int(x) if i else x for x, i in zip(values, arrays["int"].tolist())]
+    if "none" in arrays:
+        return [None if n else x for x, n in zip(values, arrays["none"].tolist())]
+    return values
+
+
+def build_items(item_cls, values: Dict[str, List[Any]]) -> List[Any]:
+    """Creates one dataclass per row without going through __init__"""
+    names = list(values.keys())
+    rows = zip(*[values[x] for x in names])
+    if hasattr(item_cls, "__post_init__"):
+        return [item_cls(**dict(zip(names, row))) for row in rows]
+
+    defaults = {}
+    factories = {}
+    for x in dataclasses.fields(item_cls):
+        if x.name in values:
+            continue
+        if x.default_factory is not dataclasses.MISSING:
+            factories[x.name] = x.default_factory
+        else:
+            defaults[x.name] = x.default
+
+    items = []
+    new = object.__new__
+    for row in rows:
+        item = new(item_cls)
+        item.__dict__.update(defaults)
+        for name, factory in factories.items():
+            item.__dict__[name] = factory()
+        item.__dict__.update(zip(names, row))
+        items.append(item)
+    return items
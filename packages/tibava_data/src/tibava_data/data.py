@@ -2,10 +2,13 @@ import zipfile
 import logging
 import yaml
 from dataclasses import dataclass, field, fields, asdict
-from typing import Callable, Optional, Dict
+from typing import Callable, Optional, Dict, List
 
 import uuid
 
+import numpy as np
+
+from .columns import encode_column, decode_column, build_items
 from .fs_handler import FSHandler
 
 
@@ -37,10 +40,27 @@ class Data:
         return hasattr(self, "fs") and self.fs is not None
 
     def load(self) -> None:
-        data = self.load_dict("meta.yml")
+        # meta.yml was already read when the data was opened by the DataManager
+        data = self.__dict__.pop("_meta", None)
+        if data is None:
+            data = self.load_dict("meta.yml")
         for x in fields(Data):
             setattr(self, x.name, data.get(x.name, x.default))
 
+    def select(self, names: List[str] = None) -> "Data":
+        """Restricts the next load to some fields, None loads everything.
+
+        Fields that are not selected keep their defaults, e.g.
+        `with data.select(["time"]):` skips the embeddings of an
+        ImageEmbeddings container.
+        """
+        self._load_fields = None if names is None else set(names)
+        return self
+
+    def is_selected(self, name: str) -> bool:
+        load_fields = getattr(self, "_load_fields", None)
+        return load_fields is None or name in load_fields
+
     def load_dict(self, filename: str) -> Dict:
         assert self.check_fs(), "No filesystem handler installed"
 
@@ -49,7 +69,6 @@ class Data:
             return yaml.safe_load(decoded_data)
 
     def save(self) -> None:
-
         data_dict = {}
         for x in fields(Data):
             data_dict[x.name] = getattr(self, x.name)
@@ -60,9 +79,93 @@ class Data:
         assert self.fs.mode == "w", "Data packet is open read only"
 
         with self.fs.open_file(filename, "w") as f:
-
             f.write(yaml.safe_dump(data).encode())
 
+    def save_array(self, filename: str, array: np.ndarray) -> None:
+        assert self.check_fs(), "No filesystem handler installed"
+        assert self.fs.mode == "w", "Data packet is open read only"
+
+        self.fs.save_array(filename, np.asarray(array))
+
+    def load_array(self, filename: str) -> np.ndarray:
+        assert self.check_fs(), "No filesystem handler installed"
+
+        return self.fs.load_array(filename)
+
+    def save_columns(
+        self, filename: str, items: List["Data"], exclude: List[str] = None
+    ) -> None:
+        """Stores a list of dataclasses with one npy member per field"""
+        exclude = exclude or []
+        names = []
+        if len(items) > 0:
+            names = [x.name for x in fields(items[0]) if x.name not in exclude]
+
+        header = {"length": len(items), "columns": {}}
+        for name in names:
+            kind, arrays, value = encode_column([getattr(x, name) for x in items])
+            header["columns"][name] = {
+                "kind": kind,
+                "arrays": list(arrays.keys()),
+                "value": value,
+            }
+            for key, array in arrays.items():
+                self.save_array(f"{filename}/{name}.{key}.npy", array)
+
+        self.save_dict(f"{filename}/columns.yml", header)
+
+    def load_columns(self, filename: str, item_cls) -> Optional[List["Data"]]:
+        """Loads a list stored by save_columns, None if there is no such list"""
+        try:
+            header = self.load_dict(f"{filename}/columns.yml")
+        except KeyError:
+            return None
+
+        length = header.get("length")
+        columns = {}
+        values = {}
+        for name, column in header.get("columns").items():
+            if name != "id" and not self.is_selected(name):
+                continue
+            arrays = {
+                key: self.load_array(f"{filename}/{name}.{key}.npy")
+                for key in column.get("arrays")
+            }
+            columns[name] = (column.get("kind"), arrays)
+            values[name] = decode_column(
+                column.get("kind"), length, arrays, column.get("value")
+            )
+
+        if not hasattr(self, "_columns"):
+            self._columns = {}
+        self._columns[filename] = {"length": length, "columns": columns}
+
+        return build_items(item_cls, values)
+
+    def get_column(self, filename: str, items: List["Data"], name: str) -> np.ndarray:
+        """Returns one field of a list of dataclasses as array.
+
+        For read only data the arrays loaded by load_columns are returned
+        directly. Missing numbers are NaN.
+        """
+        stored = getattr(self, "_columns", {}).get(filename)
+        if (
+            stored is not None
+            and self.check_fs()
+            and self.fs.mode == "r"
+            and stored["length"] == len(items)
+            and name in stored["columns"]
+        ):
+            kind, arrays = stored["columns"][name]
+            if "values" in arrays and (kind == "float" or "none" not in arrays):
+                return arrays["values"]
+
+        values = [getattr(x, name) for x in items]
+        kind, arrays, _ = encode_column(values)
+        if "values" in arrays and (kind == "float" or "none" not in arrays):
+            return arrays["values"]
+        return np.asarray(values, dtype=object)
+
     def to_dict(self) -> dict:
         data_dict = {}
         for x in fields(Data):
@@ -1,7 +1,11 @@
 import zipfile
 import logging
+import struct
+import time
 import yaml
 import os
+
+import numpy as np
 from dataclasses import dataclass, field, fields, asdict
 from typing import Callable, Optional, Dict
 
@@ -12,6 +16,14 @@ class FSHandler:
     pass
 
 
+# arrays are aligned to this many bytes inside the container
+ARRAY_ALIGNMENT = 64
+# header id of the extra field that pads a member to the alignment
+PADDING_EXTRA_ID = 0xD935
+# arrays with at least this many bytes are memory mapped on load
+MMAP_THRESHOLD = 1024 * 1024
+
+
 class ZipFSHandler(FSHandler):
     def __init__(self, path: str, mode: str = "r") -> None:
         if mode is None:
@@ -30,10 +42,30 @@ class ZipFSHandler(FSHandler):
 
     def open(self, data) -> None:
         logging.debug(f"open {self.path}")
-        self.zipfile = zipfile.ZipFile(self.path, self.mode)
+        # the container might still be open from read_meta(keep_open=True)
+        if self.zipfile is None:
+            # members are stored uncompressed, videos and images are compressed
+            # already and arrays are memory mapped
+            self.zipfile = zipfile.ZipFile(
+                self.path, self.mode, compression=zipfile.ZIP_STORED
+            )
         if self.mode == "r":
             data.load()
 
+    def read_meta(self, keep_open: bool = False) -> Dict:
+        """Reads meta.yml. A container that is opened for this is closed
+        again, unless keep_open is set (it is then closed by close)."""
+        opened = self.zipfile is None
+        if opened:
+            self.zipfile = zipfile.ZipFile(self.path, self.mode)
+        try:
+            with self.zipfile.open("meta.yml") as f:
+                return yaml.safe_load(f.read().decode("utf-8"))
+        finally:
+            if opened and not keep_open:
+                self.zipfile.close()
+                self.zipfile = None
+
     def list_files(self) -> None:
         if self.zipfile is None:
             raise Exception()
@@ -80,6 +112,75 @@ class ZipFSHandler(FSHandler):
 
         return self.zipfile.open(filename, mode=mode, force_zip64=True)
 
+    def save_array(self, filename: str, array: np.ndarray) -> None:
+        """Writes an array uncompressed so that its data is aligned in the file"""
+        if self.zipfile is None:
+            logging.error("")
+            return None
+
+        if self.mode == "r":
+            raise ValueError
+
+        zinfo = zipfile.ZipInfo(filename, date_time=time.localtime(time.time())[:6])
+        zinfo.compress_type = zipfile.ZIP_STORED
+
+        # local header: 30 bytes + name + extra + 20 bytes zip64 extra
+        data_offset = (
+            self.zipfile.fp.tell() + 30 + len(zinfo.filename.encode("utf-8")) + 20
+        )
+        padding = -data_offset % ARRAY_ALIGNMENT
+        if 0 < padding < 4:
+            padding += ARRAY_ALIGNMENT
+        if padding > 0:
+            zinfo.extra = struct.pack("<HH", PADDING_EXTRA_ID, padding - 4) + bytes(
+                padding - 4
+            )
+
+        # the npy header is padded to a multiple of 64 bytes as well
+        with self.zipfile.open(zinfo, mode="w", force_zip64=True) as f:
+            np.save(f, array)
+
+    def load_array(self, filename: str) -> np.ndarray:
+        """Loads an array, large uncompressed arrays are memory mapped"""
+        if self.zipfile is None:
+            logging.error("")
+            return None
+
+        zinfo = self.zipfile.getinfo(filename)
+        if (
+            zinfo.compress_type != zipfile.ZIP_STORED
+            or zinfo.file_size < MMAP_THRESHOLD
+        ):
+            with self.zipfile.open(filename, "r") as f:
+                return np.load(f)
+
+        with open(self.path, "rb") as f:
+            f.seek(zinfo.header_offset)
+            header = f.read(30)
+            name_length, extra_length = struct.unpack("<HH", header[26:30])
+            f.seek(zinfo.header_offset + 30 + name_length + extra_length)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            offset = f.tell()
+
+        if dtype.hasobject:
+            with self.zipfile.open(filename, "r") as f:
+                return np.load(f)
+
+        # copy on write, callers may modify the array without touching the file
+        return np.memmap(
+            self.path,
+            dtype=dtype,
+            mode="c",
+            offset=offset,
+            shape=shape,
+            order="F" if fortran_order else "C",
+        )
+
 
 class LocalFSHandler(FSHandler):
     def __init__(self, fs: FSHandler, path: str) -> None:
@@ -93,6 +194,10 @@ class LocalFSHandler(FSHandler):
         if self.fs.mode == "r":
             data.load()
 
+    def read_meta(self, keep_open: bool = False) -> Dict:
+        with self.open_file("meta.yml") as f:
+            return yaml.safe_load(f.read().decode("utf-8"))
+
     @property
     def mode(self):
         return self.fs.mode
@@ -130,3 +235,20 @@ class LocalFSHandler(FSHandler):
             raise ValueError
 
         return self.fs.open_file(os.path.join(self.path, filename), mode=mode)
+
+    def save_array(self, filename: str, array: np.ndarray) -> None:
+        if self.fs is None:
+            logging.error("")
+            return None
+
+        if self.fs.mode == "r":
+            raise ValueError
+
+        return self.fs.save_array(os.path.join(self.path, filename), array)
+
+    def load_array(self, filename: str) -> np.ndarray:
+        if self.fs is None:
+            logging.error("")
+            return None
+
+        return self.fs.load_array(os.path.join(self.path, filename))
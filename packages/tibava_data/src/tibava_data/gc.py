@@ -0,0 +1,158 @@
+import glob
+import logging
+import os
+import time
+from typing import Dict, Iterator, Set, Tuple
+
+from .fs_handler import ZipFSHandler
+from .manager import DataManager
+
+# containers younger than this are never collected, they might still be in use
+DEFAULT_GRACE_PERIOD = 24 * 60 * 60
+
+
+def iter_containers(data_dir: str) -> Iterator[Tuple[str, str]]:
+    """Yields (data_id, path) for every container stored in data_dir"""
+    for path in glob.iglob(os.path.join(data_dir, "??", "??", "*.zip")):
+        yield os.path.splitext(os.path.basename(path))[0], path
+
+
+def _sidecars(path: str) -> Iterator[str]:
+    # decoded frames that were cached next to the container
+    yield from glob.iglob(f"{os.path.splitext(path)[0]}.frames_*")
+
+
+def _size(path: str) -> int:
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return 0
+
+
+def container_size(path: str) -> int:
+    """Size of a container including its cached frames"""
+    return _size(path) + sum(_size(x) for x in _sidecars(path))
+
+
+def read_type(path: str) -> str:
+    fs = ZipFSHandler(path, mode="r")
+    try:
+        return fs.read_meta().get("type", "unknown")
+    except Exception:
+        return "unknown"
+    finally:
+        fs.close(None)
+
+
+def cache_references(
+    data_manager: DataManager, max_age: float = None, dry_run: bool = False
+) -> Set[str]:
+    """Returns the ids of all data referenced by the cache of the data manager.
+
+    Entries whose data does not exist anymore are removed from the cache, as
+    are entries older than max_age seconds (their data becomes unreachable)
+    and entries that are not dicts.
+    """
+    cache = data_manager.cache
+    if not cache:
+        return set()
+
+    now = time.time()
+    references = set()
+    for key, value in cache:
+        if not isinstance(value, dict):
+            if not dry_run:
+                cache.delete(key)
+            continue
+        data_id = value.get("data_id")
+        expired = max_age is not None and now - value.get("time", now) > max_age
+        if data_manager.check(data_id) is None or expired:
+            if not dry_run:
+                cache.delete(key)
+            continue
+        references.add(data_id)
+    return references
+
+
+def collect_garbage(
+    data_manager: DataManager,
+    reachable: Set[str],
+    grace_period: float = DEFAULT_GRACE_PERIOD,
+    dry_run: bool = False,
+) -> Dict:
+    """Mark and sweep of the containers of a data manager.
+
+    Every container that is not in reachable and was not modified within the
+    grace period is deleted together with its cached frames. Orphaned frame
+    caches, stale temporary files and content entries of deleted data are
+    removed as well. Loose files next to the containers (e.g. extracted
+    images) are kept.
+    """
+    data_dir = data_manager.data_dir
+    deadline = time.time() - grace_period
+    result = {"containers": 0, "files": 0, "bytes": 0, "kept": 0}
+
+    def sweep(path: str) -> None:
+        size = _size(path)
+        if not dry_run:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                return
+        result["files"] += 1
+        result["bytes"] += size
+
+    for data_id, path in iter_containers(data_dir):
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            continue
+        if data_id in reachable or mtime > deadline:
+            result["kept"] += 1
+            continue
+
+        logging.info(f"[GC] collect {data_id}")
+        result["containers"] += 1
+        for x in _sidecars(path):
+            sweep(x)
+        sweep(path)
+
+    for path in glob.iglob(os.path.join(data_dir, "??", "??", "*.frames_*")):
+        base = path.split(".frames_")[0]
+        if not os.path.exists(f"{base}.zip") and os.stat(path).st_mtime < deadline:
+            sweep(path)
+
+    # leftovers of interrupted writes
+    for path in glob.iglob(os.path.join(data_dir, "**", "*.tmp"), recursive=True):
+        if os.stat(path).st_mtime < deadline:
+            sweep(path)
+
+    if not dry_run:
+        result["files"] += data_manager.prune_content()
+
+    return result
+
+
+def disk_usage(data_manager: DataManager, owners: Dict[str, str] = None) -> Dict:
+    """Reports the number and bytes of containers per data type and per owner.
+
+    owners maps data ids to their owner, containers without owner are counted
+    as None.
+    """
+    owners = owners or {}
+    usage = {"total": {"count": 0, "bytes": 0}, "types": {}, "owners": {}}
+
+    for data_id, path in iter_containers(data_manager.data_dir):
+        size = container_size(path)
+        data_type = read_type(path)
+        owner = owners.get(data_id)
+
+        for entry in (
+            usage["total"],
+            usage["types"].setdefault(data_type, {"count": 0, "bytes": 0}),
+            usage["owners"].setdefault(owner, {"count": 0, "bytes": 0}),
+        ):
+            entry["count"] += 1
+            entry["bytes"] += size
+
+    return usage
@@ -2,21 +2,30 @@ from __future__ import annotations
 
 import time
 import os
+import glob
+import itertools
 import logging
 import json
 import tempfile
 import hashlib
-from typing import Any, Iterator, List
+import threading
+import types
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional
 from collections.abc import Iterable
 
 from dataclasses import field
 
 from .data import Data
-from .fs_handler import ZipFSHandler
+from .fs_handler import FSHandler, ZipFSHandler
 from .utils import create_data_path, generate_id
 from tibava_utils.cache import Cache
 
 
+# chunks of data transfers, well below the 50 MiB message limit of grpc
+TRANSFER_CHUNK_SIZE = 8 * 1024 * 1024
+
+
 class DataManager:
     _data_name_lut = {}
     _data_enum_lut = {}
@@ -28,6 +37,10 @@ class DataManager:
             data_dir = tempfile.mkdtemp()
         self.data_dir = data_dir
 
+        # upload id -> [lock, number of threads that use it]
+        self.upload_locks = {}
+        self.upload_locks_lock = threading.Lock()
+
     @classmethod
     def export(cls, name: str, enum_value: int, minetype: List[str] = None):
         def export_helper(data):
@@ -57,34 +70,119 @@ class DataManager:
     def _create_file_path(self, data_id, extension) -> str:
         return create_data_path(self.data_dir, data_id, extension)
 
-    def load(self, data_id: str):
+    def load(self, data_id: str, fields: List[str] = None):
         data_path = create_data_path(self.data_dir, data_id, "zip")
 
         if not os.path.exists(data_path):
             logging.error(f"Data not found with data_id {data_id}")
             return None
-        data = Data()
-        data._register_fs_handler(ZipFSHandler(data_path, mode="r"))
-        data_type = None
-        with data:
-            data_type = data.type
-            data_id = data.id
 
-        assert data_type in self._data_name_lut, f"Unknown data type {data_type}"
+        return self.load_from_fs(ZipFSHandler(data_path, mode="r"), fields=fields)
 
-        data = self._data_name_lut[data_type](id=data_id)
-        data._register_fs_handler(ZipFSHandler(data_path, mode="r"))
+    @classmethod
+    def load_from_fs(cls, fs: FSHandler, fields: List[str] = None) -> Data:
+        """Creates the data class stored in fs.
 
-        return data
+        meta.yml is only read once, the returned data is loaded when it is
+        entered. The container is closed in between, so data that is never
+        entered does not hold a file handle. With fields only these fields
+        are loaded (see Data.select).
+        """
+        meta = fs.read_meta()
+        data_type = meta.get("type")
+
+        if data_type not in cls._data_name_lut:
+            raise AssertionError(f"Unknown data type {data_type}")
+
+        data = cls._data_name_lut[data_type](id=meta.get("id"))
+        data._register_fs_handler(fs)
+        data._meta = meta
+
+        return data.select(fields)
 
     def data_path(self, data_id) -> str:
         return create_data_path(self.data_dir, data_id, "zip")
 
+    def check(self, data_id: str) -> Optional[str]:
+        """Returns data_id if the data is stored, None otherwise"""
+        if not data_id:
+            return None
+        if not os.path.exists(create_data_path(self.data_dir, data_id, "zip")):
+            return None
+        return data_id
+
+    def _content_path(self, content_hash: str) -> str:
+        return create_data_path(
+            os.path.join(self.data_dir, "content"), content_hash, "zip"
+        )
+
+    def find(self, content_hash: str) -> Optional[str]:
+        """Returns the id of the data that was created from content with the
+        given sha1 hash, None if there is no such data"""
+        if not content_hash:
+            return None
+
+        content_path = self._content_path(content_hash)
+        if os.path.exists(content_path):
+            fs = ZipFSHandler(content_path, mode="r")
+            try:
+                data_id = fs.read_meta().get("id")
+            finally:
+                fs.close(None)
+
+            data_path = create_data_path(self.data_dir, data_id, "zip")
+            if os.path.exists(data_path) and os.path.samefile(content_path, data_path):
+                return data_id
+
+            # the data was deleted in the meantime
+            os.remove(content_path)
+            return None
+
+        if self.cache:
+            cached_data_info = self.cache.get(content_hash)
+            if cached_data_info is not None:
+                return self.check(cached_data_info.get("data_id"))
+
+        return None
+
+    def link(self, data_id: str, content_hash: str) -> None:
+        """Stores the container of data_id under the hash of its content.
+
+        The content entry is a hard link to the container, so identical
+        uploads share one file and the link count of a container tells how
+        often it is referenced.
+        """
+        data_path = create_data_path(self.data_dir, data_id, "zip")
+        content_path = self._content_path(content_hash)
+        tmp_path = f"{content_path}.{generate_id()}.tmp"
+        try:
+            os.link(data_path, tmp_path)
+            os.replace(tmp_path, content_path)
+        except OSError as e:
+            logging.warning(f"Can't link {data_id} to content {content_hash}: {e}")
+
+    def prune_content(self) -> int:
+        """Removes content entries whose data was deleted, returns their number"""
+        count = 0
+        content_dir = os.path.join(self.data_dir, "content")
+        for path in glob.glob(os.path.join(content_dir, "*", "*", "*.zip")):
+            try:
+                if os.stat(path).st_nlink < 2:
+                    os.remove(path)
+                    count += 1
+            except FileNotFoundError:
+                pass
+        return count
+
     def delete(self, data_id: str):
         data_path = create_data_path(self.data_dir, data_id, "zip")
         if os.path.exists(data_path):
             os.remove(data_path)
 
+        # decoded frames of a video are stored next to its container
+        for path in glob.glob(f"{os.path.splitext(data_path)[0]}.frames_*"):
+            os.remove(path)
+
     def load_file_from_stream(self, data_stream: Iterable) -> tuple(Data, str):
         data_stream = iter(data_stream)
         first_pkg = next(data_stream)
@@ -127,23 +225,118 @@ class DataManager:
 
         file_hash = hash_stream.hexdigest()
 
-        if self.cache:
-            logging.info(f"Check file cache for {file_hash}")
-            cached_data_info = self.cache.get(file_hash)
-            cached_data = None
-            if cached_data_info is not None:
-                logging.info(f"Found data for file upload in cache {cached_data_info}")
-                cached_data = self.load(cached_data_info.get("data_id"))
-                logging.info(f"Found data for file upload in cache {cached_data}")
-                if cached_data is not None:
-                    self.delete(data.id)
-                    data = cached_data
+        # the same file was uploaded before, keep the existing data
+        cached_data_id = self.find(file_hash)
+        if cached_data_id is not None and cached_data_id != data.id:
+            logging.info(f"Found data for file upload {cached_data_id}")
+            cached_data = self.load(cached_data_id)
+            if cached_data is not None:
+                self.delete(data.id)
+                data = cached_data
+        else:
+            self.link(data.id, file_hash)
 
+        if self.cache:
             self.cache.set(
                 file_hash, {"data_id": data.id, "time": time.time(), "type": "file"}
             )
 
-        return data, hash_stream.hexdigest()
+        return data, file_hash
+
+    def _upload_path(self, upload_id: str) -> str:
+        # upload ids are chosen by clients, so they are not used as filenames
+        name = hashlib.sha1(upload_id.encode()).hexdigest()
+        # stale partial files are removed by the garbage collection like other .tmp files
+        return create_data_path(os.path.join(self.data_dir, "uploads"), name, "tmp")
+
+    @contextmanager
+    def _upload_lock(self, upload_id: str) -> Iterator[None]:
+        """Serializes the writes to the partial file of an upload id. The lock
+        is removed once no thread holds or waits for it, whether the upload
+        succeeded or not."""
+        with self.upload_locks_lock:
+            entry = self.upload_locks.setdefault(upload_id, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self.upload_locks_lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self.upload_locks[upload_id]
+
+    def upload_offset(self, upload_id: str) -> int:
+        """Number of bytes of a resumable upload that are stored"""
+        try:
+            return os.path.getsize(self._upload_path(upload_id))
+        except FileNotFoundError:
+            return 0
+
+    def load_file_from_resumable_stream(
+        self, data_stream: Iterable
+    ) -> tuple(Optional[Data], Optional[str], int):
+        """Appends the chunks of a stream to the partial file of its upload id.
+
+        Every chunk carries its offset and the sha1 of its bytes, the stream
+        stops at the first chunk that does not fit. Returns the data, the hash
+        of the file and the committed offset. As long as the file is not
+        complete the data and the hash are None, the client continues at the
+        returned offset.
+        """
+        data_stream = iter(data_stream)
+        first_pkg = next(data_stream)
+        upload_id = first_pkg.upload_id
+        upload_path = self._upload_path(upload_id)
+
+        with self._upload_lock(upload_id):
+            offset = self.upload_offset(upload_id)
+            if first_pkg.offset > offset:
+                logging.error(f"Upload {upload_id} continues at {offset}")
+                return None, None, offset
+
+            offset = first_pkg.offset
+            with open(upload_path, "ab", buffering=0) as f:
+                # chunks after the offset are written again
+                f.truncate(offset)
+                for x in itertools.chain([first_pkg], data_stream):
+                    if x.offset != offset:
+                        logging.error(f"Upload {upload_id} got offset {x.offset}")
+                        break
+                    if (
+                        x.chunk_hash
+                        and hashlib.sha1(x.data_encoded).hexdigest() != x.chunk_hash
+                    ):
+                        logging.error(f"Upload {upload_id} invalid chunk at {offset}")
+                        break
+                    f.write(x.data_encoded)
+                    offset += len(x.data_encoded)
+
+            if offset < first_pkg.size:
+                return None, None, offset
+
+            def file_generator():
+                with open(upload_path, "rb", buffering=0) as f:
+                    chunk = f.read(TRANSFER_CHUNK_SIZE)
+                    while True:
+                        yield types.SimpleNamespace(
+                            type=first_pkg.type,
+                            id=first_pkg.id,
+                            ext=first_pkg.ext,
+                            filename=first_pkg.filename,
+                            data_encoded=chunk,
+                        )
+                        chunk = f.read(TRANSFER_CHUNK_SIZE)
+                        if not chunk:
+                            break
+
+            result = self.load_file_from_stream(file_generator())
+            if result is None:
+                return None, None, offset
+            os.remove(upload_path)
+
+        data, file_hash = result
+        return data, file_hash, offset
 
     def load_data_from_stream(self, data_stream: Iterable) -> tuple(Data, str):
         data_stream = iter(data_stream)
@@ -170,20 +363,25 @@ class DataManager:
                 pass
             return self.load(data_id), hash_stream.hexdigest()
 
-        with open(output_path, "wb") as f_out:
+        with open(output_path, "wb", buffering=0) as f_out:
             for x in data_generator():
                 f_out.write(x)
 
+        self.link(data_id, hash_stream.hexdigest())
+
         return self.load(data_id), hash_stream.hexdigest()
 
-    def dump_to_stream(self, data_id: str, chunk_size: int = 131_072) -> Iterator[dict]:
+    def dump_to_stream(
+        self, data_id: str, chunk_size: int = TRANSFER_CHUNK_SIZE
+    ) -> Iterator[dict]:
         data_path = create_data_path(self.data_dir, data_id, "zip")
 
         if not os.path.exists(data_path):
             logging.error(f"Data not found with id {data_id}")
             return None
 
-        with open(data_path, "rb") as bytestream:
+        # unbuffered, every chunk is read straight into its bytes object
+        with open(data_path, "rb", buffering=0) as bytestream:
             while True:
                 chunk = bytestream.read(chunk_size)
                 if not chunk:
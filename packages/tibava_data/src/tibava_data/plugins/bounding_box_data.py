@@ -48,18 +48,21 @@ class BboxesData(Data):
         super().load()
         assert self.check_fs(), "No filesystem handler installed"
 
-        data = self.load_dict("bboxes_data.yml")
-        self.bboxes = [BboxData(**x) for x in data.get("bboxes")]
+        self.bboxes = self.load_columns("bboxes", BboxData)
+        if self.bboxes is None:
+            # containers written before the columnar format
+            data = self.load_dict("bboxes_data.yml")
+            self.bboxes = [BboxData(**x) for x in data.get("bboxes")]
 
     def save(self) -> None:
         super().save()
         assert self.check_fs(), "No filesystem handler installed"
         assert self.fs.mode == "w", "Data packet is open read only"
 
-        self.save_dict(
-            "bboxes_data.yml",
-            {"bboxes": [box.to_dict() for box in self.bboxes]},
-        )
+        self.save_columns("bboxes", self.bboxes)
+
+    def column(self, name: str) -> npt.NDArray:
+        return self.get_column("bboxes", self.bboxes, name)
 
     def to_dict(self) -> dict:
         return {
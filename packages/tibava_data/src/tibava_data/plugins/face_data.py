@@ -25,18 +25,21 @@ class FacesData(Data):
         super().load()
         assert self.check_fs(), "No filesystem handler installed"
 
-        data = self.load_dict("faces_data.yml")
-        self.faces = [FaceData(**x) for x in data.get("faces")]
+        self.faces = self.load_columns("faces", FaceData)
+        if self.faces is None:
+            # containers written before the columnar format
+            data = self.load_dict("faces_data.yml")
+            self.faces = [FaceData(**x) for x in data.get("faces")]
 
     def save(self) -> None:
         super().save()
         assert self.check_fs(), "No filesystem handler installed"
         assert self.fs.mode == "w", "Data packet is open read only"
 
-        self.save_dict(
-            "faces_data.yml",
-            {"faces": [face.to_dict() for face in self.faces]},
-        )
+        self.save_columns("faces", self.faces)
+
+    def column(self, name: str) -> npt.NDArray:
+        return self.get_column("faces", self.faces, name)
 
     def to_dict(self) -> dict:
         return {
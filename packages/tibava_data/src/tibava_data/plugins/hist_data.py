@@ -23,11 +23,9 @@ class HistData(Data):
         data = self.load_dict("hist_data.yml")
         self.delta_time = data.get("delta_time")
 
-        with self.fs.open_file("hist.npz", "r") as f:
-            self.hist = np.load(f)
+        self.hist = self.load_array("hist.npz")
 
-        with self.fs.open_file("time.npz", "r") as f:
-            self.time = np.load(f)
+        self.time = self.load_array("time.npz")
 
     def save(self) -> None:
         super().save()
@@ -38,11 +36,9 @@ class HistData(Data):
                 "delta_time": self.delta_time,
             },
         )
-        with self.fs.open_file("hist.npz", "w") as f:
-            np.save(f, self.hist)
+        self.save_array("hist.npz", self.hist)
 
-        with self.fs.open_file("time.npz", "w") as f:
-            np.save(f, self.time)
+        self.save_array("time.npz", self.time)
 
     def to_dict(self) -> dict:
         return {
@@ -40,17 +40,21 @@ class ImagesData(Data):
         super().load()
         assert self.check_fs(), "No filesystem handler installed"
 
-        data = self.load_dict("images_data.yml")
-        self.images = [ImageData(**x) for x in data.get("images")]
+        self.images = self.load_columns("images", ImageData)
+        if self.images is None:
+            # containers written before the columnar format
+            data = self.load_dict("images_data.yml")
+            self.images = [ImageData(**x) for x in data.get("images")]
 
     def save(self) -> None:
         super().save()
         assert self.check_fs(), "No filesystem handler installed"
         assert self.fs.mode == "w", "Data packet is open read only"
 
-        self.save_dict(
-            "images_data.yml", {"images": [x.to_dict() for x in self.images]}
-        )
+        self.save_columns("images", self.images)
+
+    def column(self, name: str) -> npt.NDArray:
+        return self.get_column("images", self.images, name)
 
     def to_dict(self) -> dict:
         return {
@@ -96,7 +100,6 @@ class ImagesData(Data):
             return None
 
     def extract_all(self, data_manager: DataManager) -> None:
-
         for image in self:
             logging.debug(f"[ImagesData] Extract {image.id}")
             image_id = image.id if isinstance(image, ImageData) else image
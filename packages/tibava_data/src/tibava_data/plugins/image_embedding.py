@@ -26,7 +26,9 @@ class ImageEmbedding(Data):
             "ref_id": self.ref_id,
             "time": self.time,
             "delta_time": self.delta_time,
-            "embedding": self.embedding.tolist(),
+            "embedding": (
+                self.embedding.tolist() if self.embedding is not None else None
+            ),
         }
 
     def to_save(self) -> dict:
@@ -50,11 +52,16 @@ class ImageEmbeddings(Data):
         super().load()
         assert self.check_fs(), "No filesystem handler installed"
 
-        data = self.load_dict("image_embeddings_data.yml")
-        self.embeddings = [ImageEmbedding(**x) for x in data.get("embeddings")]
+        self.embeddings = self.load_columns("embeddings", ImageEmbedding)
+        if self.embeddings is None:
+            # containers written before the columnar format
+            data = self.load_dict("image_embeddings_data.yml")
+            self.embeddings = [ImageEmbedding(**x) for x in data.get("embeddings")]
 
-        with self.fs.open_file("embeddings.npz", "r") as f:
-            embeddings = np.load(f)
+        if not self.is_selected("embedding"):
+            return
+
+        embeddings = self.load_array("embeddings.npz")
         if len(self.embeddings) != embeddings.shape[0]:
             logging.error(
                 f"Data has invalid shape {len(self.embeddings)} vs. {embeddings.shape[0]}"
@@ -63,19 +70,29 @@ class ImageEmbeddings(Data):
 
         for i in range(embeddings.shape[0]):
             self.embeddings[i].embedding = embeddings[i]
+        self._embedding_matrix = embeddings
 
     def save(self) -> None:
         super().save()
         assert self.check_fs(), "No filesystem handler installed"
         assert self.fs.mode == "w", "Data packet is open read only"
 
-        self.save_dict(
-            "image_embeddings_data.yml",
-            {"embeddings": [x.to_save() for x in self.embeddings]},
+        self.save_columns("embeddings", self.embeddings, exclude=["embedding"])
+        self.save_array(
+            "embeddings.npz", np.stack([x.embedding for x in self.embeddings], axis=0)
         )
 
-        with self.fs.open_file("embeddings.npz", "w") as f:
-            np.save(f, np.stack([x.embedding for x in self.embeddings], axis=0))
+    def column(self, name: str) -> npt.NDArray:
+        if name == "embedding":
+            matrix = getattr(self, "_embedding_matrix", None)
+            if (
+                matrix is not None
+                and self.fs.mode == "r"
+                and matrix.shape[0] == len(self.embeddings)
+            ):
+                return matrix
+            return np.stack([x.embedding for x in self.embeddings], axis=0)
+        return self.get_column("embeddings", self.embeddings, name)
 
     def to_dict(self) -> dict:
         return {
@@ -41,15 +41,21 @@ class KpssData(Data):
         super().load()
         assert self.check_fs(), "No filesystem handler installed"
 
-        data = self.load_dict("kpss_data.yml")
-        self.kpss = [KpsData(**x) for x in data.get("kpss")]
+        self.kpss = self.load_columns("kpss", KpsData)
+        if self.kpss is None:
+            # containers written before the columnar format
+            data = self.load_dict("kpss_data.yml")
+            self.kpss = [KpsData(**x) for x in data.get("kpss")]
 
     def save(self) -> None:
         super().save()
         assert self.check_fs(), "No filesystem handler installed"
         assert self.fs.mode == "w", "Data packet is open read only"
 
-        self.save_dict("kpss_data.yml", {"kpss": [x.to_dict() for x in self.kpss]})
+        self.save_columns("kpss", self.kpss)
+
+    def column(self, name: str) -> npt.NDArray:
+        return self.get_column("kpss", self.kpss, name)
 
     def to_dict(self) -> dict:
         return {**super().to_dict(), "kpss": [x.to_dict() for x in self.kpss]}
@@ -73,20 +73,13 @@ class ListData(Data):
         return len(self.index)
 
     def __iter__(self):
+        # children are restricted to the same fields as the list
+        load_fields = getattr(self, "_load_fields", None)
         for i, data_id in zip(self.index, self.data):
-            data = Data()
-            data._register_fs_handler(LocalFSHandler(self.fs, data_id))
-            data_type = None
-            with data:
-                data_type = data.type
-
-            assert data_type in DataManager._data_name_lut, (
-                f"Unknown data type {data_type}"
+            data = DataManager.load_from_fs(
+                LocalFSHandler(self.fs, data_id), fields=load_fields
             )
 
-            data = DataManager._data_name_lut[data_type]()
-            data._register_fs_handler(LocalFSHandler(self.fs, data_id))
-
             yield i, data
 
     def extract_all(self, data_manager: DataManager) -> None:
@@ -32,8 +32,7 @@ class PlaceClusterData(Data):
         self.places = [PlaceData(**x) for x in data.get("places")]
         self.images = [ImageData(**x) for x in data.get("images")]
 
-        with self.fs.open_file("place_cluster_embeddings.npz", "r") as f:
-            embeddings = np.load(f)
+        embeddings = self.load_array("place_cluster_embeddings.npz")
 
         cluster_feature_lut = data.get("cluster_feature_lut")
 
@@ -64,10 +63,10 @@ class PlaceClusterData(Data):
             },
         )
 
-        with self.fs.open_file("place_cluster_embeddings.npz", "w") as f:
-            np.save(
-                f, np.concatenate([x.embedding_repr for x in self.clusters], axis=0)
-            )
+        self.save_array(
+            "place_cluster_embeddings.npz",
+            np.concatenate([x.embedding_repr for x in self.clusters], axis=0),
+        )
 
     def to_dict(self) -> dict:
         return {
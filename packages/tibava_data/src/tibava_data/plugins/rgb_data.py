@@ -23,11 +23,9 @@ class RGBData(Data):
         data = self.load_dict("rgb_data.yml")
         self.delta_time = data.get("delta_time")
 
-        with self.fs.open_file("colors.npz", "r") as f:
-            self.colors = np.load(f)
+        self.colors = self.load_array("colors.npz")
 
-        with self.fs.open_file("time.npz", "r") as f:
-            self.time = np.load(f)
+        self.time = self.load_array("time.npz")
 
     def save(self) -> None:
         super().save()
@@ -38,11 +36,9 @@ class RGBData(Data):
                 "delta_time": self.delta_time,
             },
         )
-        with self.fs.open_file("colors.npz", "w") as f:
-            np.save(f, self.colors)
+        self.save_array("colors.npz", self.colors)
 
-        with self.fs.open_file("time.npz", "w") as f:
-            np.save(f, self.time)
+        self.save_array("time.npz", self.time)
 
     def to_dict(self) -> dict:
         return {
@@ -25,11 +25,9 @@ class ScalarData(Data):
         data = self.load_dict("scalar_data.yml")
         self.delta_time = data.get("delta_time")
 
-        with self.fs.open_file("y.npz", "r") as f:
-            self.y = np.load(f)
+        self.y = self.load_array("y.npz")
 
-        with self.fs.open_file("time.npz", "r") as f:
-            self.time = np.load(f)
+        self.time = self.load_array("time.npz")
 
     def save(self) -> None:
         super().save()
@@ -42,11 +40,9 @@ class ScalarData(Data):
                 "delta_time": self.delta_time,
             },
         )
-        with self.fs.open_file("y.npz", "w") as f:
-            np.save(f, self.y)
+        self.save_array("y.npz", self.y)
 
-        with self.fs.open_file("time.npz", "w") as f:
-            np.save(f, self.time)
+        self.save_array("time.npz", self.time)
 
     def to_dict(self) -> dict:
         return {
@@ -47,8 +47,10 @@ class TextEmbeddings(Data):
         data = self.load_dict("text_embeddings_data.yml")
         self.embeddings = [TextEmbedding(**x) for x in data.get("embeddings")]
 
-        with self.fs.open_file("embeddings.npz", "r") as f:
-            embeddings = np.load(f)
+        if not self.is_selected("embedding"):
+            return
+
+        embeddings = self.load_array("embeddings.npz")
         if len(self.embeddings) != embeddings.shape[0]:
             logging.error(
                 f"Data has invalid shape {len(self.embeddings)} vs. {embeddings.shape[0]}"
@@ -68,8 +70,9 @@ class TextEmbeddings(Data):
             {"embeddings": [x.to_save() for x in self.embeddings]},
         )
 
-        with self.fs.open_file("embeddings.npz", "w") as f:
-            np.save(f, np.stack([x.embedding for x in self.embeddings], axis=0))
+        self.save_array(
+            "embeddings.npz", np.stack([x.embedding for x in self.embeddings], axis=0)
+        )
 
     def to_dict(self) -> dict:
         return {
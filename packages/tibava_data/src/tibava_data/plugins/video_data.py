@@ -1,11 +1,12 @@
 import logging
+import os
 
 from ..manager import DataManager
 from ..data import Data
 from tibava_interface import analyser_pb2
 from dataclasses import dataclass, field, fields
 from collections.abc import Iterable
-from tibava_utils import VideoDecoder
+from tibava_utils import VideoDecoder, CachedVideoDecoder
 
 
 @DataManager.export("VideoData", analyser_pb2.VIDEO_DATA)
@@ -39,8 +40,26 @@ class VideoData(Data):
             "ext": self.ext,
         }
 
-    def __call__(self, fps: float = None, **kwargs) -> "VideoIterator":
-        return VideoIterator(self, fps=fps)
+    def __call__(
+        self,
+        fps: float = None,
+        max_dimension=None,
+        cache: bool = False,
+        cache_max_bytes: int = None,
+        threaded: bool = True,
+        **kwargs,
+    ) -> "VideoIterator":
+        """Decoder of the video, with cache decoded frames are stored next to
+        the container (up to cache_max_bytes) and shared with later decoders"""
+        return VideoIterator(
+            self,
+            fps=fps,
+            max_dimension=max_dimension,
+            cache=cache,
+            cache_max_bytes=cache_max_bytes,
+            threaded=threaded,
+            **kwargs,
+        )
 
     def open_video(self, mode="r"):
         assert self.check_fs(), "No fs register"
@@ -63,18 +82,53 @@ class VideoData(Data):
 
 
 class VideoIterator:
-    def __init__(self, data: VideoData, fps: float = None):
+    def __init__(
+        self,
+        data: VideoData,
+        fps: float = None,
+        max_dimension=None,
+        cache: bool = False,
+        cache_max_bytes: int = None,
+        **kwargs,
+    ):
         self.data = data
         self.fps = fps
+        self.max_dimension = max_dimension
+        self.cache = cache
+        self.cache_max_bytes = cache_max_bytes
+        self.kwargs = kwargs
         self.video_file = None
         self.video_decoder = None
 
+    def cache_prefix(self):
+        # decoded frames are stored next to the zip container of the video
+        path = getattr(self.data.fs, "path", None)
+        if not self.cache or path is None:
+            return None
+        return os.path.splitext(path)[0]
+
     def __enter__(self):
         self.video_file = self.data.open_video("r")
 
-        self.video_decoder = VideoDecoder(
-            self.video_file, fps=self.fps, extension=f".{self.data.ext}"
-        )
+        cache_prefix = self.cache_prefix()
+        if cache_prefix is not None:
+            self.video_decoder = CachedVideoDecoder(
+                self.video_file,
+                cache_prefix=cache_prefix,
+                max_bytes=self.cache_max_bytes,
+                fps=self.fps,
+                max_dimension=self.max_dimension,
+                extension=f".{self.data.ext}",
+                **self.kwargs,
+            )
+        else:
+            self.video_decoder = VideoDecoder(
+                self.video_file,
+                fps=self.fps,
+                max_dimension=self.max_dimension,
+                extension=f".{self.data.ext}",
+                **self.kwargs,
+            )
         return self.video_decoder
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -26,7 +26,9 @@ class VideoTemporalEmbedding(Data):
             "ref_id": self.ref_id,
             "time": self.time,
             "delta_time": self.delta_time,
-            "embedding": self.embedding.tolist(),
+            "embedding": (
+                self.embedding.tolist() if self.embedding is not None else None
+            ),
         }
 
     def to_save(self) -> dict:
@@ -55,8 +57,10 @@ class VideoTemporalEmbeddings(Data):
         data = self.load_dict("video_temporal_embeddings_data.yml")
         self.embeddings = [VideoTemporalEmbedding(**x) for x in data.get("embeddings")]
 
-        with self.fs.open_file("embeddings.npz", "r") as f:
-            embeddings = np.load(f)
+        if not self.is_selected("embedding"):
+            return
+
+        embeddings = self.load_array("embeddings.npz")
         if len(self.embeddings) != embeddings.shape[0]:
             logging.error(
                 f"Data has invalid shape {len(self.embeddings)} vs. {embeddings.shape[0]}"
@@ -76,8 +80,9 @@ class VideoTemporalEmbeddings(Data):
             {"embeddings": [x.to_save() for x in self.embeddings]},
         )
 
-        with self.fs.open_file("embeddings.npz", "w") as f:
-            np.save(f, np.stack([x.embedding for x in self.embeddings], axis=0))
+        self.save_array(
+            "embeddings.npz", np.stack([x.embedding for x in self.embeddings], axis=0)
+        )
 
     def to_dict(self) -> dict:
         return {
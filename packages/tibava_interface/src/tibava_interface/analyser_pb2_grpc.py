@@ -59,6 +59,21 @@ class AnalyserStub(object):
             request_serializer=analyser__pb2.GetPieplineStatusRequest.SerializeToString,
             response_deserializer=analyser__pb2.GetPieplineStatusResponse.FromString,
         )
+        self.watch_plugin_status = channel.unary_stream(
+            "/tibava.analyser.Analyser/watch_plugin_status",
+            request_serializer=analyser__pb2.GetPluginStatusRequest.SerializeToString,
+            response_deserializer=analyser__pb2.GetPluginStatusResponse.FromString,
+        )
+        self.watch_pipeline_status = channel.unary_stream(
+            "/tibava.analyser.Analyser/watch_pipeline_status",
+            request_serializer=analyser__pb2.GetPieplineStatusRequest.SerializeToString,
+            response_deserializer=analyser__pb2.GetPieplineStatusResponse.FromString,
+        )
+        self.get_upload_status = channel.unary_unary(
+            "/tibava.analyser.Analyser/get_upload_status",
+            request_serializer=analyser__pb2.UploadStatusRequest.SerializeToString,
+            response_deserializer=analyser__pb2.UploadStatusResponse.FromString,
+        )
 
 
 class AnalyserServicer(object):
@@ -118,6 +133,24 @@ class AnalyserServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def watch_plugin_status(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def watch_pipeline_status(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def get_upload_status(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_AnalyserServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -166,6 +199,21 @@ def add_AnalyserServicer_to_server(servicer, server):
             request_deserializer=analyser__pb2.GetPieplineStatusRequest.FromString,
             response_serializer=analyser__pb2.GetPieplineStatusResponse.SerializeToString,
         ),
+        "watch_plugin_status": grpc.unary_stream_rpc_method_handler(
+            servicer.watch_plugin_status,
+            request_deserializer=analyser__pb2.GetPluginStatusRequest.FromString,
+            response_serializer=analyser__pb2.GetPluginStatusResponse.SerializeToString,
+        ),
+        "watch_pipeline_status": grpc.unary_stream_rpc_method_handler(
+            servicer.watch_pipeline_status,
+            request_deserializer=analyser__pb2.GetPieplineStatusRequest.FromString,
+            response_serializer=analyser__pb2.GetPieplineStatusResponse.SerializeToString,
+        ),
+        "get_upload_status": grpc.unary_unary_rpc_method_handler(
+            servicer.get_upload_status,
+            request_deserializer=analyser__pb2.UploadStatusRequest.FromString,
+            response_serializer=analyser__pb2.UploadStatusResponse.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
         "tibava.analyser.Analyser", rpc_method_handlers
@@ -437,3 +485,90 @@ class Analyser(object):
             timeout,
             metadata,
         )
+
+    @staticmethod
+    def watch_plugin_status(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            "/tibava.analyser.Analyser/watch_plugin_status",
+            analyser__pb2.GetPluginStatusRequest.SerializeToString,
+            analyser__pb2.GetPluginStatusResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+        )
+
+    @staticmethod
+    def watch_pipeline_status(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            "/tibava.analyser.Analyser/watch_pipeline_status",
+            analyser__pb2.GetPieplineStatusRequest.SerializeToString,
+            analyser__pb2.GetPieplineStatusResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+        )
+
+    @staticmethod
+    def get_upload_status(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/tibava.analyser.Analyser/get_upload_status",
+            analyser__pb2.UploadStatusRequest.SerializeToString,
+            analyser__pb2.UploadStatusResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+        )
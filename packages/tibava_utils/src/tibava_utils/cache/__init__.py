@@ -1,3 +1,8 @@
-from .cache import CacheManager, Cache, get_hash_for_plugin
+from .cache import (
+    CacheManager,
+    Cache,
+    LRUCache,
+    get_hash_for_plugin,
+    get_plugin_cache_keys,
+)
 from .cache_plugins.redis_database import *
-
@@ -1,5 +1,8 @@
 import logging
-from typing import Dict
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List
 
 from tibava_utils.plugin import Plugin
 from tibava_utils.plugin import Factory
@@ -9,6 +12,85 @@ class Cache(Plugin):
     def __init__(self, config=None):
         super().__init__(config)
 
+    def mget(self, ids: List[str]) -> List[Any]:
+        return [self.get(x) for x in ids]
+
+    def mset(self, items: Dict[str, Any]) -> None:
+        for id, data in items.items():
+            self.set(id, data)
+
+
+class LRUCache(Cache):
+    """Keeps recently used entries of another cache in process memory.
+
+    Writes go to both caches. Entries expire after ttl seconds so that
+    deletions by other processes are picked up eventually.
+    """
+
+    def __init__(self, cache: Cache, max_size: int = 4096, ttl: float = 300.0):
+        super().__init__({"max_size": max_size, "ttl": ttl})
+        self.cache = cache
+        self.max_size = max_size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def _get_local(self, id: str) -> Any:
+        entry = self.entries.get(id)
+        if entry is None:
+            return None
+        if entry[0] < time.time():
+            del self.entries[id]
+            return None
+        self.entries.move_to_end(id)
+        return entry[1]
+
+    def _set_local(self, id: str, data: Any) -> None:
+        self.entries[id] = (time.time() + self.ttl, data)
+        self.entries.move_to_end(id)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def get(self, id: str) -> Any:
+        return self.mget([id])[0]
+
+    def mget(self, ids: List[str]) -> List[Any]:
+        with self.lock:
+            results = [self._get_local(x) for x in ids]
+
+        missing = [x for x, data in zip(ids, results) if data is None]
+        if len(missing) == 0:
+            return results
+
+        fetched = dict(zip(missing, self.cache.mget(missing)))
+        with self.lock:
+            for id, data in fetched.items():
+                if data is not None:
+                    self._set_local(id, data)
+        return [
+            fetched.get(x) if data is None else data for x, data in zip(ids, results)
+        ]
+
+    def set(self, id: str, data: Any) -> bool:
+        self.mset({id: data})
+
+    def mset(self, items: Dict[str, Any]) -> None:
+        self.cache.mset(items)
+        with self.lock:
+            for id, data in items.items():
+                self._set_local(id, data)
+
+    def delete(self, id: str) -> bool:
+        with self.lock:
+            self.entries.pop(id, None)
+        return self.cache.delete(id)
+
+    def keys(self) -> List[str]:
+        return self.cache.keys()
+
+    def __iter__(self):
+        return iter(self.cache)
+
 
 class CacheManager(Factory):
     _plugins = {}
@@ -55,6 +137,64 @@ def flat_dict(data_dict, parse_json=False):
     return result_map
 
 
+def canonical(value: Any) -> Any:
+    """Converts a value into a json serializable form that does not depend on
+    the order of dicts or on the exact number type (e.g. 2, 2.0, np.int64(2))"""
+    if isinstance(value, dict):
+        return {str(k): canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        values = [canonical(x) for x in value]
+        if isinstance(value, set):
+            values = sorted(values, key=lambda x: json.dumps(x, sort_keys=True))
+        return values
+    if hasattr(value, "tolist"):
+        # numpy scalars and arrays
+        return canonical(value.tolist())
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        if value.is_integer():
+            return int(value)
+        return value
+    return str(value)
+
+
+def get_plugin_cache_keys(
+    plugin: str,
+    outputs: List[str],
+    version: str = None,
+    parameters: Dict = None,
+    inputs: Dict[str, str] = None,
+    config: Dict = None,
+) -> Dict[str, str]:
+    """Returns one cache key for every output of a plugin call.
+
+    The call is hashed only once, the keys of the outputs are derived from it.
+    Changes of the version, the parameters, the inputs or the plugin config
+    result in new keys.
+    """
+    plugin_call = json.dumps(
+        canonical(
+            {
+                "plugin": plugin,
+                "version": version,
+                "parameters": parameters or {},
+                "inputs": inputs or {},
+                "config": config or {},
+            }
+        ),
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    call_hash = hashlib.sha256(plugin_call.encode()).hexdigest()
+    return {
+        output: f"{plugin}:{hashlib.sha256(f'{call_hash}:{output}'.encode()).hexdigest()}"
+        for output in outputs
+    }
+
+
 def get_hash_for_plugin(
     plugin: str,
     output: str,
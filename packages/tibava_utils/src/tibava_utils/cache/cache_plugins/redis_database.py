@@ -1,23 +1,58 @@
-from typing import Any, List, Iterator
+from typing import Any, Dict, List, Iterator
 import logging
+import threading
 
 import valkey
 import msgpack
 
 from tibava_utils.cache import CacheManager, Cache
 
-default_config = {"db": 0, "host": "valkey", "port": 6379, "tag": "data"}
+default_config = {
+    "db": 0,
+    "host": "valkey",
+    "port": 6379,
+    "tag": "data",
+    # seconds until an entry expires, None keeps entries forever
+    "ttl": None,
+    "batch_size": 500,
+    "max_connections": 64,
+}
 
 
 class Batcher:
+    """Splits an iterable (e.g. a SCAN cursor) into lists of at most n items
+    without materializing it"""
+
     def __init__(self, iterable, n=1):
         self.iterable = iterable
         self.n = n
 
     def __iter__(self):
-        l = len(self.iterable)
-        for ndx in range(0, l, self.n):
-            yield self.iterable[ndx : min(ndx + self.n, l)]
+        batch = []
+        for x in self.iterable:
+            batch.append(x)
+            if len(batch) >= self.n:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+# one connection pool per server, shared by all caches and threads of a process
+_connection_pools = {}
+_connection_pools_lock = threading.Lock()
+
+
+def get_connection_pool(
+    host: str, port: int, db: int, max_connections: int = None
+) -> valkey.ConnectionPool:
+    key = (host, port, db)
+    with _connection_pools_lock:
+        if key not in _connection_pools:
+            _connection_pools[key] = valkey.BlockingConnectionPool(
+                host=host, port=port, db=db, max_connections=max_connections
+            )
+        return _connection_pools[key]
 
 
 @CacheManager.export("valkey")
@@ -25,31 +60,48 @@ class valkeyCache(Cache, config=default_config, version="0.1"):
     def __init__(self, config=None):
         super().__init__(config)
         self.r = valkey.Valkey(
-            host=self.config.get("host"),
-            port=self.config.get("port"),
-            db=self.config.get("db"),
+            connection_pool=get_connection_pool(
+                host=self.config.get("host"),
+                port=self.config.get("port"),
+                db=self.config.get("db"),
+                max_connections=self.config.get("max_connections"),
+            )
         )
 
-    def set(self, id: str, data: Any) -> bool:
+    def _key(self, id: str) -> str:
+        return f"{self.config.get('tag')}:{id}"
+
+    def set(self, id: str, data: Any, ttl: int = None) -> bool:
         try:
             packed = msgpack.packb(data)
-            tag = self.config.get("tag")
-            self.r.set(f"{tag}:{id}", packed)
+            if ttl is None:
+                ttl = self.config.get("ttl")
+            self.r.set(self._key(id), packed, ex=ttl)
+        except Exception as e:
+            logging.error(f"valkeyCache {e}")
+
+    def mset(self, items: Dict[str, Any], ttl: int = None) -> None:
+        if ttl is None:
+            ttl = self.config.get("ttl")
+        try:
+            # a single round trip for all items
+            pipe = self.r.pipeline(transaction=False)
+            for id, data in items.items():
+                pipe.set(self._key(id), msgpack.packb(data), ex=ttl)
+            pipe.execute()
         except Exception as e:
             logging.error(f"valkeyCache {e}")
 
     def delete(self, id: str) -> bool:
         try:
-            tag = self.config.get("tag")
-            return self.r.delete(f"{tag}:{id}")
+            return self.r.delete(self._key(id))
         except Exception as e:
             logging.error(f"valkeyCache {e}")
             return None
 
     def get(self, id: str) -> Any:
         try:
-            tag = self.config.get("tag")
-            packed = self.r.get(f"{tag}:{id}")
+            packed = self.r.get(self._key(id))
             if packed is None:
                 return None
             return msgpack.unpackb(packed)
@@ -57,30 +109,40 @@ class valkeyCache(Cache, config=default_config, version="0.1"):
             logging.error(f"valkeyCache {e}")
             return None
 
-    def keys(self) -> List[str]:
+    def mget(self, ids: List[str]) -> List[Any]:
+        if len(ids) == 0:
+            return []
         try:
-            tag = self.config.get("tag")
-            start = len(f"{tag}:")
-            keys = self.r.scan_iter(f"{tag}:*", 500)
+            packed = self.r.mget([self._key(id) for id in ids])
+            return [None if x is None else msgpack.unpackb(x) for x in packed]
+        except Exception as e:
+            logging.error(f"valkeyCache {e}")
+            return [None] * len(ids)
+
+    def iter_keys(self) -> Iterator[str]:
+        start = len(self._key(""))
+        for key in self.r.scan_iter(
+            self._key("*"), count=self.config.get("batch_size")
+        ):
+            yield key[start:].decode("utf-8")
 
-            # print([x for x in Batcher(keys, 2)])
-            return [key[start:].decode("utf-8") for key in keys]
+    def keys(self) -> List[str]:
+        try:
+            return list(self.iter_keys())
         except Exception as e:
             logging.error(f"valkeyCache {e}")
             return []
 
     def __iter__(self) -> Iterator:
         try:
-            tag = self.config.get("tag")
-            start = len(f"{tag}:")
-            keys = list(self.r.scan_iter(f"{tag}:*", 500))
-            while len(keys) > 0:
-                batch_keys = keys[:500]
-                keys = keys[500:]
-
-                values = self.r.mget(batch_keys)
+            # keys are fetched cursor by cursor and values batch by batch
+            for batch_keys in Batcher(self.iter_keys(), self.config.get("batch_size")):
+                values = self.r.mget([self._key(x) for x in batch_keys])
                 for k, v in zip(batch_keys, values):
-                    yield k[start:].decode("utf-8"), msgpack.unpackb(v)
+                    # the key might have expired in the meantime
+                    if v is None:
+                        continue
+                    yield k, msgpack.unpackb(v)
 
         except Exception as e:
             logging.error(f"valkeyCache {e}")
@@ -20,7 +20,8 @@ class Plugin:
         cls._name = convert_name(cls.__name__)
 
     def __init__(self, config=None):
-        self._config = self._default_config
+        # copy, instances must not change the defaults of their class
+        self._config = dict(self._default_config or {})
         if config is not None:
             self._config.update(config)
 
@@ -1,5 +1,12 @@
 import imageio.v3 as iio
 import av
+import json
+import logging
+import math
+import os
+import queue
+import tempfile
+import threading
 import numpy as np
 
 
@@ -37,9 +44,66 @@ def parse_meta_imageio(path, **kwargs):
         return None
 
 
+def iterate_in_thread(iterable, queue_size=32):
+    """Consumes an iterable in a background thread and yields its items.
+
+    At most queue_size items are buffered. Exceptions of the iterable are
+    raised in the caller and the thread is stopped when the caller stops
+    iterating.
+    """
+    items = queue.Queue(maxsize=max(queue_size, 1))
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+            put(done)
+        except Exception as e:
+            put(e)
+        finally:
+            if hasattr(iterable, "close"):
+                iterable.close()
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = items.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
 class VideoDecoder:
     # TODO: videos with sample aspect ratio (SAR) not equal to 1:1 are loaded with wrong shape
-    def __init__(self, path, max_dimension=None, fps=None, ref_id=None, **kwargs):
+    def __init__(
+        self,
+        path,
+        max_dimension=None,
+        fps=None,
+        ref_id=None,
+        threaded=False,
+        queue_size=32,
+        skip_ratio=None,
+        **kwargs,
+    ):
         """Provides an iterator over the frames of a video.
 
         Args:
@@ -49,11 +113,19 @@ class VideoDecoder:
                 - an int that depicts the longer side of the frame.
                 Defaults to None.
             fps (int, optional): Frames per second. Defaults to None.
+            threaded (bool, optional): Decode with libavcodec frame/slice threads in a
+                background thread that fills a queue of queue_size frames. Defaults to False.
+            skip_ratio (float, optional): In threaded mode only keyframes are decoded if the
+                native frame rate is at least skip_ratio times higher than fps. Frames are
+                then taken from the last keyframe. Defaults to None.
         """
         self._path = path
         self._max_dimension = max_dimension
         self._fps = fps
         self._ref_id = ref_id
+        self._threaded = threaded
+        self._queue_size = queue_size
+        self._skip_ratio = skip_ratio
 
         self._meta = parse_meta_av(path)
 
@@ -64,20 +136,29 @@ class VideoDecoder:
 
         self._kwargs = kwargs
 
+    def resolution(self):
+        if self._max_dimension is None:
+            return self._size
+
+        if isinstance(self._max_dimension, (list, tuple)):
+            return tuple(self._max_dimension)
+
+        res = max(self._size[1], self._size[0])
+        scale = min(self._max_dimension / res, 1)
+        return (round(self._size[0] * scale), round(self._size[1] * scale))
+
     def __iter__(self):
+        if self._threaded:
+            yield from self._iter_threaded()
+            return
+
         filter_sequence = []
 
         if self._fps is not None:
             filter_sequence.append(("fps", {"fps": f"{self._fps}", "round": "up"}))
 
         if self._max_dimension is not None:
-            if isinstance(self._max_dimension, (list, tuple)):
-                res = self._max_dimension
-            else:
-                res = max(self._size[1], self._size[0])
-
-                scale = min(self._max_dimension / res, 1)
-                res = (round(self._size[0] * scale), round(self._size[1] * scale))
+            res = self.resolution()
             filter_sequence.append(
                 ("scale", {"width": f"{res[0]}", "height": f"{res[1]}"})
             )
@@ -98,6 +179,139 @@ class VideoDecoder:
                 "delta_time": float(1 / fps),
             }
 
+    def keyframes_only(self):
+        return (
+            self._threaded
+            and self._skip_ratio is not None
+            and self._fps is not None
+            and float(self._real_fps) / self._fps >= self._skip_ratio
+        )
+
+    def _iter_threaded(self):
+        yield from iterate_in_thread(self._decode(), queue_size=self._queue_size)
+
+    def _decode(self):
+        if hasattr(self._path, "seek"):
+            self._path.seek(0)
+
+        res = self.resolution()
+        fps = self.fps()
+        real_fps = float(self._real_fps)
+        with av.open(self._path) as container:
+            stream = container.streams.video[0]
+            stream.thread_type = "AUTO"
+            keyframes_only = self.keyframes_only()
+            if keyframes_only:
+                stream.codec_context.skip_frame = "NONKEY"
+
+            start_time = 0.0
+            if stream.start_time is not None:
+                start_time = float(stream.start_time * stream.time_base)
+            eps = 1e-3 / real_fps
+
+            def to_dict(frame, i):
+                return {
+                    "time": float(i / fps),
+                    "index": i,
+                    "frame": frame.to_ndarray(
+                        width=res[0],
+                        height=res[1],
+                        format="rgb24",
+                        interpolation="BICUBIC",
+                    ),
+                    "ref_id": self._ref_id,
+                    "delta_time": float(1 / fps),
+                }
+
+            i = 0
+            prev = None
+            for frame in container.decode(stream):
+                if self._fps is None:
+                    yield to_dict(frame, i)
+                    i += 1
+                    continue
+
+                # same selection as the ffmpeg fps filter: every output time
+                # shows the last frame that starts before it
+                while prev is not None and i / fps + start_time + eps < frame.time:
+                    yield to_dict(prev, i)
+                    i += 1
+                prev = frame
+
+            if prev is None or self._fps is None:
+                return
+            end_time = prev.time + 1 / real_fps
+            if keyframes_only:
+                # the last keyframe is shown until the end of the video
+                end_time = max(end_time, start_time + self._duration)
+            while i / fps + start_time + eps < end_time:
+                yield to_dict(prev, i)
+                i += 1
+
+    def get_frames(self, times, seek_threshold=10.0):
+        """Decodes only the frames shown at the given times (in seconds).
+
+        The decoder seeks to the keyframe before a requested time and decodes
+        forward from there. Requests closer than seek_threshold seconds to the
+        current position are decoded without seeking. Frames are yielded in
+        ascending order of time and "time" is the requested time.
+        """
+        times = sorted(set(times))
+        if len(times) == 0:
+            return
+
+        if hasattr(self._path, "seek"):
+            self._path.seek(0)
+
+        res = self.resolution()
+        fps = self.fps()
+        with av.open(self._path) as container:
+            stream = container.streams.video[0]
+            stream.thread_type = "AUTO"
+            start_time = 0.0
+            if stream.start_time is not None:
+                start_time = float(stream.start_time * stream.time_base)
+            # tolerance for rounding errors of the frame timestamps
+            eps = 1e-3 / float(self._real_fps)
+
+            decoder = None
+            prev = None
+            next_frame = None
+            for t in times:
+                target = t + start_time
+                if decoder is None or (
+                    next_frame is not None and target - next_frame.time > seek_threshold
+                ):
+                    container.seek(
+                        max(int(target / stream.time_base), 0),
+                        stream=stream,
+                        backward=True,
+                    )
+                    decoder = container.decode(stream)
+                    prev = None
+                    next_frame = next(decoder, None)
+
+                while next_frame is not None and next_frame.time <= target + eps:
+                    prev, next_frame = next_frame, next(decoder, None)
+
+                if prev is None:
+                    prev = next_frame
+                if prev is None or (next_frame is None and t >= self._duration):
+                    return
+
+                yield {
+                    "time": t,
+                    "index": round(t * fps),
+                    "frame": prev.to_ndarray(
+                        width=res[0],
+                        height=res[1],
+                        format="rgb24",
+                        interpolation="BICUBIC",
+                    ),
+                    "ref_id": self._ref_id,
+                    "delta_time": float(1 / fps),
+                }
+
     def __len__(self):
         return self.duration() * self.fps()
 
@@ -108,35 +322,191 @@ class VideoDecoder:
         return self._duration
 
 
+class CachedVideoDecoder(VideoDecoder):
+    """VideoDecoder that shares its decoded frames with later decoders.
+
+    The first decoder of a video writes all frames as raw rgb24 into a file
+    next to cache_prefix. Decoders with the same fps, resolution and decode
+    mode (threaded or imageio, their frames differ slightly) memory map this
+    file instead of decoding the video again. The file is only published
+    (renamed) once the video was decoded completely.
+    """
+
+    # videos with a larger estimated frame file are decoded without cache
+    max_bytes = 4 * 1024**3
+
+    def __init__(
+        self,
+        path,
+        cache_prefix,
+        max_dimension=None,
+        fps=None,
+        ref_id=None,
+        max_bytes=None,
+        **kwargs,
+    ):
+        super().__init__(
+            path, max_dimension=max_dimension, fps=fps, ref_id=ref_id, **kwargs
+        )
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+
+        res = self.resolution()
+        mode = "threaded" if self._threaded else "imageio"
+        self._cache_path = (
+            f"{cache_prefix}.frames_{mode}_{self.fps():g}_{res[0]}x{res[1]}"
+        )
+        if self.keyframes_only():
+            self._cache_path += "_key"
+
+    def estimated_bytes(self):
+        res = self.resolution()
+        return math.ceil(self.duration() * self.fps() + 1) * res[0] * res[1] * 3
+
+    def load_cache(self):
+        try:
+            with open(f"{self._cache_path}.json", "r") as f:
+                meta = json.load(f)
+            # copy on write so that plugins are allowed to modify the frames
+            return np.memmap(
+                f"{self._cache_path}.raw",
+                dtype=np.uint8,
+                mode="c",
+                shape=tuple(meta["shape"]),
+            )
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def __iter__(self):
+        frames = self.load_cache()
+        if frames is not None:
+            logging.info(f"[CachedVideoDecoder] read frames from {self._cache_path}")
+            fps = self.fps()
+            for i in range(frames.shape[0]):
+                yield {
+                    "time": float(i / fps),
+                    "index": i,
+                    "frame": frames[i],
+                    "ref_id": self._ref_id,
+                    "delta_time": float(1 / fps),
+                }
+            return
+
+        if self.estimated_bytes() > self.max_bytes:
+            yield from super().__iter__()
+            return
+
+        yield from self._decode_and_store()
+
+    def _mkstemp(self):
+        cache_dir, name = os.path.split(os.path.abspath(self._cache_path))
+        return tempfile.mkstemp(dir=cache_dir, prefix=f"{name}.", suffix=".tmp")
+
+    def _decode_and_store(self):
+        fd, tmp_path = self._mkstemp()
+        shape = None
+        num_frames = 0
+        complete = False
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for frame in super().__iter__():
+                    if shape is None:
+                        shape = frame["frame"].shape
+                    f.write(np.ascontiguousarray(frame["frame"]).tobytes())
+                    num_frames += 1
+                    yield frame
+            complete = shape is not None
+        finally:
+            if complete:
+                os.replace(tmp_path, f"{self._cache_path}.raw")
+                self._store_meta([num_frames, *shape])
+            else:
+                os.remove(tmp_path)
+
+    def _store_meta(self, shape):
+        fd, tmp_path = self._mkstemp()
+        with os.fdopen(fd, "w") as f:
+            json.dump({"shape": shape, "fps": self.fps()}, f)
+        # the meta file marks the frame file as complete
+        os.replace(tmp_path, f"{self._cache_path}.json")
+
+
 class VideoBatcher:
-    def __init__(self, video_decoder: VideoDecoder, batch_size=8):
+    def __init__(
+        self,
+        video_decoder: VideoDecoder,
+        batch_size=8,
+        prefetch=2,
+        drop_last=False,
+    ):
+        """Groups the frames of a decoder into batches.
+
+        Batches are assembled in a background thread while the caller processes
+        the previous one. Frames are copied into a ring of preallocated buffers,
+        so the "frame" array of a batch is only valid until the next batch is
+        requested.
+
+        Args:
+            video_decoder (VideoDecoder): Decoder that provides the frames.
+            batch_size (int, optional): Frames per batch. Defaults to 8.
+            prefetch (int, optional): Number of batches that are prepared in advance.
+                Defaults to 2.
+            drop_last (bool, optional): Drop the last batch if it has less than
+                batch_size frames. Defaults to False.
+        """
         self.video_decoder = video_decoder
         self.batch_size = batch_size
+        self.prefetch = prefetch
+        self.drop_last = drop_last
+
+    def _batches(self):
+        # one buffer for the caller, prefetch in the queue, one being filled
+        num_buffers = self.prefetch + 2
+        buffers = None
+        b = 0
+        n = 0
+        meta = {"time": [], "index": [], "ref_id": []}
+
+        def batch(size):
+            return {
+                "time": meta["time"],
+                "index": meta["index"],
+                "frame": buffers[b][:size],
+                "ref_id": meta["ref_id"],
+            }
 
-    def __iter__(self):
-        cache = []
         for x in self.video_decoder:
-            cache.append(x)
+            frame = x["frame"]
+            if buffers is None:
+                buffers = [
+                    np.empty((self.batch_size, *frame.shape), dtype=frame.dtype)
+                    for _ in range(num_buffers)
+                ]
+            buffers[b][n] = frame
+            for key in meta:
+                meta[key].append(x[key])
+            n += 1
 
-            if len(cache) >= self.batch_size:
-                yield {
-                    "time": [x["time"] for x in cache],
-                    "index": [x["index"] for x in cache],
-                    "frame": np.stack([x["frame"] for x in cache]),
-                    "ref_id": [x["ref_id"] for x in cache],
-                }
-                cache = []
+            if n == self.batch_size:
+                yield batch(n)
+                b = (b + 1) % num_buffers
+                n = 0
+                meta = {"time": [], "index": [], "ref_id": []}
 
-        if len(cache) >= self.batch_size:
-            yield {
-                "time": [x["time"] for x in cache],
-                "index": [x["index"] for x in cache],
-                "frame": np.stack([x["frame"] for x in cache]),
-                "ref_id": [x["ref_id"] for x in cache],
-            }
+        if n > 0 and not self.drop_last:
+            yield batch(n)
+
+    def __iter__(self):
+        yield from iterate_in_thread(self._batches(), queue_size=self.prefetch)
+
+    def __len__(self):
+        num_frames = self.video_decoder.duration() * self.video_decoder.fps()
+        if self.drop_last:
+            return int(num_frames // self.batch_size)
+        return math.ceil(num_frames / self.batch_size)
 
     def fps(self):
-        return self.video_decoder._fps
+        return self.video_decoder.fps()
 
     def duration(self):
-        return self.video_decoder._duration
+        return self.video_decoder.duration()